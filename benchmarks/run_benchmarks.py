@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+⏱️ Generator & Hotkey Parser Benchmarks
+Runs ThemeGenerator and HotkeyParser against synthetic fixtures in a throwaway HOME
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Fixture scales
+TEMPLATE_SCALES = [10, 100, 1000]
+KEYBIND_SCALES = [100, 1000, 10000]
+PALETTE_SCALES = [(5, 4), (50, 20), (200, 50)]  # (categories, colors per category)
+
+SEARCH_QUERIES = ["vol up", "workspace", "move left", "termnal", "cmd 42"]
+
+def load_module(name, path):
+    """Import a hyphen-named script as a module"""
+    sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def fake_run(args, *_, **__):
+    """Stand-in for subprocess.run: hyprctl, pkill, dunstctl, notify-send..."""
+    stdout = "[]" if list(args[:2]) == ['hyprctl', 'monitors'] else ""
+    return subprocess.CompletedProcess(args, 0, stdout=stdout, stderr="")
+
+class FakePopen:
+    """Stand-in for subprocess.Popen used to respawn waybar/dunst"""
+
+    def __init__(self, args, *_, **__):
+        self.args = args
+        self.returncode = 0
+
+    def wait(self, timeout=None):
+        return 0
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+class Fixture:
+    """A temporary HOME holding a generated hypr-system tree"""
+
+    def __init__(self, root):
+        self.home = Path(root)
+        self.config_dir = self.home / ".config" / "hypr-system"
+        (self.config_dir / "core").mkdir(parents=True)
+        shutil.copytree(REPO_DIR / "templates", self.config_dir / "templates")
+
+        self.theme = json.loads((REPO_DIR / "core" / "theme-config.json").read_text())
+        self.keybinds = json.loads((REPO_DIR / "core" / "keybind-config.json").read_text())
+        self.write_configs()
+
+    def write_configs(self):
+        (self.config_dir / "core" / "theme-config.json").write_text(json.dumps(self.theme, indent=2))
+        (self.config_dir / "core" / "keybind-config.json").write_text(json.dumps(self.keybinds, indent=2))
+
+    def set_palette(self, categories, colors):
+        """Add synthetic color categories on top of the shipped palette"""
+        shipped = {name: group for name, group in self.theme['colors'].items()
+                   if not name.startswith('bench')}
+        for c in range(categories):
+            group = {}
+            for i in range(colors):
+                if i % 4 == 3:
+                    # Chained reference to the previous color (possibly itself a reference)
+                    group[f"c{i}"] = f"bench{c}.c{i - 1}" if i % 8 == 3 else f"bench{max(0, c - 1)}.c{i - 2}"
+                else:
+                    group[f"c{i}"] = f"#{(c * 37 + i * 11) % 256:02x}{(i * 53) % 256:02x}{(c * 19) % 256:02x}"
+            shipped[f"bench{c}"] = group
+        self.theme['colors'] = shipped
+        self.write_configs()
+
+    def set_keybinds(self, count):
+        """Replace the keymap with count synthetic bindings across 20 categories"""
+        words = ["move", "focus", "resize", "volume", "workspace", "launch", "toggle", "screenshot"]
+        keys = ["left", "right", "up", "down", "RETURN", "SPACE", "Print", "bracketleft"]
+        categories = {}
+        for i in range(count):
+            cat = categories.setdefault(f"cat{i % 20}", {"name": f"Category {i % 20}", "icon": "🔧", "bindings": {}})
+            combo = f"SUPER {'SHIFT ' if i % 2 else ''}CTRL{i // 8}, {keys[i % len(keys)]}"
+            cat['bindings'][combo] = {
+                "command": f"exec, cmd {i}",
+                "description": f"{words[i % len(words)].title()} {keys[i % len(keys)]} {i}"
+            }
+        self.keybinds = {"categories": categories}
+        self.write_configs()
+
+    def add_templates(self, count):
+        """Write count synthetic templates mixing placeholders, literals and $ escapes"""
+        template_dir = self.config_dir / "templates" / "bench"
+        shutil.rmtree(template_dir, ignore_errors=True)
+        template_dir.mkdir(parents=True)
+        names = ["primary_primary", "accent_secondary_rgba", "text_muted_no_hash", "gaps_inner",
+                 "font_primary", "blur_size", "rounding", "curve_primary", "rofi_width"]
+        for t in range(count):
+            lines = [f"# bench template {t}, built $DATE with $$HOME"]
+            for i in range(40):
+                lines.append(f"key_{i} = ${{{names[(t + i) % len(names)]}}} # literal {i} $x")
+            (template_dir / f"bench-{t}.template").write_text("\n".join(lines) + "\n")
+        return [f"bench/bench-{t}" for t in range(count)]
+
+class BenchmarkRunner:
+    def __init__(self, iterations, scales):
+        self.iterations = iterations
+        self.scales = scales
+        self.results = {}
+
+    def measure(self, name, func, items=1, setup=None, iterations=None):
+        """Time func over several iterations and record latency percentiles"""
+        samples = []
+        for _ in range(iterations or self.iterations):
+            if setup:
+                setup()
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - started)
+
+        p50 = statistics.median(samples)
+        self.results[name] = {
+            'iterations': len(samples),
+            'mean_ms': statistics.fmean(samples) * 1000,
+            'p50_ms': p50 * 1000,
+            'p95_ms': percentile(samples, 95) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+            'throughput': items / p50 if p50 else float('inf'),
+        }
+        print(f"   {name:<45} p50 {p50 * 1000:9.2f} ms")
+
+    def run(self):
+        with tempfile.TemporaryDirectory(prefix="hypr-bench-") as home, \
+                mock.patch.dict(os.environ, {'HOME': home, 'XDG_RUNTIME_DIR': home}), \
+                mock.patch('subprocess.run', fake_run), \
+                mock.patch('subprocess.Popen', FakePopen):
+            fixture = Fixture(home)
+            apply_theme = load_module("apply_theme", REPO_DIR / "generators" / "apply-theme.py")
+            hotkey_parser = load_module("hotkey_parser", REPO_DIR / "scripts" / "hotkey-parser.py")
+
+            print("🎨 Theme generator")
+            self.bench_palettes(fixture, apply_theme)
+            self.bench_templates(fixture, apply_theme)
+            self.bench_generate_all(fixture, apply_theme)
+
+            print("⌨️ Hotkey parser")
+            self.bench_hotkeys(fixture, hotkey_parser)
+
+        return self.results
+
+    def bench_palettes(self, fixture, apply_theme):
+        for categories, colors in self.scales['palettes']:
+            fixture.set_palette(categories, colors)
+            generator = apply_theme.ThemeGenerator()
+            self.measure(f"get_template_variables[{categories}x{colors}]",
+                         generator.get_template_variables, items=categories * colors,
+                         setup=generator.invalidate_template_context)
+        fixture.set_palette(0, 0)
+
+    def bench_templates(self, fixture, apply_theme):
+        output_dir = fixture.home / "bench-out"
+        for count in self.scales['templates']:
+            names = fixture.add_templates(count)
+            generator = apply_theme.ThemeGenerator()
+
+            def render_all():
+                for name in names:
+                    generator.generate_from_template(name, output_dir / f"{name}.conf")
+
+            def cold():
+                generator.force_rebuild = True
+                generator.template_cache = apply_theme.TemplateCache(fixture.home / "bench-cache.json")
+                generator.invalidate_template_context()
+
+            def warm():
+                generator.force_rebuild = False
+
+            self.measure(f"generate_from_template[{count}] cold", render_all, items=count, setup=cold)
+            render_all()
+            self.measure(f"generate_from_template[{count}] warm", render_all, items=count, setup=warm)
+
+    def bench_generate_all(self, fixture, apply_theme):
+        generator = apply_theme.ThemeGenerator()
+
+        def force():
+            generator.force_rebuild = True
+
+        def incremental():
+            generator.force_rebuild = False
+
+        self.measure("generate_all full", generator.generate_all, items=15, setup=force)
+        self.measure("generate_all incremental", generator.generate_all, items=15, setup=incremental)
+
+    def bench_hotkeys(self, fixture, hotkey_parser):
+        for count in self.scales['keybinds']:
+            fixture.set_keybinds(count)
+            cache_path = fixture.config_dir / ".cache" / "hotkey-index.json"
+
+            def cold_parse():
+                cache_path.unlink(missing_ok=True)
+                hotkey_parser.HotkeyParser().parse_for_json()
+
+            self.measure(f"parse_for_json[{count}] cold", cold_parse, items=count)
+            self.measure(f"parse_for_json[{count}] cached",
+                         lambda: hotkey_parser.HotkeyParser().parse_for_json(), items=count)
+
+            parser = hotkey_parser.HotkeyParser()
+            parser.search_hotkeys("")
+
+            def search_all():
+                for query in SEARCH_QUERIES:
+                    parser.search_index.term_scores.clear()
+                    parser.search_hotkeys(query)
+
+            self.measure(f"search_hotkeys[{count}]", search_all, items=len(SEARCH_QUERIES))
+
+def compare(results, baseline, tolerance):
+    """Return the benchmarks whose p50 regressed past the baseline"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference and result['p50_ms'] > reference['p50_ms'] * (1 + tolerance):
+            regressions.append((name, reference['p50_ms'], result['p50_ms']))
+    return regressions
+
+def print_table(results):
+    print(f"\n{'benchmark':<45} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'ops/s':>12}")
+    for name, r in results.items():
+        print(f"{name:<45} {r['mean_ms']:9.2f} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} "
+              f"{r['p99_ms']:9.2f} {r['throughput']:12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Theme generator and hotkey parser benchmarks')
+    parser.add_argument('--iterations', type=int, default=10,
+                       help='Samples per benchmark')
+    parser.add_argument('--quick', action='store_true',
+                       help='Only run the smallest scale of each fixture')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                       help='Baseline file to compare against or save to')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Store these results as the new baseline')
+    parser.add_argument('--require-baseline', action='store_true',
+                       help='Fail when there is no baseline to compare against (for CI)')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                       help='Allowed p50 slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--json', type=Path, metavar='PATH',
+                       help='Also write the raw results as JSON')
+
+    args = parser.parse_args()
+
+    scales = {'templates': TEMPLATE_SCALES, 'keybinds': KEYBIND_SCALES, 'palettes': PALETTE_SCALES}
+    if args.quick:
+        scales = {name: values[:1] for name, values in scales.items()}
+
+    results = BenchmarkRunner(max(1, args.iterations), scales).run()
+    print_table(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return
+
+    # Timings only compare on the machine that recorded them, so no baseline ships with the repo
+    if not args.baseline.exists():
+        print(f"\n⚠️ No baseline at {args.baseline}, regressions were NOT checked "
+              f"(record one with --save-baseline)")
+        if args.require_baseline:
+            sys.exit(1)
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    unchecked = [name for name in results if name not in baseline]
+    if unchecked:
+        print(f"\n⚠️ {len(unchecked)} benchmark(s) not in the baseline, not checked: {', '.join(unchecked)}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed more than {args.tolerance:.0%}:")
+        for name, before, after in regressions:
+            print(f"   {name}: {before:.2f} ms → {after:.2f} ms")
+        sys.exit(1)
+    print(f"\n✅ No regressions against baseline ({len(results) - len(unchecked)} checked)")
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,126 @@
 Generates all component configurations from central theme config using templates
 """
 
+import argparse
+import io
 import json
 import os
 import sys
+import multiprocessing
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
-from string import Template
+from types import MappingProxyType
 import subprocess
-import re
+
+from color_engine import ColorEngine, ColorResolutionError
+from config_model import ConfigError, ThemeConfig
+from fleet_inventory import FleetInventory, InventoryError
+from hypr_live import (HyprlandIPCError, diff_commands, get_bound_combos, get_changed_variables, parse_config,
+                        send_commands)
+from jsonc_check import check_jsonc
+from monitor_topology import MonitorTopology, format_monitor_rule, plan_workspaces
+from output_backend import FilesystemBackend, MemoryBackend, StagingBackend, format_diff, write_atomic
+from palette_extractor import PaletteExtractor
+from snapshot_store import DEFAULT_KEEP, SnapshotError, SnapshotStore
+from status_modules import format_waybar_modules
+from template_cache import TemplateCache, content_hash
+from template_linter import TemplateLinter, TemplateLintError, format_issue
+from theme_importer import ThemeImporter
+from timings import NullTimings, StageTimings
+from wallpaper_cache import WallpaperCache
+
+# Bump when the manifest layout changes so stale manifests are ignored
+MANIFEST_VERSION = 1
+
+# Services that consume each generated output, relative to output_dir.
+# Outputs mapped to no service are read fresh on every launch (rofi, hyprlock).
+OUTPUT_CONSUMERS = {
+    "hypr/hyprland.conf": ["hyprland"],
+    "hypr/configs/environment.conf": ["hyprland"],
+    "hypr/configs/animations.conf": ["hyprland"],
+    "hypr/configs/rules.conf": ["hyprland"],
+    "hypr/configs/monitors.conf": ["hyprland"],
+    "hypr/configs/autostart.conf": ["hyprland"],
+    "hypr/configs/bindings.conf": ["hyprland"],
+    "hypr/configs/workspaces.conf": ["hyprland"],
+    "hypr/hyprlock.conf": [],
+    "waybar/style.css": ["waybar"],
+    "waybar/config.jsonc": ["waybar"],
+    "rofi/config.rasi": [],
+    "rofi/themes/cyberpunk-medieval.rasi": [],
+    "dunst/dunstrc": ["dunst"],
+    "kitty/kitty.conf": ["kitty"],
+}
+
+# Checks a rendered template must pass before it is written; they raise ValueError
+OUTPUT_CHECKS = {
+    "waybar-config": check_jsonc,
+}
+
+# Per-call variables of templates rendered with additional_vars
+TEMPLATE_EXTRA_VARIABLES = {
+    "hypr-workspaces": ("workspace_plugin_config", "workspace_keybindings", "monitor_assignments"),
+    "hypr-monitors": ("monitor_rules",),
+}
+
+# Wallpaper shown on each virtual desktop, in desktop order
+WORKSPACE_WALLPAPERS = ["knight.png", "armory.png", "tavern.png", "library.png",
+                        "church.png", "crypt.png", "dungeon.png"]
+SWWW_TRANSITION = "--transition-type center --transition-step 30 --transition-duration 1"
+
+# Modifiers of each block of ten per-monitor workspaces (1-10, 11-20, ...); moving adds SHIFT
+WORKSPACE_KEY_BANKS = ("SUPER", "SUPER ALT", "SUPER CTRL", "SUPER CTRL ALT")
 
 class ThemeGenerator:
-    def __init__(self):
+    def __init__(self, timings=None, theme_config=None, output_dir=None,
+                 keybind_config=None, monitors=None, install_dir=None, output_backend=None):
+        # Stage timing hooks, no-ops unless --timings/--trace is given
+        self.timings = timings or NullTimings()
+        # Where generated files are written; only the filesystem backend touches live configs
+        self.output_backend = output_backend or FilesystemBackend()
+
         self.config_dir = Path.home() / ".config" / "hypr-system"
         self.template_dir = self.config_dir / "templates"
-        self.output_dir = Path.home() / ".config"
-
-        self.theme_config = self.load_theme_config()
-        self.keybind_config = self.load_keybind_config()
+        # Where generated configs will live, as referenced from inside them (another host's for fleet builds)
+        self.install_dir = Path(install_dir) if install_dir else Path.home() / ".config"
+        self.output_dir = Path(output_dir) if output_dir else self.install_dir
+        self.cache_dir = self.config_dir / ".cache"
+        if output_dir:
+            # Off-tree builds keep their own manifest next to their outputs
+            self.manifest_path = self.output_dir / ".manifest.json"
+        else:
+            self.manifest_path = self.cache_dir / "manifest.json"
+        self.template_cache = TemplateCache(self.cache_dir / "templates.json")
+        self.template_linter = TemplateLinter(self.cache_dir / "lint.json")
+        self.monitor_topology = MonitorTopology(self.cache_dir / "monitors.json")
+        # A fleet host's declared monitor layout, used instead of this machine's topology
+        self.monitor_overrides = monitors
+        # Pre-apply snapshots of the live tree; off-tree builds have nothing to roll back
+        self.snapshot_store = None if output_dir else SnapshotStore(self.config_dir / "backups" / "snapshots")
+        self.pending_snapshot = None
+
+        with self.timings.stage("load theme-config.json", "config"):
+            self.theme_config = theme_config if theme_config is not None else self.load_theme_config()
+        # Typed sections, parsed on first use
+        self.config = ThemeConfig(self.theme_config)
+        # Loaded by get_keybind_config() only when keybindings are generated
+        self.keybind_config = keybind_config
+
+        # Incremental generation state
+        self.force_rebuild = False
+        self.workers = 1
+        self.manifest = self.load_manifest()
+        self.rebuilt_targets = []
+        self.skipped_targets = []
+        # Text of rewritten Hyprland configs before this run, diffed for the live apply
+        self.previous_contents = {}
+
+        # Shared read-only template variables, built once per run
+        self.template_context = None
+        # Resolved color graph, rebuilt whenever the template context is invalidated
+        self.color_engine = None
 
     def load_theme_config(self):
         """Load central theme configuration"""
@@ -39,43 +143,101 @@ class ThemeGenerator:
             print("❌ Keybind config not found. Please ensure keybind-config.json exists.")
             sys.exit(1)
 
-    def hex_to_rgba(self, hexstr):
-        """Convert a hex color (#RRGGBB or #RRGGBBAA) to 'rgba(R,G,B,1.0)'."""
-        h = hexstr.lstrip('#').lower()
+    def get_keybind_config(self):
+        """keybind-config.json, read the first time keybindings are needed"""
+        if self.keybind_config is None:
+            with self.timings.stage("load keybind-config.json", "config"):
+                self.keybind_config = self.load_keybind_config()
+        return self.keybind_config
 
-        if len(h) == 6 or len(h) == 8:
-            try:
-                r = int(h[0:2], 16)
-                g = int(h[2:4], 16)
-                b = int(h[4:6], 16)
-            except ValueError:
-                raise ValueError(f"Invalid hex digits in: {hexstr!r}")
-            return f"rgba({r},{g},{b},1.0)"
-        else:
-            raise ValueError(f"Invalid hex length: {hexstr!r}")
+    def reload_configs(self):
+        """Re-read both central configs, e.g. after an edit seen by the daemon"""
+        self.theme_config = self.load_theme_config()
+        self.config = ThemeConfig(self.theme_config)
+        self.keybind_config = None
+        self.invalidate_template_context()
 
-    def resolve_color(self, color_ref):
-        """Resolve color references like 'cyberpunk.neon_cyan' to actual hex values"""
-        if color_ref.startswith('#') or color_ref.startswith('rgba'):
-            return color_ref
+    def load_manifest(self):
+        """Load the generation manifest from the previous run"""
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return {'version': MANIFEST_VERSION, 'targets': {}}
+
+    def save_manifest(self):
+        """Persist the generation manifest for the next run"""
+        try:
+            write_atomic(self.manifest_path, json.dumps(self.manifest, indent=2, sort_keys=True))
+        except OSError as e:
+            print(f"⚠️ Could not save generation manifest: {e}")
+
+    def save_caches(self):
+        """Persist the manifest and compiled templates after writing outputs in place
+
+        The manifest describes the live files, which dry runs and staging builds
+        leave alone, so those save nothing.
+        """
+        if not self.output_backend.live:
+            return
+        with self.timings.stage("save caches", "manifest"):
+            self.save_manifest()
+            self.template_cache.save()
+
+    def is_up_to_date(self, output_path, inputs):
+        """Check whether an output was produced from the same inputs and is untouched"""
+        if self.force_rebuild:
+            return False
+
+        entry = self.manifest['targets'].get(str(output_path))
+        if not entry or entry.get('inputs') != inputs:
+            return False
+
+        content = self.output_backend.read(output_path)
+        return content is not None and content_hash(content) == entry.get('output')
+
+    def record_output(self, output_path, inputs, content):
+        """Record the inputs and output hash of a freshly written target"""
+        self.manifest['targets'][str(output_path)] = {
+            'inputs': inputs,
+            'output': content_hash(content),
+        }
+        self.rebuilt_targets.append(output_path)
+
+    def remember_previous(self, output_path):
+        """Keep the old text of a Hyprland config about to be rewritten"""
+        try:
+            key = Path(output_path).relative_to(self.output_dir).as_posix()
+        except ValueError:
+            return
+        if 'hyprland' not in OUTPUT_CONSUMERS.get(key, ()) or output_path in self.previous_contents:
+            return
+        self.previous_contents[output_path] = self.output_backend.read(output_path)
+
+    def hash_used_variables(self, template, vars_dict):
+        """Hash only the variables a template actually references"""
+        used = {name: str(vars_dict[name]) if name in vars_dict else None
+                for name in template.names}
+        return content_hash(json.dumps(used, sort_keys=True))
+
+    def get_color_engine(self):
+        """Resolve the whole color reference graph once per theme_config"""
+        if self.color_engine is None:
+            with self.timings.stage("resolve colors", "variables"):
+                self.color_engine = ColorEngine(self.theme_config['colors'],
+                                                self.theme_config.get('color_shades'))
+        return self.color_engine
 
-        parts = color_ref.split('.')
-        if len(parts) == 2:
-            category, color = parts
-            if category in self.theme_config['colors'] and color in self.theme_config['colors'][category]:
-                return self.theme_config['colors'][category][color]
-        return color_ref
+    def resolve_color(self, color_ref):
+        """Resolve color references like 'cyberpunk.neon_cyan' (chains included) to actual values"""
+        return self.get_color_engine().resolve(color_ref)
 
     def get_resolved_colors(self):
-        """Get all colors with references resolved"""
-        colors = {}
-        for category, color_group in self.theme_config['colors'].items():
-            colors[category] = {}
-            for name, value in color_group.items():
-                colors[category][name] = self.resolve_color(value)
-                colors[category][name + "_no_hash"] = self.resolve_color(value)[1:]
-                colors[category][name + "_rgba"] = self.hex_to_rgba(value)
-        return colors
+        """Get all colors with references resolved, plus their derived forms and shades"""
+        return self.get_color_engine().get_resolved_colors()
 
     def get_template_variables(self):
         """Get all template variables for substitution"""
@@ -94,96 +256,139 @@ class ThemeGenerator:
                 resolved_color = self.resolve_color(color_ref)
                 vars_dict[name] = resolved_color
 
-        # Add theme settings
+        # Add theme settings, validating all the sections they come from at once
+        self.config.require('typography', 'spacing', 'effects', 'components')
+        typography = self.config.typography
+        spacing = self.config.spacing
+        effects = self.config.effects
+        components = self.config.components
+
         vars_dict.update({
-            'output_dir': self.output_dir, # .config/
-            'config_dir': self.config_dir, # .config/hypr-system/
-            'font_primary': theme.get('typography', {}).get('font_primary', 'JetBrains Mono Nerd Font'),
-            'font_secondary': theme['typography']['font_secondary'],
-            'font_size_small': theme['typography']['size_small'],
-            'font_size_normal': theme['typography']['size_normal'],
-            'font_size_large': theme['typography']['size_large'],
-            'font_size_title': theme['typography']['size_title'],
-            'font_size_icon_small': theme['typography']['icon_small'],
-            'font_size_icon_medium': theme['typography']['icon_medium'],
-            'font_size_icon_large': theme['typography']['icon_large'],
-
-            'primary_quaternary': theme['colors']['primary'].get('quaternary', theme['colors']['primary']['quaternary']),
-
-            'gaps_inner': theme['spacing']['gaps_inner'],
-            'gaps_outer': theme['spacing']['gaps_outer'],
-            'border_width': theme['spacing']['border_width'],
-            'rounding': theme['spacing']['rounding'],
-            'margin_small': theme['spacing']['margins']['small'],
-            'margin_medium': theme['spacing']['margins']['medium'],
-            'margin_large': theme['spacing']['margins']['large'],
-            'margin_xlarge': theme['spacing']['margins']['xlarge'],
-
-            'blur_enabled': str(theme['effects']['blur']['enabled']).lower(),
-            'blur_size': theme['effects']['blur']['size'],
-            'blur_passes': theme['effects']['blur']['passes'],
-            'blur_vibrancy': theme['effects']['blur']['vibrancy'],
-
-            'shadow_enabled': str(theme['effects']['shadow']['enabled']).lower(),
-            'shadow_range': theme['effects']['shadow']['range'],
-            'shadow_render_power': theme['effects']['shadow']['render_power'],
-
-            'anim_enabled': str(theme['effects']['animations']['enabled']).lower(),
-            'curve_primary': theme['effects']['animations']['curves']['primary'],
-            'curve_secondary': theme['effects']['animations']['curves']['secondary'],
-            'curve_tertiary': theme['effects']['animations']['curves']['tertiary'],
-            'curve_quaternary': theme['effects']['animations']['curves']['quaternary'],
-
-            'waybar_height': theme['components']['waybar']['height'],
-            'waybar_margin_top': theme['components']['waybar']['margin_top'],
-            'waybar_margin_sides': theme['components']['waybar']['margin_sides'],
-
-            'rofi_width': theme['components']['rofi']['width'],
-            'rofi_lines': theme['components']['rofi']['lines'],
+            'output_dir': self.install_dir, # .config/
+            'config_dir': self.install_dir / "hypr-system", # .config/hypr-system/
+            'font_primary': typography.font_primary,
+            'font_secondary': typography.font_secondary,
+            'font_size_small': typography.size_small,
+            'font_size_normal': typography.size_normal,
+            'font_size_large': typography.size_large,
+            'font_size_title': typography.size_title,
+            'font_size_icon_small': typography.icon_small,
+            'font_size_icon_medium': typography.icon_medium,
+            'font_size_icon_large': typography.icon_large,
+
+            'gaps_inner': spacing.gaps_inner,
+            'gaps_outer': spacing.gaps_outer,
+            'border_width': spacing.border_width,
+            'rounding': spacing.rounding,
+            'margin_small': spacing.margins.small,
+            'margin_medium': spacing.margins.medium,
+            'margin_large': spacing.margins.large,
+            'margin_xlarge': spacing.margins.xlarge,
+
+            'blur_enabled': str(effects.blur.enabled).lower(),
+            'blur_size': effects.blur.size,
+            'blur_passes': effects.blur.passes,
+            'blur_vibrancy': effects.blur.vibrancy,
+
+            'shadow_enabled': str(effects.shadow.enabled).lower(),
+            'shadow_range': effects.shadow.range,
+            'shadow_render_power': effects.shadow.render_power,
+
+            'anim_enabled': str(effects.animations.enabled).lower(),
+            'curve_primary': effects.animations.curves.primary,
+            'curve_secondary': effects.animations.curves.secondary,
+            'curve_tertiary': effects.animations.curves.tertiary,
+            'curve_quaternary': effects.animations.curves.quaternary,
+
+            'waybar_height': components.waybar.height,
+            'waybar_margin_top': components.waybar.margin_top,
+            'waybar_margin_sides': components.waybar.margin_sides,
+            # Custom modules streamed by generators/status_daemon.py
+            'waybar_status_modules': format_waybar_modules(),
+
+            'rofi_width': components.rofi.width,
+            'rofi_lines': components.rofi.lines,
         })
 
         return vars_dict
 
+    def get_template_context(self, additional_vars=None):
+        """Get the read-only template namespace, with optional per-call overlays
+
+        The base variables are computed once and shared by every template;
+        additional_vars are layered on top without copying the base.
+        """
+        if self.template_context is None:
+            with self.timings.stage("build template variables", "variables"):
+                self.template_context = MappingProxyType(self.get_template_variables())
+
+        if not additional_vars:
+            return self.template_context
+        return MappingProxyType(ChainMap(additional_vars, self.template_context))
+
+    def invalidate_template_context(self):
+        """Drop the cached namespace after theme_config changes"""
+        self.template_context = None
+        self.color_engine = None
+
+    def get_derived_color_variables(self):
+        """Names of every generated color form, which templates use only selectively"""
+        suffixes = self.get_color_engine().get_suffixes()
+        return {f"{category}_{name}{suffix}"
+                for category, group in self.theme_config['colors'].items()
+                for name in group for suffix in suffixes}
+
+    def check_templates(self):
+        """Lint all templates against the template variables
+
+        Raises TemplateLintError on undefined or malformed placeholders and
+        returns the unused-variable warnings.
+        """
+        context = self.get_template_context()
+        with self.timings.stage("lint templates", "lint"):
+            errors, warnings = self.template_linter.lint(
+                self.template_dir, context, TEMPLATE_EXTRA_VARIABLES,
+                ignore_unused=self.get_derived_color_variables(), save=self.output_backend.live)
+        if errors:
+            raise TemplateLintError(errors)
+        return warnings
+
     def load_template(self, template_name):
-        """Load a template file"""
+        """Load a compiled template from the template cache"""
         template_path = self.template_dir / f"{template_name}.template"
-        if not template_path.exists():
+        template = self.template_cache.get(template_path)
+        if template is None:
             print(f"⚠️ Template {template_name} not found at {template_path}")
-            return None
-
-        with open(template_path, 'r') as f:
-            return Template(f.read())
+        return template
 
     def generate_from_template(self, template_name, output_path, additional_vars=None):
-        raw_template = self.load_template(template_name)
-        if not raw_template:
+        with self.timings.stage("load", "template", template_name):
+            template = self.load_template(template_name)
+        if not template:
             return False
 
-        # If it's a Template object, get the raw string
-        if isinstance(raw_template, Template):
-            raw_template = raw_template.template
+        vars_dict = self.get_template_context(additional_vars)
 
-        # Escape ALL $ signs not part of ${...}
-        # This turns:
-        #   $TIME → $$TIME
-        #   $DATE$ → $$DATE$
-        #   cmd[...] → cmd[...]
-        #   ${something} → stays untouched
-        sanitized = re.sub(r'\$(?!\{)', r'$$', raw_template)
-
-        template = Template(sanitized)
-
-        vars_dict = self.get_template_variables()
-        if additional_vars:
-            vars_dict.update(additional_vars)
+        with self.timings.stage("check", "manifest", template_name):
+            inputs = {
+                'template': template.source_hash,
+                'variables': self.hash_used_variables(template, vars_dict),
+            }
+            up_to_date = self.is_up_to_date(output_path, inputs)
+        if up_to_date:
+            self.skipped_targets.append(output_path)
+            return True
 
         try:
-            content = template.safe_substitute(vars_dict)
-
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'w') as f:
-                f.write(content)
-
+            with self.timings.stage("render", "render", template_name):
+                content = template.render(vars_dict)
+            if template_name in OUTPUT_CHECKS:
+                OUTPUT_CHECKS[template_name](content)
+            with self.timings.stage("write", "write", template_name):
+                self.remember_previous(output_path)
+                self.output_backend.write(output_path, content)
+
+            self.record_output(output_path, inputs, content)
             return True
         except Exception as e:
             print(f"❌ Error generating {template_name}: {e}")
@@ -194,56 +399,99 @@ class ThemeGenerator:
         """Generate keybindings configuration"""
         print("⌨️ Generating keybindings...")
 
+        output_path = self.output_dir / "hypr" / "configs" / "bindings.conf"
+        keybind_config = self.get_keybind_config()
+        inputs = {'keybinds': content_hash(json.dumps(keybind_config['categories'], sort_keys=True))}
+        if self.is_up_to_date(output_path, inputs):
+            self.skipped_targets.append(output_path)
+            return
+
         bindings_content = "# 🗡️ Generated Keybindings - DO NOT EDIT MANUALLY\n\n"
 
-        for category_name, category in self.keybind_config['categories'].items():
+        for category_name, category in keybind_config['categories'].items():
             bindings_content += f"# {category['name']}\n"
             for key_combo, binding in category['bindings'].items():
                 bind_type = binding.get('type', 'bind')
                 bindings_content += f"{bind_type} = {key_combo}, {binding['command']}\n"
             bindings_content += "\n"
 
-        output_path = self.output_dir / "hypr" / "configs" / "bindings.conf"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.timings.stage("write bindings", "write"):
+            self.remember_previous(output_path)
+            self.output_backend.write(output_path, bindings_content)
+
+        self.record_output(output_path, inputs, bindings_content)
+
+    def get_monitors(self):
+        """Connected monitors from the topology cache, querying Hyprland only on a miss
+
+        Dry runs and staging builds never query, as that would also write the cache.
+        """
+        if self.monitor_overrides is not None:
+            return self.monitor_overrides
+        with self.timings.stage("monitor topology", "ipc"):
+            return self.monitor_topology.get_monitors(query=self.output_backend.live)
 
-        with open(output_path, 'w') as f:
-            f.write(bindings_content)
+    def get_wallpaper_commands(self):
+        """swww command per wallpaper, using copies pre-scaled to each monitor when possible"""
+        scaled = {}
+        # Pre-scaled copies only exist in this machine's cache, so fleet hosts use the originals
+        monitors = self.get_monitors() if self.monitor_overrides is None else None
+        if monitors:
+            try:
+                with self.timings.stage("prescale wallpapers", "wallpaper"):
+                    cache = WallpaperCache(self.config_dir / "wallpapers", self.cache_dir / "wallpapers")
+                    # Dry runs point at the files a live apply would build, without building them
+                    scaled = cache.build(monitors, write=self.output_backend.live)
+            except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+                print(f"⚠️ Wallpaper cache unavailable ({e}), using full-size wallpapers")
+
+        commands = {}
+        for wallpaper in WORKSPACE_WALLPAPERS:
+            if scaled.get(wallpaper):
+                commands[wallpaper] = "; ".join(
+                    f"swww img -o {','.join(outputs)} {path} {SWWW_TRANSITION}"
+                    for outputs, path in scaled[wallpaper])
+            else:
+                commands[wallpaper] = f"swww img ~/.config/hypr-system/wallpapers/{wallpaper} {SWWW_TRANSITION}"
+        return commands
 
     def get_workspace_variables(self):
         """Get workspace-specific template variables"""
-        workspace_config = self.theme_config.get('workspaces', {})
-        mode = workspace_config.get('mode', 'virtual_desktops')
+        workspace_config = self.config.workspaces
+        mode = workspace_config.mode
 
         # Generate plugin configuration
         plugin_config = ""
         if mode == 'virtual_desktops':
-            vdesk_config = workspace_config.get('virtual_desktops', {}).get('plugin_config', {})
+            vdesk_config = workspace_config.virtual_desktops.get('plugin_config', {})
             if vdesk_config:
                 plugin_config = "plugin {\n  virtual-desktops {\n"
                 for key, value in vdesk_config.items():
                     plugin_config += f"    {key} = {value}\n"
                 plugin_config += "  }\n}\n"
 
+        # Plan monitor assignments first (per-monitor mode), so every planned workspace gets keys
+        plan = {}
+        if mode == 'per_monitor':
+            monitors = self.get_monitors()
+            if len(monitors) >= 2:
+                layout = workspace_config.per_monitor.get('layout')
+                try:
+                    plan = plan_workspaces(monitors, layout)
+                except ValueError as e:
+                    print(f"⚠️ Invalid workspace layout ({e}), using the default layout")
+                    plan = plan_workspaces(monitors)
+
         # Generate keybindings
         keybindings = ""
         if mode == 'virtual_desktops':
             keybindings += "# Virtual desktop keybindings\n"
             keybindings += "bind = SUPER, bracketleft, backcyclevdesks\n"
             keybindings += "bind = SUPER, bracketright, cyclevdesks\n"
-            keybindings += "bind = SUPER, 1, vdesk, 1\n"
-            keybindings += "bind = SUPER, 1, exec, swww img ~/.config/hypr-system/wallpapers/knight.png --transition-type center --transition-step 30 --transition-duration 1\n"
-            keybindings += "bind = SUPER, 2, vdesk, 2\n"
-            keybindings += "bind = SUPER, 2, exec, swww img ~/.config/hypr-system/wallpapers/armory.png --transition-type center --transition-step 30 --transition-duration 1\n"
-            keybindings += "bind = SUPER, 3, vdesk, 3\n"
-            keybindings += "bind = SUPER, 3, exec, swww img ~/.config/hypr-system/wallpapers/tavern.png --transition-type center --transition-step 30 --transition-duration 1\n"
-            keybindings += "bind = SUPER, 4, vdesk, 4\n"
-            keybindings += "bind = SUPER, 4, exec, swww img ~/.config/hypr-system/wallpapers/library.png --transition-type center --transition-step 30 --transition-duration 1\n"
-            keybindings += "bind = SUPER, 5, vdesk, 5\n"
-            keybindings += "bind = SUPER, 5, exec, swww img ~/.config/hypr-system/wallpapers/church.png --transition-type center --transition-step 30 --transition-duration 1\n"
-            keybindings += "bind = SUPER, 6, vdesk, 6\n"
-            keybindings += "bind = SUPER, 6, exec, swww img ~/.config/hypr-system/wallpapers/crypt.png --transition-type center --transition-step 30 --transition-duration 1\n"
-            keybindings += "bind = SUPER, 7, vdesk, 7\n"
-            keybindings += "bind = SUPER, 7, exec, swww img ~/.config/hypr-system/wallpapers/dungeon.png --transition-type center --transition-step 30 --transition-duration 1\n"
+            wallpaper_commands = self.get_wallpaper_commands()
+            for i, wallpaper in enumerate(WORKSPACE_WALLPAPERS, 1):
+                keybindings += f"bind = SUPER, {i}, vdesk, {i}\n"
+                keybindings += f"bind = SUPER, {i}, exec, {wallpaper_commands[wallpaper]}\n"
             keybindings += "bind = SUPER SHIFT, 1, movetodesksilent, 1\n"
             keybindings += "bind = SUPER SHIFT, 2, movetodesksilent, 2\n"
             keybindings += "bind = SUPER SHIFT, 3, movetodesksilent, 3\n"
@@ -253,32 +501,22 @@ class ThemeGenerator:
             keybindings += "bind = SUPER SHIFT, 7, movetodesksilent, 7\n"
         else:
             keybindings += "# Per-monitor workspace keybindings\n"
-            for i in range(1, 11):
-                keybindings += f"bind = SUPER, {i}, workspace, {i}\n"
-            for i in range(1, 11):
-                keybindings += f"bind = SUPER SHIFT, {i}, movetoworkspace, {i}\n"
+            workspace_keys = self.get_workspace_keys(plan)
+            for workspace, (mods, key) in workspace_keys.items():
+                keybindings += f"bind = {mods}, {key}, workspace, {workspace}\n"
+            for workspace, (mods, key) in workspace_keys.items():
+                keybindings += f"bind = {mods} SHIFT, {key}, movetoworkspace, {workspace}\n"
             keybindings += "bind = SUPER, bracketright, workspace, m+1\n"
             keybindings += "bind = SUPER, bracketleft, workspace, m-1\n"
 
         # Generate monitor assignments (for per-monitor mode)
         monitor_assignments = ""
-        if mode == 'per_monitor':
-            try:
-                import subprocess
-                result = subprocess.run(['hyprctl', 'monitors', '-j'],
-                                        capture_output=True, text=True)
-                if result.returncode == 0:
-                    monitors_data = json.loads(result.stdout)
-                    if len(monitors_data) >= 2:
-                        monitor_assignments += "# Monitor workspace assignments\n"
-                        # Primary monitor: workspaces 1-5
-                        for i in range(1, 6):
-                            monitor_assignments += f"workspace = {i}, monitor:{monitors_data[0]['name']}\n"
-                        # Secondary monitor: workspaces 6-10
-                        for i in range(6, 11):
-                            monitor_assignments += f"workspace = {i}, monitor:{monitors_data[1]['name']}\n"
-            except:
-                pass
+        if plan:
+            monitor_assignments += "# Monitor workspace assignments\n"
+            for monitor_name, workspaces in plan.items():
+                for index, workspace in enumerate(workspaces):
+                    default = ", default:true" if index == 0 else ""
+                    monitor_assignments += f"workspace = {workspace}, monitor:{monitor_name}{default}\n"
 
         return {
             'workspace_plugin_config': plugin_config,
@@ -286,11 +524,43 @@ class ThemeGenerator:
             'monitor_assignments': monitor_assignments
         }
 
+    def get_workspace_keys(self, plan):
+        """(mods, key) reaching each workspace: 1-10 as always, planned ones above in WORKSPACE_KEY_BANKS"""
+        workspaces = set(range(1, 11))
+        for planned in plan.values():
+            workspaces.update(planned)
+
+        keys = {}
+        unreachable = []
+        for workspace in sorted(workspaces):
+            bank, digit = divmod(workspace - 1, 10)
+            if workspace < 1 or bank >= len(WORKSPACE_KEY_BANKS):
+                unreachable.append(workspace)
+            elif bank == 0:
+                keys[workspace] = (WORKSPACE_KEY_BANKS[0], str(workspace))
+            else:
+                keys[workspace] = (WORKSPACE_KEY_BANKS[bank], str((digit + 1) % 10))
+        if unreachable:
+            print(f"⚠️ No keybind for workspace(s) {', '.join(map(str, unreachable))}")
+        return keys
+
+    def get_monitor_variables(self):
+        """monitor= lines: a fleet host's declared layout, else this machine's hypr-monitors-local.template
+
+        A host with declared monitors gets only its own rules, never this machine's.
+        """
+        if self.monitor_overrides:
+            rules = "\n".join(format_monitor_rule(monitor) for monitor in self.monitor_overrides)
+            return {'monitor_rules': rules}
+        local_rules = self.load_template('hypr-monitors-local')
+        return {'monitor_rules': local_rules.render({}).rstrip("\n") if local_rules else ""}
+
     def generate_workspaces(self):
         """Generate workspace configuration"""
         print("🗡️ Generating workspace configuration...")
 
-        workspace_vars = self.get_workspace_variables()
+        with self.timings.stage("workspace variables", "variables"):
+            workspace_vars = self.get_workspace_variables()
 
         success = self.generate_from_template(
             'hypr-workspaces',
@@ -303,28 +573,91 @@ class ThemeGenerator:
         else:
             print("❌ Failed to generate workspace configuration")
 
+    def get_snapshot_paths(self):
+        """Every file an apply may rewrite, including the config it was rendered from"""
+        return [self.config_dir / "core" / "theme-config.json",
+                *(output_path for _, output_path in self.get_output_targets()),
+                self.output_dir / "hypr" / "configs" / "bindings.conf",
+                self.output_dir / "hypr" / "configs" / "workspaces.conf"]
+
+    def take_snapshot(self):
+        """Capture the live files before the first write of an apply
+
+        The editor scripts rewrite theme-config.json before calling us, so the
+        snapshot records the config the current outputs were rendered from
+        (pinned by the previous apply) rather than the already edited one.
+        """
+        if self.snapshot_store is None or not self.output_backend.live or self.pending_snapshot is not None:
+            return
+        with self.timings.stage("capture snapshot", "snapshot"):
+            self.pending_snapshot = self.snapshot_store.capture(self.get_snapshot_paths())
+            applied_config = self.snapshot_store.get_pin('applied-config')
+            if applied_config is not None:
+                self.pending_snapshot[str(self.config_dir / "core" / "theme-config.json")] = applied_config
+
+    def finish_snapshot(self):
+        """Commit the captured state only if the apply changed something, then prune"""
+        entries, self.pending_snapshot = self.pending_snapshot, None
+        if entries is None:
+            return
+        with self.timings.stage("commit snapshot", "snapshot"):
+            if self.snapshot_store.get_changes(entries):
+                self.snapshot_store.commit(entries, 'apply', self.get_snapshot_paths())
+                self.snapshot_store.prune(keep=DEFAULT_KEEP, label='apply')
+            self.snapshot_store.pin('applied-config', self.config_dir / "core" / "theme-config.json")
+
+    def rollback(self):
+        """Restore the files the last apply changed and reload the services reading them"""
+        result = self.snapshot_store.rollback('apply')
+        if result is None:
+            print("⚠️ No applied changes to roll back")
+            return None
+
+        snapshot_id, restored = result
+        # The outputs now come from the restored config, so later snapshots must record that one
+        self.snapshot_store.pin('applied-config', self.config_dir / "core" / "theme-config.json")
+        print(f"⏪ Rolled back to {snapshot_id} ({len(restored)} file(s) restored)")
+        for path in sorted(restored):
+            print(f"   {path}")
+
+        # The restored outputs no longer match the manifest, so the next apply rebuilds them
+        theme_config_path = str(self.config_dir / "core" / "theme-config.json")
+        if theme_config_path in restored:
+            self.reload_configs()
+        outputs = [path for path in restored if path != theme_config_path]
+        if outputs:
+            self.reload_system(outputs)
+        return snapshot_id
+
     def switch_workspace_mode(self):
         """Switch between virtual_desktops and per_monitor modes"""
-        current_mode = self.theme_config.get('workspaces', {}).get('mode', 'virtual_desktops')
+        self.take_snapshot()
+        current_mode = self.config.workspaces.mode
         new_mode = 'per_monitor' if current_mode == 'virtual_desktops' else 'virtual_desktops'
 
         # Update theme config
         if 'workspaces' not in self.theme_config:
             self.theme_config['workspaces'] = {}
         self.theme_config['workspaces']['mode'] = new_mode
+        self.config.invalidate('workspaces')
 
         # Save updated config
-        with open(self.config_dir / "core" / "theme-config.json", 'w') as f:
-            json.dump(self.theme_config, f, indent=2)
+        self.output_backend.write(self.config_dir / "core" / "theme-config.json",
+                                  json.dumps(self.theme_config, indent=2))
 
         print(f"🔄 Switched workspace mode to: {new_mode}")
 
         # Regenerate workspace config
+        self.previous_contents = {}
         self.generate_workspaces()
+        self.save_caches()
+        self.finish_snapshot()
+        if not self.output_backend.live:
+            return new_mode
 
-        # Reload Hyprland
+        # Apply the new workspace binds live, or reload Hyprland
         try:
-            subprocess.run(['hyprctl', 'reload'], check=True)
+            self.reload_hyprland()
             subprocess.run(['notify-send', '🗡️ Workspace Mode Changed',
                             f'Switched to {new_mode.replace("_", " ").title()}', '-t', '3000'])
         except:
@@ -332,12 +665,84 @@ class ThemeGenerator:
 
         return new_mode
 
+    def apply_wallpaper_palette(self, image_path):
+        """Replace the extracted color categories with a wallpaper's palette and save theme-config.json"""
+        extractor = PaletteExtractor(self.cache_dir / "palettes.json")
+        with self.timings.stage("extract palette", "palette"):
+            palette = extractor.extract(Path(image_path).expanduser())
+
+        self.take_snapshot()
+        self.theme_config['colors'].update(palette)
+        self.output_backend.write(self.config_dir / "core" / "theme-config.json",
+                                  json.dumps(self.theme_config, indent=2))
+        self.invalidate_template_context()
+
+        print(f"🖼️ Applied palette from {image_path}")
+        return palette
+
     def generate_all(self):
-        """Generate all configurations"""
-        print("🚀 Generating all configurations from templates...")
+        """Generate all configurations and reload what changed"""
+        # Pre-flight: refuse to write or reload anything a broken template would produce
+        self.rebuilt_targets = []
+        try:
+            self.check_templates()
 
-        # Generate from templates
-        configs = [
+            self.take_snapshot()
+            self.generate_outputs()
+        finally:
+            # Also keeps the pre-palette state when the pre-flight check refuses to write
+            self.finish_snapshot()
+
+        if not self.rebuilt_targets:
+            print("✨ Nothing changed, skipping reload")
+            return
+        if not self.output_backend.live:
+            # Dry runs and staging builds never reload anything
+            return
+
+        # Reload only the services whose inputs changed
+        with self.timings.stage("reload system", "reload"):
+            self.reload_system(self.rebuilt_targets)
+
+    def dry_run(self, render, show_diff=False):
+        """Run render against the in-memory backend and report what it would change
+
+        Progress output is dropped so --diff output is a clean patch; errors and
+        warnings still go to stderr.
+        """
+        log = io.StringIO()
+        with redirect_stdout(log):
+            render()
+        for line in log.getvalue().splitlines():
+            if line.startswith(('❌', '⚠️')):
+                print(line, file=sys.stderr)
+
+        changes = self.output_backend.get_changes()
+        if not changes:
+            print("✨ Dry run: nothing would change")
+            return changes
+
+        if show_diff:
+            for path, old, new in changes:
+                sys.stdout.write(format_diff(path, old, new))
+
+        print(f"🔍 Dry run: {len(changes)} file(s) would change")
+        for path, old, _ in changes:
+            print(f"   {'+' if old is None else '~'} {path}")
+
+        theme_config_path = self.config_dir / "core" / "theme-config.json"
+        outputs = [path for path, _, _ in changes if path != theme_config_path]
+        services = [name for name in self.get_service_reloaders() if name in self.get_affected_services(outputs)]
+        if 'hyprland' in services:
+            commands = self.get_live_commands()
+            if commands is not None:
+                services[services.index('hyprland')] = f"hyprland ({len(commands)} live change(s))"
+        print(f"🔄 Would reload: {', '.join(services) or 'nothing'}")
+        return changes
+
+    def get_output_targets(self):
+        """Template outputs produced by every run, as (template, path) pairs"""
+        return [
             ("hyprland", self.output_dir / "hypr" / "hyprland.conf"),
             ("hypr-environment", self.output_dir / "hypr" / "configs" / "environment.conf"),
             ("hypr-animations", self.output_dir / "hypr" / "configs" / "animations.conf"),
@@ -353,64 +758,485 @@ class ThemeGenerator:
             ("kitty", self.output_dir / "kitty" / "kitty.conf"),
         ]
 
+    def generate_outputs(self):
+        """Render and write every output without reloading anything"""
+        print("🚀 Generating all configurations from templates...")
+        self.rebuilt_targets = []
+        self.skipped_targets = []
+        self.previous_contents = {}
+
+        # Generate from templates
+        configs = self.get_output_targets()
+
+        # Build the shared namespace up front so workers never race to create it
+        self.get_template_context()
+
+        with self.timings.stage("render and write outputs", "generator"), \
+                ThreadPoolExecutor(max_workers=self.workers) as pool:
+            extra_variables = {'hypr-monitors': self.get_monitor_variables()}
+            template_jobs = [pool.submit(self.generate_from_template, template_name, output_path,
+                                         extra_variables.get(template_name))
+                             for template_name, output_path in configs]
+
+            # Generate keybindings and workspaces (these are special cases)
+            special_jobs = [pool.submit(self.generate_keybindings),
+                            pool.submit(self.generate_workspaces)]
+
+        for job in special_jobs:
+            job.result()
+
         success_count = 0
-        for template_name, output_path in configs:
-            if self.generate_from_template(template_name, output_path):
-                print(f"✅ Generated {output_path}")
+        for (template_name, output_path), job in zip(configs, template_jobs):
+            if job.result():
+                if output_path in self.skipped_targets:
+                    print(f"⏭️ Unchanged {output_path}")
+                else:
+                    print(f"✅ Generated {output_path}")
                 success_count += 1
             else:
                 print(f"❌ Failed to generate {output_path}")
 
-        # Generate keybindings and waybar config (these are special cases)
-        self.generate_keybindings()
-        self.generate_workspaces()
+        self.save_caches()
 
         print(f"✅ Generated {success_count}/{len(configs)} configurations successfully!")
+        self.report_changes()
+
+        return success_count == len(configs)
+
+    def report_changes(self):
+        """Summarize which targets were rebuilt and which were skipped"""
+        print(f"🔨 Rebuilt {len(self.rebuilt_targets)} target(s):")
+        for path in sorted(self.rebuilt_targets):
+            print(f"   {path}")
+        print(f"⏭️ Skipped {len(self.skipped_targets)} unchanged target(s):")
+        for path in sorted(self.skipped_targets):
+            print(f"   {path}")
+
+    def get_affected_services(self, changed_outputs):
+        """Map changed output files to the services that consume them"""
+        reloaders = self.get_service_reloaders()
+        services = set()
+        for output_path in changed_outputs:
+            try:
+                key = Path(output_path).relative_to(self.output_dir).as_posix()
+            except ValueError:
+                key = None
+            if key not in OUTPUT_CONSUMERS:
+                # Unknown output, be safe and reload everything
+                return set(reloaders)
+            services.update(OUTPUT_CONSUMERS[key])
+        return services
+
+    def get_service_reloaders(self):
+        """Reload handlers for each service, in reload order"""
+        return {
+            'hyprland': self.reload_hyprland,
+            'waybar': self.reload_waybar,
+            'dunst': self.reload_dunst,
+            'kitty': self.reload_kitty,
+        }
 
-        # Reload system
-        self.reload_system()
+    def get_live_commands(self):
+        """keyword/bind/unbind commands for the rewritten Hyprland configs, or None if a reload is needed"""
+        if not self.previous_contents or None in self.previous_contents.values():
+            return None
 
-    def reload_system(self):
-        """Reload Hyprland and restart services"""
-        print("🔄 Reloading system...")
+        # Everything Hyprland sources, as it reads it after this run
+        current = {}
+        for key, services in OUTPUT_CONSUMERS.items():
+            if 'hyprland' in services:
+                text = self.output_backend.read(self.output_dir / key)
+                if text is not None:
+                    current[self.output_dir / key] = parse_config(text)
+
+        variables = {}
+        for config in current.values():
+            variables.update(config.variables)
+
+        commands = []
+        for output_path, old_text in self.previous_contents.items():
+            old, new = parse_config(old_text), current.get(Path(output_path))
+            if new is None:
+                return None
+            # Variables are expanded at parse time, so a changed one in use needs a reload
+            changed = get_changed_variables(old, new)
+            if any(changed & config.references for config in current.values()):
+                return None
+            shared_combos = set()
+            for path, config in current.items():
+                if path != Path(output_path):
+                    shared_combos |= get_bound_combos(config, variables)
+            changes = diff_commands(old, new, variables, shared_combos)
+            if changes is None:
+                return None
+            commands += changes
+        return commands
+
+    def reload_hyprland(self):
+        """Push changed settings and binds over IPC, re-reading every config file only when needed"""
+        commands = self.get_live_commands()
+        self.previous_contents = {}
+
+        if commands == []:
+            # Only comments or untouched statements changed
+            return
+        if commands is not None:
+            try:
+                send_commands(commands)
+                print(f"⚡ Applied {len(commands)} Hyprland change(s) live")
+                return
+            except HyprlandIPCError as e:
+                print(f"⚠️ Live apply failed ({e}), reloading Hyprland")
+        subprocess.run(["hyprctl", "reload"], check=False, capture_output=True)
+
+    def reload_waybar(self):
+        """Reload Waybar config and style in place, starting it if not running"""
+        result = subprocess.run(["pkill", "-SIGUSR2", "-x", "waybar"], check=False, capture_output=True)
+        if result.returncode != 0:
+            subprocess.Popen(["waybar"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
+    def reload_dunst(self):
+        """Reload dunstrc in place, falling back to a restart on older dunst"""
         try:
-            # Reload Hyprland
-            subprocess.run(["hyprctl", "reload"], check=False, capture_output=True)
+            result = subprocess.run(["dunstctl", "reload"], check=False, capture_output=True)
+            if result.returncode == 0:
+                return
+        except FileNotFoundError:
+            pass
+        subprocess.run(["pkill", "dunst"], check=False, capture_output=True)
+        subprocess.Popen(["dunst"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def reload_kitty(self):
+        """Ask running kitty instances to re-read kitty.conf"""
+        subprocess.run(["pkill", "-SIGUSR1", "-x", "kitty"], check=False, capture_output=True)
+
+    def reload_system(self, changed_outputs=None):
+        """Reload the services affected by changed outputs (all services if None)"""
+        reloaders = self.get_service_reloaders()
+        if changed_outputs is None:
+            services = set(reloaders)
+        else:
+            services = self.get_affected_services(changed_outputs)
 
-            # Restart Waybar
-            subprocess.run(["pkill", "waybar"], check=False, capture_output=True)
-            subprocess.Popen(["waybar"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if not services:
+            print("✨ No running services consume the changed files, skipping reload")
+            return
 
-            # Restart Dunst
-            subprocess.run(["pkill", "dunst"], check=False, capture_output=True)
-            subprocess.Popen(["dunst"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print(f"🔄 Reloading {', '.join(name for name in reloaders if name in services)}...")
+
+        try:
+            for name, reload_service in reloaders.items():
+                if name in services:
+                    with self.timings.stage("reload", "reload", name):
+                        reload_service()
 
             print("✅ System reloaded successfully!")
 
         except Exception as e:
             print(f"⚠️ Error reloading system: {e}")
 
+# Per-process state of batch workers
+BATCH_STATE = {}
+
+def init_batch_worker(template_cache):
+    """Give every batch worker the parent's precompiled templates"""
+    BATCH_STATE['template_cache'] = template_cache
+
+def render_theme_bundle(theme_path, output_dir):
+    """Render one theme's complete output set into output_dir (runs in a worker)"""
+    try:
+        with open(theme_path) as f:
+            theme_config = json.load(f)
+
+        generator = ThemeGenerator(theme_config=theme_config, output_dir=output_dir)
+        generator.template_cache = BATCH_STATE.get('template_cache', generator.template_cache)
+
+        with redirect_stdout(io.StringIO()):
+            ok = generator.generate_outputs()
+        return {
+            'theme': str(theme_path),
+            'output_dir': str(output_dir),
+            'ok': ok,
+            'rebuilt': len(generator.rebuilt_targets),
+            'skipped': len(generator.skipped_targets),
+        }
+    except (OSError, ValueError, KeyError) as e:
+        return {'theme': str(theme_path), 'output_dir': str(output_dir), 'ok': False, 'error': str(e)}
+
+def compile_templates():
+    """Template cache with every template compiled, for forked workers to inherit"""
+    template_cache = TemplateCache(Path.home() / ".config" / "hypr-system" / ".cache" / "templates.json")
+    template_dir = Path.home() / ".config" / "hypr-system" / "templates"
+    for template_path in template_dir.glob("*.template"):
+        template_cache.get(template_path)
+    template_cache.save()
+    return template_cache
+
+def render_batch(theme_paths, output_root, workers=None):
+    """Render several themes into output_root/<theme>/ without touching the live config
+
+    Templates are compiled once here and inherited by the forked workers.
+    """
+    output_root = Path(output_root)
+    template_cache = compile_templates()
+
+    print(f"📦 Rendering {len(theme_paths)} theme(s) into {output_root}...")
+    jobs = [(Path(path), output_root / Path(path).stem) for path in theme_paths]
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             mp_context=multiprocessing.get_context('fork'),
+                             initializer=init_batch_worker,
+                             initargs=(template_cache,)) as pool:
+        results = list(pool.map(render_theme_bundle, *zip(*jobs))) if jobs else []
+
+    failures = 0
+    for result in results:
+        if result['ok']:
+            print(f"✅ {result['theme']} → {result['output_dir']} "
+                  f"({result['rebuilt']} rebuilt, {result['skipped']} unchanged)")
+        else:
+            failures += 1
+            print(f"❌ {result['theme']}: {result.get('error', 'some outputs failed')}")
+
+    print(f"📦 Rendered {len(results) - failures}/{len(results)} theme(s)")
+    return failures == 0
+
+def init_fleet_worker(template_cache, jobs, contexts, output_root):
+    """Give every fleet worker the parent's templates, hosts and shared template namespaces"""
+    BATCH_STATE.update(template_cache=template_cache, jobs=jobs, contexts=contexts, output_root=output_root)
+
+def render_host_bundle(index):
+    """Render one fleet host's complete output tree (runs in a worker)"""
+    host, context_key = BATCH_STATE['jobs'][index]
+    output_dir = BATCH_STATE['output_root'] / host.name
+    try:
+        generator = ThemeGenerator(theme_config=host.theme_config, output_dir=output_dir,
+                                   keybind_config=host.keybind_config, monitors=host.monitors,
+                                   install_dir=host.install_dir)
+        generator.template_cache = BATCH_STATE['template_cache']
+        generator.template_context, generator.color_engine = BATCH_STATE['contexts'][context_key]
+
+        with redirect_stdout(io.StringIO()):
+            ok = generator.generate_outputs()
+        return {
+            'host': host.name,
+            'output_dir': str(output_dir),
+            'ok': ok,
+            'rebuilt': len(generator.rebuilt_targets),
+            'skipped': len(generator.skipped_targets),
+        }
+    except Exception as e:
+        # One broken host is reported against its name and never stops the others
+        return {'host': host.name, 'output_dir': str(output_dir), 'ok': False, 'error': describe_error(e)}
+
+def describe_error(error):
+    """Readable one-line reason for a failed host; bare KeyError/TypeError text names no field"""
+    if isinstance(error, (ValueError, OSError)):
+        return str(error)
+    return f"{error.__class__.__name__}: {error}"
+
+def render_fleet(inventory_path, output_root, workers=None):
+    """Render every inventory host into output_root/<host>/ in one run
+
+    Hosts sharing a theme and home share one template namespace, built and
+    linted here once; hosts sharing colors share one resolved palette.
+    Forked workers inherit both along with the compiled templates.
+    """
+    output_root = Path(output_root)
+    inventory = FleetInventory(inventory_path, Path.home() / ".config" / "hypr-system")
+    hosts = inventory.load()
+    template_cache = compile_templates()
+    total = len(hosts) + len(inventory.failed)
+
+    for name, errors in inventory.failed.items():
+        print(f"❌ {name}: invalid host, skipped:\n  " + "\n  ".join(errors))
+
+    print(f"🛰️ Preparing {len(hosts)} host(s)...")
+    contexts = {}
+    palettes = {}
+    failed = {}
+    jobs = []
+    for host in hosts:
+        context_key = host.get_context_key()
+        if context_key not in contexts and context_key not in failed:
+            generator = ThemeGenerator(theme_config=host.theme_config, output_dir=output_root / host.name,
+                                       install_dir=host.install_dir)
+            generator.template_cache = template_cache
+            colors = host.theme_config.get('colors')
+            palette_key = content_hash(json.dumps([colors, host.theme_config.get('color_shades')], sort_keys=True))
+            generator.color_engine = palettes.get(palette_key)
+            try:
+                generator.check_templates()
+                contexts[context_key] = (generator.get_template_context(), generator.get_color_engine())
+                palettes[palette_key] = generator.color_engine
+            except Exception as e:
+                failed[context_key] = describe_error(e)
+        if context_key in failed:
+            print(f"❌ {host.name}: {failed[context_key]}")
+        else:
+            jobs.append((host, context_key))
+
+    print(f"🛰️ Rendering {len(jobs)} host(s) from {len(contexts)} shared theme context(s) into {output_root}...")
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('fork'),
+                             initializer=init_fleet_worker,
+                             initargs=(template_cache, jobs, contexts, output_root)) as pool:
+        results = list(pool.map(render_host_bundle, range(len(jobs)),
+                                chunksize=max(1, len(jobs) // (workers * 4)))) if jobs else []
+
+    failures = total - len(jobs)
+    for result in results:
+        if result['ok']:
+            print(f"✅ {result['host']} → {result['output_dir']} "
+                  f"({result['rebuilt']} rebuilt, {result['skipped']} unchanged)")
+        else:
+            failures += 1
+            print(f"❌ {result['host']}: {result.get('error', 'some outputs failed')}")
+
+    print(f"🛰️ Rendered {total - failures}/{total} host(s)")
+    return failures == 0
+
 def main():
     """Main function"""
-    generator = ThemeGenerator()
-
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--help":
-            print("""
-🎨 Master Theme Generator
-
-Usage:
-  python apply-theme.py                      Generate all configurations
-  python apply-theme.py --switch-workspace-mode    Switch workspace mode
-  python apply-theme.py --help              Show this help
-""")
-            return
-        elif sys.argv[1] == "--switch-workspace-mode":
-            generator.switch_workspace_mode()
-            return
+    parser = argparse.ArgumentParser(description='🎨 Master Theme Generator')
+    parser.add_argument('--switch-workspace-mode', action='store_true',
+                       help='Switch between virtual desktops and per-monitor workspaces')
+    parser.add_argument('--force', action='store_true',
+                       help='Regenerate everything, ignoring the manifest')
+    parser.add_argument('--workers', type=int, metavar='N',
+                       help='Render outputs (or validate --import-themes files) concurrently with N workers '
+                            '(default: 1, or one per CPU for --batch and --fleet)')
+    parser.add_argument('--batch', nargs='+', type=Path, metavar='THEME',
+                       help='Render each theme JSON into its own directory, no live changes or reload')
+    parser.add_argument('--batch-output', type=Path, metavar='DIR',
+                       default=Path.home() / ".config" / "hypr-system" / "builds",
+                       help='Root directory for --batch outputs (default: hypr-system/builds)')
+    parser.add_argument('--fleet', type=Path, metavar='INVENTORY',
+                       help='Render every host of a fleet inventory JSON into its own directory, no live changes')
+    parser.add_argument('--fleet-output', type=Path, metavar='DIR',
+                       default=Path.home() / ".config" / "hypr-system" / "builds" / "fleet",
+                       help='Root directory for --fleet outputs (default: hypr-system/builds/fleet)')
+    parser.add_argument('--import-themes', nargs='+', type=Path, metavar='PATH',
+                       help='Validate theme JSON files (or directories of them) and register them in themes/')
+    parser.add_argument('--validate-only', action='store_true',
+                       help='With --import-themes, only report problems, register nothing')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Render everything in memory and list the files an apply would change; '
+                            'writes and reloads nothing')
+    parser.add_argument('--diff', action='store_true',
+                       help='With --dry-run (implied), also print unified diffs against the current files')
+    parser.add_argument('--stage', type=Path, metavar='DIR',
+                       help='Write changed outputs under DIR (mirroring their paths below $HOME) instead '
+                            'of in place, without reloading')
+    parser.add_argument('--check', action='store_true',
+                       help='Only lint the templates against the template variables, write nothing')
+    parser.add_argument('--refresh-monitors', action='store_true',
+                       help='Re-read the monitor layout from Hyprland instead of the cached topology')
+    parser.add_argument('--palette-from', type=Path, metavar='IMAGE',
+                       help='Derive the primary/accent/neutral/text colors from a wallpaper before generating')
+    parser.add_argument('--rollback', action='store_true',
+                       help='Restore the files changed by the last apply and reload what they feed')
+    parser.add_argument('--list-snapshots', action='store_true',
+                       help='List the pre-apply snapshots available to --rollback')
+    parser.add_argument('--timings', action='store_true',
+                       help='Print wall and CPU time per stage and template')
+    parser.add_argument('--trace', type=Path, metavar='PATH',
+                       help='Write a Chrome/Perfetto trace JSON of all stages to PATH')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Stay resident, watch core/ and templates/ and serve scripts/apply-theme.sh')
+
+    args = parser.parse_args()
+
+    if args.batch:
+        if not render_batch(args.batch, args.batch_output, args.workers):
+            sys.exit(1)
+        return
+
+    if args.fleet:
+        try:
+            if not render_fleet(args.fleet, args.fleet_output, args.workers):
+                sys.exit(1)
+        except InventoryError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+
+    if args.import_themes:
+        importer = ThemeImporter(Path.home() / ".config" / "hypr-system" / "themes", args.workers)
+        results = importer.import_files(args.import_themes, args.validate_only)
+        if not results or not all(result['ok'] for result in results):
+            sys.exit(1)
+        return
+
+    timings = StageTimings() if args.timings or args.trace else None
+    generator = ThemeGenerator(timings)
+    generator.force_rebuild = args.force
+    generator.workers = max(1, args.workers or 1)
+
+    if args.daemon:
+        from theme_daemon import ThemeDaemon
+        try:
+            ThemeDaemon(generator).serve_forever()
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+
+    if args.list_snapshots:
+        for manifest in generator.snapshot_store.list_snapshots('apply'):
+            print(manifest['id'])
+        return
+
+    if args.rollback:
+        try:
+            if generator.rollback() is None:
+                sys.exit(1)
+        except (SnapshotError, OSError) as e:
+            print(f"❌ Rollback failed: {e}")
+            sys.exit(1)
+        return
+
+    if args.dry_run or args.diff:
+        generator.output_backend = MemoryBackend()
+    elif args.stage:
+        generator.output_backend = StagingBackend(args.stage, Path.home())
+
+    if args.refresh_monitors:
+        monitors = generator.monitor_topology.refresh()
+        print(f"🖥️ Monitor topology refreshed: {', '.join(m['name'] for m in monitors) or 'no monitors'}")
+
+    if args.palette_from:
+        try:
+            generator.apply_wallpaper_palette(args.palette_from)
+        except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ Palette extraction failed: {e}")
+            sys.exit(1)
 
-    generator.generate_all()
+    try:
+        if args.check:
+            generator.config.validate()
+            for warning in generator.check_templates():
+                print(f"⚠️ {format_issue(*warning)}")
+            print("✅ All templates passed the check")
+        elif isinstance(generator.output_backend, MemoryBackend):
+            generator.dry_run(generator.switch_workspace_mode if args.switch_workspace_mode
+                              else generator.generate_all, args.diff)
+        elif args.switch_workspace_mode:
+            generator.switch_workspace_mode()
+        else:
+            generator.generate_all()
+    except (ConfigError, ColorResolutionError, TemplateLintError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if isinstance(generator.output_backend, StagingBackend):
+        print(f"📦 Staged {len(generator.output_backend.written)} file(s) under {args.stage}")
+
+    if args.timings:
+        generator.timings.print_summary()
+    if args.trace:
+        generator.timings.write_trace(args.trace)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+🎨 Color Resolution Engine
+Resolves chained color references in one pass and caches every derived color form
+"""
+
+import colorsys
+import re
+
+# Alpha variants emitted for every color as <name>_alpha_<pct>
+ALPHA_STEPS = (10, 25, 50, 75, 90)
+
+# Default derived shades (<name>_lighten_<pct>), overridable with theme_config['color_shades']
+DEFAULT_SHADES = {'lighten': [10, 20], 'darken': [10, 20]}
+
+RGBA_PATTERN = re.compile(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*([\d.]+)\s*)?\)')
+
+class ColorResolutionError(ValueError):
+    """Raised with every unresolvable or cyclic color reference at once"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("Invalid color configuration:\n  " + "\n  ".join(errors))
+
+# Shade operations color_shades may request
+SHADE_OPERATIONS = ('lighten', 'darken')
+
+def is_literal(value):
+    return isinstance(value, str) and (value.startswith('#') or value.startswith('rgb'))
+
+def parse_color(value):
+    """Parse #RRGGBB, #RRGGBBAA, #RGB or rgb()/rgba() into (r, g, b, alpha)"""
+    if value.startswith('#'):
+        h = value[1:].lower()
+        if len(h) == 3:
+            h = ''.join(c * 2 for c in h)
+        if len(h) not in (6, 8):
+            raise ValueError(f"Invalid hex length: {value!r}")
+        try:
+            r, g, b = int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+            alpha = int(h[6:8], 16) / 255 if len(h) == 8 else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid hex digits in: {value!r}")
+        return r, g, b, alpha
+
+    match = RGBA_PATTERN.fullmatch(value.strip())
+    if not match:
+        raise ValueError(f"Invalid color: {value!r}")
+    r, g, b = (min(255, int(match.group(i))) for i in (1, 2, 3))
+    alpha = float(match.group(4)) if match.group(4) is not None else 1.0
+    return r, g, b, alpha
+
+def to_hex(r, g, b):
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def format_alpha(alpha):
+    return f"{alpha:.2f}".rstrip('0').rstrip('.') if alpha not in (0.0, 1.0) else f"{alpha:.1f}"
+
+class ColorEngine:
+    """Reference graph over theme_config['colors'], resolved in topological order"""
+
+    def __init__(self, colors, shades=None):
+        self.resolved = {}
+        self.forms_cache = {}
+        self.errors = []
+        self.colors = self.check_colors(colors)
+        self.shades = DEFAULT_SHADES if shades is None else self.check_shades(shades)
+        self.resolve_all()
+
+    def check_colors(self, colors):
+        """Color groups with only string values; everything else is reported and left out"""
+        if not isinstance(colors, dict):
+            self.errors.append(f"colors: expected an object, got {type(colors).__name__}")
+            return {}
+        checked = {}
+        for category, group in colors.items():
+            if not isinstance(group, dict):
+                self.errors.append(f"{category}: expected an object of colors, got {type(group).__name__}")
+                continue
+            checked[category] = {}
+            for name, value in group.items():
+                if isinstance(value, str):
+                    checked[category][name] = value
+                else:
+                    self.errors.append(f"{category}.{name}: expected a color string, got {type(value).__name__}")
+        return checked
+
+    def check_shades(self, shades):
+        """Valid {operation: [step, ...]} entries of color_shades; everything else is reported"""
+        if not isinstance(shades, dict):
+            self.errors.append(f"color_shades: expected an object, got {type(shades).__name__}")
+            return {}
+        checked = {}
+        for operation, steps in shades.items():
+            path = f"color_shades.{operation}"
+            if operation not in SHADE_OPERATIONS:
+                self.errors.append(f"{path}: unknown operation, expected one of {', '.join(SHADE_OPERATIONS)}")
+            elif not isinstance(steps, list):
+                self.errors.append(f"{path}: expected a list of percentages, got {type(steps).__name__}")
+            else:
+                for index, step in enumerate(steps):
+                    if isinstance(step, bool) or not isinstance(step, (int, float)):
+                        self.errors.append(f"{path}[{index}]: expected a number, got {step!r}")
+                checked[operation] = [step for step in steps
+                                      if isinstance(step, (int, float)) and not isinstance(step, bool)]
+        return checked
+
+    def resolve_all(self):
+        """Resolve every color once; chained references follow their targets"""
+        state = {}
+
+        for category, group in self.colors.items():
+            for name in group:
+                if (category, name) in state:
+                    continue
+
+                # Iterative DFS so long chains never hit the recursion limit
+                stack = [(category, name)]
+                while stack:
+                    node = stack[-1]
+                    if state.get(node) == 'done':
+                        stack.pop()
+                        continue
+
+                    value = self.colors[node[0]][node[1]]
+                    target = self.get_reference(value)
+
+                    if target is None:
+                        self.resolved[node] = value
+                        if not is_literal(value):
+                            self.errors.append(f"{node[0]}.{node[1]}: unknown color reference {value!r}")
+                        state[node] = 'done'
+                        stack.pop()
+                    elif state.get(target) == 'done':
+                        self.resolved[node] = self.resolved[target]
+                        state[node] = 'done'
+                        stack.pop()
+                    elif state.get(target) == 'visiting':
+                        cycle = [f"{c}.{n}" for c, n in stack[stack.index(target):]] + [f"{target[0]}.{target[1]}"]
+                        self.errors.append(f"{node[0]}.{node[1]}: reference cycle {' → '.join(cycle)}")
+                        for member in stack[stack.index(target):]:
+                            self.resolved[member] = self.colors[member[0]][member[1]]
+                            state[member] = 'done'
+                        stack = stack[:stack.index(target)]
+                    else:
+                        state[node] = 'visiting'
+                        stack.append(target)
+
+    def get_reference(self, value):
+        """Return the (category, name) a value points at, or None for literals/unknowns"""
+        if not isinstance(value, str) or is_literal(value):
+            return None
+        parts = value.split('.')
+        if len(parts) == 2 and parts[0] in self.colors and parts[1] in self.colors[parts[0]]:
+            return parts[0], parts[1]
+        return None
+
+    def resolve(self, color_ref):
+        """Resolve a literal or 'category.name' reference to its final value"""
+        if is_literal(color_ref):
+            return color_ref
+        target = self.get_reference(color_ref)
+        return self.resolved[target] if target else color_ref
+
+    def get_forms(self, value):
+        """All derived forms of one literal color, computed once per distinct value"""
+        forms = self.forms_cache.get(value)
+        if forms is not None:
+            return forms
+
+        r, g, b, alpha = parse_color(value)
+        h, l, s = colorsys.rgb_to_hls(r / 255, g / 255, b / 255)
+
+        forms = {
+            '': value,
+            '_no_hash': value[1:] if value.startswith('#') else to_hex(r, g, b)[1:],
+            '_rgba': f"rgba({r},{g},{b},{format_alpha(alpha) if not value.startswith('#') else '1.0'})",
+            '_hsl': f"hsl({round(h * 360)}, {round(s * 100)}%, {round(l * 100)}%)",
+        }
+        for step in ALPHA_STEPS:
+            forms[f"_alpha_{step}"] = f"rgba({r},{g},{b},{format_alpha(step / 100)})"
+
+        for operation, steps in self.shades.items():
+            sign = 1 if operation == 'lighten' else -1
+            for step in steps:
+                shade_l = min(1.0, max(0.0, l + sign * step / 100))
+                sr, sg, sb = (round(c * 255) for c in colorsys.hls_to_rgb(h, shade_l, s))
+                forms[f"_{operation}_{step}"] = to_hex(sr, sg, sb)
+
+        self.forms_cache[value] = forms
+        return forms
+
+    def get_suffixes(self):
+        """Variable suffixes added to every color name (_rgba, _alpha_50, _lighten_10, ...)"""
+        return [suffix for suffix in self.get_forms('#000000') if suffix]
+
+    def get_resolved_colors(self):
+        """Nested {category: {name + suffix: value}} with every derived form"""
+        if self.errors:
+            raise ColorResolutionError(self.errors)
+
+        colors = {}
+        errors = []
+        for category, group in self.colors.items():
+            entries = colors[category] = {}
+            for name in group:
+                try:
+                    forms = self.get_forms(self.resolved[(category, name)])
+                except ValueError as e:
+                    errors.append(f"{category}.{name}: {e}")
+                    continue
+                for suffix, form in forms.items():
+                    entries[name + suffix] = form
+        if errors:
+            raise ColorResolutionError(errors)
+        return colors
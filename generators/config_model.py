@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+🧩 Theme Config Model
+Typed, slotted views of theme-config.json sections, parsed lazily and validated all at once
+"""
+
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
+
+WORKSPACE_MODES = ('virtual_desktops', 'per_monitor')
+
+class ConfigError(ValueError):
+    """Raised with every schema problem of the requested sections at once"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("Invalid theme-config.json:\n  " + "\n  ".join(errors))
+
+@dataclass(frozen=True, slots=True)
+class Typography:
+    font_secondary: str
+    size_small: int
+    size_normal: int
+    size_large: int
+    size_title: int
+    icon_small: int
+    icon_medium: int
+    icon_large: int
+    font_primary: str = 'JetBrains Mono Nerd Font'
+
+@dataclass(frozen=True, slots=True)
+class Margins:
+    small: int
+    medium: int
+    large: int
+    xlarge: int
+
+@dataclass(frozen=True, slots=True)
+class Spacing:
+    gaps_inner: int
+    gaps_outer: int
+    border_width: int
+    rounding: int
+    margins: Margins
+
+@dataclass(frozen=True, slots=True)
+class Blur:
+    enabled: bool
+    size: int
+    passes: int
+    vibrancy: float
+
+@dataclass(frozen=True, slots=True)
+class Shadow:
+    enabled: bool
+    range: int
+    render_power: int
+
+@dataclass(frozen=True, slots=True)
+class Curves:
+    primary: str
+    secondary: str
+    tertiary: str
+    quaternary: str
+
+@dataclass(frozen=True, slots=True)
+class Animations:
+    enabled: bool
+    curves: Curves
+
+@dataclass(frozen=True, slots=True)
+class Effects:
+    blur: Blur
+    shadow: Shadow
+    animations: Animations
+
+@dataclass(frozen=True, slots=True)
+class Waybar:
+    height: int
+    margin_top: int
+    margin_sides: int
+
+@dataclass(frozen=True, slots=True)
+class Rofi:
+    width: int
+    lines: int
+
+@dataclass(frozen=True, slots=True)
+class Components:
+    waybar: Waybar
+    rofi: Rofi
+
+@dataclass(frozen=True, slots=True)
+class Workspaces:
+    mode: str = field(default='virtual_desktops', metadata={'choices': WORKSPACE_MODES})
+    virtual_desktops: dict = field(default_factory=dict)
+    per_monitor: dict = field(default_factory=dict)
+
+SECTION_TYPES = {
+    'typography': Typography,
+    'spacing': Spacing,
+    'effects': Effects,
+    'components': Components,
+    'workspaces': Workspaces,
+}
+
+def type_name(value):
+    return 'null' if value is None else type(value).__name__
+
+def matches_type(value, expected):
+    """JSON-aware isinstance: bools are not numbers, ints are valid floats"""
+    if expected is bool:
+        return isinstance(value, bool)
+    if isinstance(value, bool):
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+def coerce_value(value, expected):
+    """Typed value of a numeric or boolean string, as scripts/theme-editor.sh stores every edit
+
+    Anything else is returned unchanged for matches_type to judge.
+    """
+    if not isinstance(value, str) or expected not in (int, float, bool):
+        return value
+    text = value.strip()
+    if expected is bool:
+        return {'true': True, 'false': False}.get(text.lower(), value)
+    try:
+        return expected(text)
+    except ValueError:
+        return value
+
+def parse_section(cls, data, path, errors):
+    """Build cls from a JSON object, appending every schema problem to errors"""
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        errors.append(f"{path}: expected an object, got {type_name(data)}")
+        return None
+
+    error_count = len(errors)
+    values = {}
+    for spec in fields(cls):
+        key_path = f"{path}.{spec.name}"
+        if spec.name not in data:
+            if spec.default is MISSING and spec.default_factory is MISSING:
+                errors.append(f"{key_path}: missing")
+            continue
+
+        value = coerce_value(data[spec.name], spec.type)
+        if is_dataclass(spec.type):
+            value = parse_section(spec.type, value, key_path, errors)
+        elif not matches_type(value, spec.type):
+            errors.append(f"{key_path}: expected {spec.type.__name__}, got {type_name(value)}")
+        elif 'choices' in spec.metadata and value not in spec.metadata['choices']:
+            errors.append(f"{key_path}: {value!r} is not one of {', '.join(spec.metadata['choices'])}")
+        values[spec.name] = value
+
+    if len(errors) > error_count:
+        return None
+    return cls(**values)
+
+class ThemeConfig:
+    """Typed access to theme-config.json; each section is parsed on first use"""
+
+    __slots__ = ('raw', 'sections')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.sections = {}
+
+    def require(self, *names):
+        """Parse the named sections, reporting the problems of all of them together"""
+        errors = []
+        for name in names:
+            if name in self.sections:
+                continue
+            section = parse_section(SECTION_TYPES[name], self.raw.get(name), name, errors)
+            if section is not None:
+                self.sections[name] = section
+        if errors:
+            raise ConfigError(errors)
+
+    def section(self, name):
+        if name not in self.sections:
+            self.require(name)
+        return self.sections[name]
+
+    def validate(self):
+        """Parse every section, e.g. before writing theme-config.json"""
+        self.require(*SECTION_TYPES)
+
+    def invalidate(self, name=None):
+        """Forget parsed sections after the raw config was modified"""
+        if name is None:
+            self.sections.clear()
+        else:
+            self.sections.pop(name, None)
+
+    typography = property(lambda self: self.section('typography'))
+    spacing = property(lambda self: self.section('spacing'))
+    effects = property(lambda self: self.section('effects'))
+    components = property(lambda self: self.section('components'))
+    workspaces = property(lambda self: self.section('workspaces'))
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+🛰️ Fleet Inventory
+Hosts rendered by one fleet build, each with its theme, keybind overrides and monitor layout
+"""
+
+import json
+import re
+from pathlib import Path
+
+from config_model import SECTION_TYPES, parse_section, type_name
+from template_cache import content_hash
+
+# Host names become output directory names
+HOST_NAME = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]*')
+
+# Monitor fields and their types; name, width and height are required
+MONITOR_FIELDS = {'name': str, 'width': int, 'height': int, 'refresh': (int, float),
+                  'x': int, 'y': int, 'scale': (int, float), 'transform': int, 'id': int}
+REQUIRED_MONITOR_FIELDS = ('name', 'width', 'height')
+
+class InventoryError(ValueError):
+    """Raised with every problem of a fleet inventory at once"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("Invalid fleet inventory:\n  " + "\n  ".join(errors))
+
+def deep_merge(base, overrides):
+    """Copy of base with overrides applied; nested objects merge, everything else replaces"""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def parse_monitors(monitors, path, errors):
+    """Validated monitor list in the shape MonitorTopology caches
+
+    ids default to list order; monitors without x/y are placed left to right.
+    """
+    if not isinstance(monitors, list):
+        errors.append(f"{path}: expected a list, got {type(monitors).__name__}")
+        return None
+
+    parsed = []
+    error_count = len(errors)
+    for index, monitor in enumerate(monitors):
+        monitor_path = f"{path}[{index}]"
+        if not isinstance(monitor, dict):
+            errors.append(f"{monitor_path}: expected an object")
+            continue
+        for key in REQUIRED_MONITOR_FIELDS:
+            if key not in monitor:
+                errors.append(f"{monitor_path}.{key}: missing")
+        for key, value in monitor.items():
+            expected = MONITOR_FIELDS.get(key)
+            if expected is None:
+                errors.append(f"{monitor_path}.{key}: unknown monitor field")
+            elif isinstance(value, bool) or not isinstance(value, expected):
+                errors.append(f"{monitor_path}.{key}: expected {getattr(expected, '__name__', 'number')}, "
+                              f"got {type(value).__name__}")
+        parsed.append({'id': index, 'scale': 1, 'transform': 0, **monitor})
+
+    if len(errors) > error_count:
+        return parsed
+    # Monitors without a position go to the right of everything placed before them, never on top of it
+    right_edge = 0
+    for monitor in parsed:
+        monitor.setdefault('x', right_edge)
+        monitor.setdefault('y', 0)
+        right_edge = max(right_edge, monitor['x'] + get_logical_width(monitor))
+    return parsed
+
+def get_logical_width(monitor):
+    """Width a monitor takes in the layout, after rotation and scaling"""
+    width = monitor['height'] if monitor['transform'] % 2 else monitor['width']
+    return round(width / monitor['scale']) if monitor['scale'] > 0 else width
+
+def check_theme(theme, path, errors):
+    """Shape problems of a merged host theme, named by field, before anything renders it"""
+    colors = theme.get('colors')
+    if not isinstance(colors, dict):
+        errors.append(f"{path}.colors: expected an object, got {type_name(colors)}")
+    else:
+        for category, group in colors.items():
+            if not isinstance(group, dict):
+                errors.append(f"{path}.colors.{category}: expected an object, got {type_name(group)}")
+                continue
+            for name, value in group.items():
+                if not isinstance(value, str):
+                    errors.append(f"{path}.colors.{category}.{name}: expected a color string, got {type_name(value)}")
+    for name, section_type in SECTION_TYPES.items():
+        parse_section(section_type, theme.get(name), f"{path}.{name}", errors)
+
+def check_keybinds(keybinds, path, errors):
+    """Shape problems of a merged host keybind config, named by field"""
+    categories = keybinds.get('categories')
+    if not isinstance(categories, dict):
+        errors.append(f"{path}.categories: expected an object, got {type_name(categories)}")
+        return
+    for category_id, category in categories.items():
+        category_path = f"{path}.categories.{category_id}"
+        if not isinstance(category, dict):
+            errors.append(f"{category_path}: expected an object, got {type_name(category)}")
+            continue
+        if not isinstance(category.get('name'), str):
+            errors.append(f"{category_path}.name: expected str, got {type_name(category.get('name'))}")
+        bindings = category.get('bindings')
+        if not isinstance(bindings, dict):
+            errors.append(f"{category_path}.bindings: expected an object, got {type_name(bindings)}")
+            continue
+        for combo, binding in bindings.items():
+            binding_path = f"{category_path}.bindings[{combo!r}]"
+            if not isinstance(binding, dict):
+                errors.append(f"{binding_path}: expected an object, got {type_name(binding)}")
+                continue
+            for key in ('command', 'type'):
+                if (key in binding or key == 'command') and not isinstance(binding.get(key), str):
+                    errors.append(f"{binding_path}.{key}: expected str, got {type_name(binding.get(key))}")
+
+class FleetHost:
+    """One seat of the fleet: fully merged configs plus where its files will live"""
+
+    __slots__ = ('name', 'theme_config', 'keybind_config', 'monitors', 'install_dir')
+
+    def __init__(self, name, theme_config, keybind_config, monitors, install_dir):
+        self.name = name
+        self.theme_config = theme_config
+        self.keybind_config = keybind_config
+        self.monitors = monitors
+        self.install_dir = install_dir
+
+    def get_context_key(self):
+        """Hosts with equal keys share one template namespace and resolved palette"""
+        return content_hash(json.dumps([self.theme_config, str(self.install_dir)], sort_keys=True))
+
+class FleetInventory:
+    """Inventory JSON: {"defaults": {...}, "hosts": {"name": {...}}}
+
+    Each host (over the defaults) may set:
+      theme              theme JSON path, relative to the inventory (default: core/theme-config.json)
+      keybinds           keybind JSON path (default: core/keybind-config.json)
+      theme_overrides    merged into the theme
+      keybind_overrides  merged into the keybinds
+      monitors           [{name, width, height, refresh, x, y, scale, transform}, ...]
+                         (monitors without x/y are placed left to right)
+      home               home directory on the host (default: this machine's)
+    """
+
+    def __init__(self, path, config_dir):
+        self.path = Path(path)
+        self.config_dir = Path(config_dir)
+        # Theme and keybind files parsed once, however many hosts use them
+        self.documents = {}
+        # Host name → its problems, for hosts load() had to leave out
+        self.failed = {}
+
+    def load_document(self, path, errors, host_path):
+        path = Path(path).expanduser()
+        if not path.is_absolute():
+            path = self.path.parent / path
+        if path not in self.documents:
+            try:
+                with open(path) as f:
+                    self.documents[path] = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                self.documents[path] = e
+        document = self.documents[path]
+        if isinstance(document, Exception):
+            errors.append(f"{host_path}: cannot read {path}: {document}")
+            return None
+        if not isinstance(document, dict):
+            errors.append(f"{host_path}: {path} is not a JSON object")
+            return None
+        return document
+
+    def load(self):
+        """Every valid host of the inventory
+
+        A host with problems is left out and its problems recorded in
+        self.failed, so one bad host never stops the others. Raises
+        InventoryError only when the inventory itself is unusable.
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise InventoryError([f"{self.path}: {e}"])
+
+        if not isinstance(data, dict) or not isinstance(data.get('hosts'), dict) or not data['hosts']:
+            raise InventoryError(["hosts: expected a non-empty object of host name → settings"])
+        defaults = data.get('defaults', {})
+        if not isinstance(defaults, dict):
+            raise InventoryError(["defaults: expected an object"])
+
+        hosts = []
+        self.failed = {}
+        for name, settings in data['hosts'].items():
+            host_path = f"hosts.{name}"
+            errors = self.failed[name] = []
+            if not HOST_NAME.fullmatch(name):
+                errors.append(f"{host_path}: host names may only use letters, digits, '.', '_' and '-'")
+                continue
+            if not isinstance(settings, dict):
+                errors.append(f"{host_path}: expected an object")
+                continue
+            settings = deep_merge(defaults, settings)
+
+            theme_config = self.load_document(
+                settings.get('theme', self.config_dir / "core" / "theme-config.json"), errors, host_path)
+            keybind_config = self.load_document(
+                settings.get('keybinds', self.config_dir / "core" / "keybind-config.json"), errors, host_path)
+            for key in ('theme_overrides', 'keybind_overrides'):
+                if not isinstance(settings.get(key, {}), dict):
+                    errors.append(f"{host_path}.{key}: expected an object")
+
+            monitors = None
+            if 'monitors' in settings:
+                monitors = parse_monitors(settings['monitors'], f"{host_path}.monitors", errors)
+
+            home = settings.get('home')
+            if home is not None and not isinstance(home, str):
+                errors.append(f"{host_path}.home: expected str")
+
+            if errors:
+                continue
+            theme_config = deep_merge(theme_config, settings.get('theme_overrides', {}))
+            keybind_config = deep_merge(keybind_config, settings.get('keybind_overrides', {}))
+            check_theme(theme_config, f"{host_path}.theme", errors)
+            check_keybinds(keybind_config, f"{host_path}.keybinds", errors)
+            if errors:
+                continue
+
+            del self.failed[name]
+            hosts.append(FleetHost(name, theme_config, keybind_config, monitors,
+                                   Path(home) / ".config" if home else None))
+
+        return hosts
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+⚡ Hyprland Live Apply
+Diffs generated Hyprland configs and pushes only the changed keywords and binds in one IPC batch
+"""
+
+import re
+import socket
+
+from monitor_topology import get_hyprland_socket_path
+
+# Keywords that may repeat, told apart by their first field (bezier name, animation name, output)
+KEYED_KEYWORDS = ('bezier', 'animation', 'monitor')
+
+# Sections whose settings Hyprland scopes per device and cannot take through keyword
+UNSUPPORTED_SECTIONS = ('device',)
+
+# Seconds to wait for Hyprland to answer a request
+IPC_TIMEOUT = 2
+
+VARIABLE = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)')
+
+class HyprlandIPCError(RuntimeError):
+    """Raised when Hyprland rejects a live-apply request"""
+
+class HyprConfig:
+    """Statements of one Hyprland config file, grouped by how they can be applied live"""
+
+    def __init__(self):
+        # $name = value definitions, and the names any value refers to
+        self.variables = {}
+        self.references = set()
+        # section:key → value, for settings inside sections
+        self.settings = {}
+        # keyword → {first field → value}
+        self.keyed = {keyword: {} for keyword in KEYED_KEYWORDS}
+        # (mods, key) → [(bind type, value), ...] in file order
+        self.binds = {}
+        # Everything else (exec, env, source, rules, workspaces) is only applied by a reload
+        self.other = []
+
+def strip_comment(line):
+    """Drop a # comment, keeping ## as a literal #"""
+    index = 0
+    while True:
+        index = line.find('#', index)
+        if index < 0:
+            return line.replace('##', '#')
+        if line.startswith('##', index):
+            index += 2
+            continue
+        return line[:index].replace('##', '#')
+
+def parse_config(text):
+    """Parse Hyprland config text into a HyprConfig"""
+    config = HyprConfig()
+    sections = []
+
+    for raw_line in text.splitlines():
+        line = strip_comment(raw_line).strip()
+        if not line:
+            continue
+        if line == '}':
+            if sections:
+                sections.pop()
+            continue
+        if line.endswith('{'):
+            sections.append(line[:-1].strip())
+            continue
+        if '=' not in line:
+            config.other.append(line)
+            continue
+
+        key, value = (part.strip() for part in line.split('=', 1))
+        config.references.update(VARIABLE.findall(value))
+        if key.startswith('$'):
+            config.variables[key[1:]] = value
+        elif key in KEYED_KEYWORDS:
+            config.keyed[key][value.split(',', 1)[0].strip()] = value
+        elif not sections and key.startswith('bind'):
+            fields = [field.strip() for field in value.split(',')]
+            combo = (fields[0], fields[1] if len(fields) > 1 else '')
+            config.binds.setdefault(combo, []).append((key, value))
+        elif sections and sections[0] not in UNSUPPORTED_SECTIONS:
+            config.settings[':'.join([*sections, key])] = value
+        else:
+            config.other.append(f"{':'.join([*sections, key])} = {value}")
+
+    return config
+
+def expand_variables(value, variables):
+    """Substitute $name config variables, leaving unknown names (e.g. shell $HOME) alone"""
+    return VARIABLE.sub(lambda match: variables.get(match.group(1), match.group(0)), value)
+
+def get_bound_combos(config, variables):
+    """(mods, key) combos a config binds, with $variables expanded"""
+    return {tuple(expand_variables(part, variables) for part in combo) for combo in config.binds}
+
+def get_changed_variables(old, new):
+    """Names of $variables defined, removed or redefined between two configs"""
+    return {name for name in old.variables.keys() | new.variables.keys()
+            if old.variables.get(name) != new.variables.get(name)}
+
+def diff_commands(old, new, variables=None, shared_combos=()):
+    """hyprctl commands turning old into new, or None when only a reload can
+
+    Removed settings cannot be unset, so they fall back to a reload like any
+    change to exec, env, rules or workspace lines. Changed $variables are
+    the caller's concern, as their users may live in other files.
+    shared_combos are the expanded combos other config files bind: unbind
+    would drop their binds too, so changing one of those needs a reload.
+    """
+    variables = variables or new.variables
+    if old.other != new.other:
+        return None
+    if set(old.settings) - set(new.settings):
+        return None
+
+    commands = []
+    for key, value in new.settings.items():
+        if old.settings.get(key) != value:
+            commands.append(f"keyword {key} {expand_variables(value, variables)}")
+
+    for keyword in KEYED_KEYWORDS:
+        if set(old.keyed[keyword]) - set(new.keyed[keyword]):
+            return None
+        for name, value in new.keyed[keyword].items():
+            if old.keyed[keyword].get(name) != value:
+                commands.append(f"keyword {keyword} {expand_variables(value, variables)}")
+
+    # unbind drops every bind of a combo, so a changed combo is unbound and rebuilt in order
+    for combo in old.binds.keys() | new.binds.keys():
+        if old.binds.get(combo) == new.binds.get(combo):
+            continue
+        mods, key = (expand_variables(part, variables) for part in combo)
+        if (mods, key) in shared_combos:
+            return None
+        if combo in old.binds:
+            commands.append(f"keyword unbind {mods}, {key}")
+        for bind_type, value in new.binds.get(combo, []):
+            commands.append(f"keyword {bind_type} {expand_variables(value, variables)}")
+
+    return commands
+
+def request(socket_path, payload):
+    """Send one request to Hyprland's command socket and return its reply"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(IPC_TIMEOUT)
+        sock.connect(str(socket_path))
+        sock.sendall(payload.encode())
+        chunks = []
+        while chunk := sock.recv(65536):
+            chunks.append(chunk)
+    return b''.join(chunks).decode(errors='replace')
+
+def send_commands(commands, socket_path=None):
+    """Run commands in a single [[BATCH]] request; commands containing ; are sent on their own
+
+    Raises HyprlandIPCError when Hyprland is unreachable or rejects a command.
+    """
+    socket_path = socket_path or get_hyprland_socket_path(".socket.sock")
+    if socket_path is None:
+        raise HyprlandIPCError("Hyprland socket not found")
+
+    # Batches are split on ;, so an exec bind with a shell sequence cannot ride along
+    batch = [command for command in commands if ';' not in command]
+    requests = [f"[[BATCH]]{';'.join(batch)}"] if batch else []
+    requests += [command for command in commands if ';' in command]
+
+    for payload in requests:
+        try:
+            reply = request(socket_path, payload)
+        except OSError as e:
+            raise HyprlandIPCError(f"Hyprland socket: {e}")
+        problems = [part.strip() for part in reply.split('\n\n') if part.strip() not in ('', 'ok')]
+        if problems:
+            raise HyprlandIPCError("; ".join(problems))
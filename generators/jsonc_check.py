@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+🧾 JSONC Check
+Parses rendered JSON-with-comments configs (waybar) so a broken render is caught before it is written
+"""
+
+import json
+
+def strip_comments(text):
+    """text with // and /* */ comments blanked out; comment markers inside strings are kept"""
+    result = []
+    i = 0
+    in_string = False
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            result.append(char)
+            if char == '\\':
+                result.append(text[i + 1:i + 2])
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            result.append(char)
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = len(text) if end == -1 else end
+            continue
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            # Keep line numbers of later errors right
+            comment = text[i:] if end == -1 else text[i:end + 2]
+            result.append('\n' * comment.count('\n'))
+            i += len(comment)
+            continue
+        else:
+            result.append(char)
+        i += 1
+    return ''.join(result)
+
+def check_jsonc(text):
+    """Raise ValueError naming the line when text is not valid JSONC
+
+    Raw newlines inside strings are allowed, as waybar's parser accepts them.
+    """
+    try:
+        json.loads(strip_comments(text), strict=False)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON at line {e.lineno}, column {e.colno}: {e.msg}") from None
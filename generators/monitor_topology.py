@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+🖥️ Monitor Topology
+Caches the connected monitor layout between runs and plans workspaces across any number of monitors
+"""
+
+import json
+import os
+import socket
+import subprocess
+from pathlib import Path
+
+# Bump when the cached layout changes so stale caches are ignored
+CACHE_VERSION = 1
+
+# Hyprland event socket lines that change the monitor layout
+HOTPLUG_EVENTS = ('monitoradded', 'monitoraddedv2', 'monitorremoved', 'monitorremovedv2')
+
+# Defaults reproduce the original two-monitor split: 1-5 on the first, 6-10 on the second
+DEFAULT_LAYOUT = {
+    'policy': 'contiguous',
+    'workspaces_per_monitor': 5,
+    'order': 'id',
+    'assignments': {},
+}
+
+def get_hyprland_socket_path(name):
+    """One of this session's Hyprland sockets, or None outside Hyprland
+
+    .socket.sock takes hyprctl requests, .socket2.sock streams events.
+    """
+    signature = os.environ.get('HYPRLAND_INSTANCE_SIGNATURE')
+    if not signature:
+        return None
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR', f"/run/user/{os.getuid()}")
+    for base in (Path(runtime_dir) / "hypr", Path("/tmp/hypr")):
+        path = base / signature / name
+        if path.exists():
+            return path
+    return None
+
+def get_event_socket_path():
+    """Hyprland's event socket (socket2) for this session, or None outside Hyprland"""
+    return get_hyprland_socket_path(".socket2.sock")
+
+def order_monitors(monitors, order):
+    """Sort monitors by Hyprland id, or left-to-right/top-to-bottom by position"""
+    if order == 'position':
+        return sorted(monitors, key=lambda m: (m.get('x', 0), m.get('y', 0)))
+    return sorted(monitors, key=lambda m: m.get('id', 0))
+
+def format_monitor_rule(monitor):
+    """Hyprland monitor= line placing one monitor of a topology"""
+    mode = f"{monitor['width']}x{monitor['height']}"
+    if monitor.get('refresh'):
+        mode += f"@{monitor['refresh']}"
+    rule = f"monitor={monitor['name']},{mode},{monitor.get('x', 0)}x{monitor.get('y', 0)},{monitor.get('scale', 1)}"
+    if monitor.get('transform'):
+        rule += f",transform,{monitor['transform']}"
+    return rule
+
+def plan_workspaces(monitors, layout=None):
+    """Map each monitor name to its workspace ids according to a layout policy
+
+    contiguous:  blocks of workspaces_per_monitor (1-5, 6-10, 11-15, ...)
+    interleaved: round-robin (1 → first, 2 → second, ...)
+    explicit:    the 'assignments' table, for connected monitors only
+
+    Raises ValueError for a malformed layout.
+    """
+    if layout is not None and not isinstance(layout, dict):
+        raise ValueError(f"layout must be an object, got {type(layout).__name__}")
+    layout = {**DEFAULT_LAYOUT, **(layout or {})}
+    ordered = order_monitors(monitors, layout['order'])
+    policy = layout['policy']
+    try:
+        per_monitor = max(1, int(layout['workspaces_per_monitor']))
+    except (TypeError, ValueError):
+        raise ValueError(f"workspaces_per_monitor must be a number, got {layout['workspaces_per_monitor']!r}")
+
+    if policy == 'explicit':
+        assignments = layout['assignments']
+        if not isinstance(assignments, dict) or not all(isinstance(ws, list) for ws in assignments.values()):
+            raise ValueError("assignments must map monitor names to lists of workspace numbers")
+        connected = {m['name'] for m in ordered}
+        try:
+            return {name: [int(ws) for ws in workspaces]
+                    for name, workspaces in assignments.items() if name in connected}
+        except (TypeError, ValueError):
+            raise ValueError("assignments must map monitor names to lists of workspace numbers")
+    if policy == 'interleaved':
+        total = per_monitor * len(ordered)
+        return {m['name']: list(range(index + 1, total + 1, len(ordered)))
+                for index, m in enumerate(ordered)}
+    if policy == 'contiguous':
+        return {m['name']: list(range(index * per_monitor + 1, (index + 1) * per_monitor + 1))
+                for index, m in enumerate(ordered)}
+
+    raise ValueError(f"Unknown workspace layout policy: {policy!r}")
+
+class MonitorTopology:
+    """Connected monitors, cached on disk until a hotplug or explicit refresh"""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.monitors = None
+
+    def load(self):
+        """Cached monitors from a previous run, or None if there is no usable cache"""
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                return data.get('monitors')
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return None
+
+    def save(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'monitors': self.monitors}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not save monitor cache: {e}")
+
+    def query(self):
+        """Ask Hyprland for the current monitors; None when it cannot be reached"""
+        try:
+            result = subprocess.run(['hyprctl', 'monitors', '-j'], capture_output=True, text=True, timeout=5)
+        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+            print(f"⚠️ Could not query monitors: {e}")
+            return None
+        if result.returncode != 0:
+            return None
+
+        try:
+            monitors = json.loads(result.stdout)
+        except json.JSONDecodeError:
+            print("⚠️ hyprctl returned invalid monitor JSON")
+            return None
+        if not isinstance(monitors, list):
+            return None
+
+        # Keep only what layout planning and wallpaper scaling need
+        keys = ('id', 'name', 'width', 'height', 'x', 'y', 'scale', 'transform')
+        return [{key: monitor[key] for key in keys if key in monitor} for monitor in monitors]
+
+    def refresh(self):
+        """Re-query Hyprland and update the cache; unreachable IPC keeps the old topology"""
+        monitors = self.query()
+        if monitors is None:
+            return self.monitors or []
+        if monitors != self.monitors:
+            self.monitors = monitors
+            self.save()
+        return self.monitors
+
+    def invalidate(self):
+        """Forget the topology so the next lookup queries Hyprland"""
+        self.monitors = None
+        self.cache_path.unlink(missing_ok=True)
+
+    def get_monitors(self, query=True):
+        """Connected monitors without IPC whenever a cached topology exists
+
+        With query=False a missing cache gives [] instead of asking Hyprland.
+        """
+        if self.monitors is None:
+            self.monitors = self.load()
+        if self.monitors is None:
+            if not query:
+                return []
+            monitors = self.query()
+            if monitors is None:
+                return []
+            self.monitors = monitors
+            self.save()
+        return self.monitors
+
+class HotplugListener:
+    """Reads Hyprland's event socket and reports monitor add/remove events"""
+
+    def __init__(self, path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(str(path))
+        self.sock.setblocking(False)
+        self.buffer = b''
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def read_hotplug(self):
+        """Drain pending events; True if any of them changed the monitor layout"""
+        try:
+            data = self.sock.recv(65536)
+        except BlockingIOError:
+            return False
+        if not data:
+            raise ConnectionError("Hyprland event socket closed")
+
+        self.buffer += data
+        *lines, self.buffer = self.buffer.split(b'\n')
+        return any(line.split(b'>>', 1)[0].decode(errors='replace') in HOTPLUG_EVENTS for line in lines)
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+💾 Output Backends
+Where generated files go: the live filesystem, memory (dry runs) or a staging directory
+"""
+
+import difflib
+import os
+import tempfile
+from pathlib import Path
+
+# Process umask, needed to give atomically written files normal permissions
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+def write_atomic(path, content):
+    """Write a file via a fsynced temp file renamed into place
+
+    Readers such as Hyprland or Waybar reloading mid-write see either the
+    old file or the new one, never a torn one.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~UMASK
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def read_text(path):
+    """A file's text, or None when it is missing or unreadable"""
+    try:
+        return Path(path).read_text()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def format_diff(path, old, new):
+    """Unified diff of one file; a missing old file diffs against /dev/null"""
+    return ''.join(difflib.unified_diff(
+        (old or '').splitlines(keepends=True), new.splitlines(keepends=True),
+        fromfile=str(path) if old is not None else '/dev/null', tofile=str(path)))
+
+class FilesystemBackend:
+    """Writes straight to the target paths; the only backend an apply reloads services for"""
+
+    live = True
+
+    def read(self, path):
+        return read_text(path)
+
+    def write(self, path, content):
+        write_atomic(path, content)
+
+class MemoryBackend:
+    """Keeps written files in memory; reads see them over the untouched live files"""
+
+    live = False
+
+    def __init__(self):
+        self.files = {}
+
+    def read(self, path):
+        path = Path(path)
+        if path in self.files:
+            return self.files[path]
+        return read_text(path)
+
+    def write(self, path, content):
+        self.files[Path(path)] = content
+
+    def get_changes(self):
+        """(path, live text, new text) for every written file that differs from the live one"""
+        changes = []
+        for path in sorted(self.files):
+            old = read_text(path)
+            if old != self.files[path]:
+                changes.append((path, old, self.files[path]))
+        return changes
+
+class StagingBackend:
+    """Writes under a staging root, mirroring the target paths relative to base"""
+
+    live = False
+
+    def __init__(self, root, base):
+        self.root = Path(root)
+        self.base = Path(base)
+        self.written = []
+
+    def get_staged_path(self, path):
+        path = Path(path)
+        try:
+            return self.root / path.relative_to(self.base)
+        except ValueError:
+            return self.root / path.relative_to(path.anchor)
+
+    def read(self, path):
+        staged = read_text(self.get_staged_path(path))
+        return staged if staged is not None else read_text(path)
+
+    def write(self, path, content):
+        staged_path = self.get_staged_path(path)
+        write_atomic(staged_path, content)
+        self.written.append(staged_path)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+🖼️ Wallpaper Palette Extractor
+Quantizes a downsampled wallpaper with vectorized k-means and maps it onto the theme color categories
+"""
+
+import colorsys
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Bump when extraction parameters change so stale cache entries are ignored
+CACHE_VERSION = 1
+
+# Longest side of the downsampled image fed to k-means
+SAMPLE_SIZE = 192
+CLUSTERS = 8
+MAX_ITERATIONS = 12
+# Minimum hue distance (fraction of the color wheel) between preferred accents
+ACCENT_HUE_GAP = 0.06
+
+def file_hash(path):
+    """sha256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_pixels(image_path):
+    """Decode and downsample an image to an (N, 3) float32 array"""
+    if Image is not None:
+        with Image.open(image_path) as img:
+            img.draft('RGB', (SAMPLE_SIZE, SAMPLE_SIZE))
+            img = img.convert('RGB')
+            factor = max(1, max(img.size) // SAMPLE_SIZE)
+            if factor > 1:
+                img = img.reduce(factor)
+            return np.asarray(img, dtype=np.float32).reshape(-1, 3)
+
+    # Same ImageMagick the wallpaper scripts already use
+    magick = shutil.which('magick') or shutil.which('convert')
+    if not magick:
+        raise RuntimeError("Palette extraction needs Pillow or ImageMagick to decode wallpapers")
+    result = subprocess.run([magick, str(image_path), '-sample', f'{SAMPLE_SIZE}x{SAMPLE_SIZE}>',
+                             '-depth', '8', 'rgb:-'], capture_output=True, check=True)
+    return np.frombuffer(result.stdout, dtype=np.uint8).reshape(-1, 3).astype(np.float32)
+
+def kmeans(pixels, k=CLUSTERS, iterations=MAX_ITERATIONS):
+    """Vectorized k-means, seeded deterministically along the luminance axis
+
+    Returns (centers, shares) sorted by how much of the image each cluster covers.
+    """
+    luminance = pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    order = np.argsort(luminance, kind='stable')
+    centers = pixels[order[np.linspace(0, len(order) - 1, k).astype(int)]].copy()
+
+    for _ in range(iterations):
+        distances = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=pixels[:, c], minlength=k) for c in range(3)], axis=1)
+        updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        converged = np.abs(updated - centers).max() < 0.5
+        centers = updated.astype(np.float32)
+        if converged:
+            break
+
+    shares = counts / counts.sum()
+    ranked = np.argsort(-shares, kind='stable')
+    return centers[ranked], shares[ranked]
+
+def to_hex(rgb):
+    return "#" + "".join(f"{min(255, max(0, round(c))):02x}" for c in rgb)
+
+def with_lightness(hls, lightness, max_saturation=1.0):
+    """Hex of a color moved to a target HLS lightness (and capped saturation)"""
+    h, _, s = hls
+    r, g, b = colorsys.hls_to_rgb(h, min(1.0, max(0.0, lightness)), min(s, max_saturation))
+    return to_hex((r * 255, g * 255, b * 255))
+
+def build_palette(centers, shares):
+    """Map clusters onto the primary/accent/neutral/text categories templates consume
+
+    status and semantic colors keep their meaning and are left to theme-config.json.
+    """
+    clusters = []
+    for rgb, share in zip(centers, shares):
+        h, l, s = colorsys.rgb_to_hls(*(float(c) / 255 for c in rgb))
+        clusters.append({'rgb': [float(c) for c in rgb], 'hls': (h, l, s), 'share': float(share)})
+
+    by_lightness = sorted(clusters, key=lambda c: c['hls'][1])
+    darkest, lightest = by_lightness[0], by_lightness[-1]
+    # Vivid: saturated, mid-lightness and covering a visible part of the image
+    vivid = sorted(clusters, key=lambda c: -c['hls'][2] * c['share'] ** 0.5 * (1 - abs(c['hls'][1] - 0.5)))
+    muted = sorted(clusters, key=lambda c: c['hls'][2])
+
+    # Prefer accents with distinct hues, then fill up with the remaining vivid clusters
+    accents = []
+    for cluster in vivid:
+        if all(min(abs(cluster['hls'][0] - a['hls'][0]), 1 - abs(cluster['hls'][0] - a['hls'][0])) > ACCENT_HUE_GAP
+               for a in accents):
+            accents.append(cluster)
+    accents += [c for c in vivid if c not in accents]
+
+    def accent(index):
+        hls = accents[min(index, len(accents) - 1)]['hls']
+        return with_lightness(hls, min(0.65, max(0.35, hls[1])))
+
+    dark_l = min(darkest['hls'][1], 0.06)
+    light_l = max(lightest['hls'][1], 0.88)
+
+    return {
+        'primary': {
+            'primary': with_lightness(darkest['hls'], dark_l),
+            'secondary': with_lightness(darkest['hls'], dark_l + 0.04),
+            'tertiary': with_lightness(darkest['hls'], dark_l + 0.10),
+            'quaternary': with_lightness(darkest['hls'], dark_l),
+        },
+        'accent': {
+            'primary': accent(0),
+            'secondary': accent(1),
+            'tertiary': accent(2),
+            'quaternary': accent(3),
+        },
+        'neutral': {
+            'primary': with_lightness(muted[0]['hls'], 0.19, 0.25),
+            'secondary': with_lightness(muted[0]['hls'], 0.07, 0.25),
+            'tertiary': with_lightness(muted[0]['hls'], 0.30, 0.25),
+            'quaternary': with_lightness(muted[0]['hls'], 0.18, 0.25),
+        },
+        'text': {
+            'primary': with_lightness(lightest['hls'], light_l, 0.35),
+            'secondary': with_lightness(lightest['hls'], 0.65, 0.30),
+            'accent': 'accent.primary',
+            'muted': with_lightness(lightest['hls'], 0.45, 0.15),
+        },
+    }
+
+class PaletteExtractor:
+    """Extracts wallpaper palettes, cached by image content hash"""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.stats = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load cached clusters from previous extractions"""
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('palettes', {})
+                self.stats = data.get('files', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+            self.stats = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'palettes': self.entries, 'files': self.stats}, f)
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save palette cache: {e}")
+
+    def get_image_hash(self, image_path):
+        """Content hash of an image, skipping the rehash while mtime and size match"""
+        stat = os.stat(image_path)
+        key = str(image_path)
+        known = self.stats.get(key)
+        if known and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size:
+            return known['hash']
+
+        digest = file_hash(image_path)
+        self.stats[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest}
+        self.dirty = True
+        return digest
+
+    def get_clusters(self, image_path):
+        """Dominant colors of an image as (centers, shares), from cache when possible"""
+        digest = self.get_image_hash(image_path)
+        cached = self.entries.get(digest)
+        if cached:
+            return cached['centers'], cached['shares']
+
+        if np is None:
+            raise RuntimeError("Palette extraction needs NumPy (pip install numpy)")
+
+        centers, shares = kmeans(load_pixels(image_path))
+        self.entries[digest] = {'centers': centers.round(2).tolist(), 'shares': shares.round(5).tolist()}
+        self.dirty = True
+        return self.entries[digest]['centers'], self.entries[digest]['shares']
+
+    def extract(self, image_path):
+        """Return {category: {name: color}} for the categories build_palette fills"""
+        centers, shares = self.get_clusters(image_path)
+        self.save()
+        return build_palette(centers, shares)
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+🧊 Snapshot Store
+Content-addressed, deduplicated file snapshots for config backups and rolling back an apply
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Bump when the manifest or index layout changes so stale files are ignored
+SNAPSHOT_VERSION = 1
+
+# Never snapshotted: generator caches, batch builds and the backups themselves
+EXCLUDED_NAMES = {'.cache', 'backups', 'builds', '__pycache__', '.git'}
+
+# Apply snapshots kept after each apply
+DEFAULT_KEEP = 20
+
+# Below this many files hashing serially beats starting a thread pool
+PARALLEL_THRESHOLD = 64
+
+# Objects younger than this survive garbage collection, as an uncommitted capture may still use them
+GC_GRACE_SECONDS = 3600
+
+# Linux FICLONE ioctl: the copy shares extents with the original on btrfs, xfs and bcachefs
+FICLONE = 0x40049409
+
+class SnapshotError(ValueError):
+    """Raised for unknown snapshots or missing objects"""
+
+def file_hash(path):
+    """sha256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def clone_file(source, target):
+    """Copy source to target as a reflink where the filesystem supports it"""
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(source, target)
+
+def get_export_path(path):
+    """Location of an absolute path inside an exported tree, relative to $HOME when possible"""
+    path = Path(path)
+    try:
+        return path.relative_to(Path.home())
+    except ValueError:
+        return path.relative_to(path.anchor)
+
+class SnapshotStore:
+    """Files stored once per content hash, with one small manifest per snapshot
+
+    objects/ab/cdef...        file contents, read-only, shared by every snapshot
+    snapshots/<id>.json       {path: {hash, mode}} or None for files that did not exist
+    index.json                mtime/size → hash, so unchanged files are never re-read
+    pins.json                 name → entry of content kept outside any snapshot
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self.index_path = self.root / "index.json"
+        self.pins_path = self.root / "pins.json"
+        self.index = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load file hashes from previous snapshots"""
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            if data.get('version') == SNAPSHOT_VERSION:
+                self.index = data.get('files', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.index = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_name(f".{self.index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': SNAPSHOT_VERSION, 'files': self.index}, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save snapshot index: {e}")
+
+    @contextmanager
+    def lock(self):
+        """Serialize writers, so garbage collection never races a snapshot in progress"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def get_file_hash(self, path, stat):
+        """Content hash of a file, skipping the rehash while mtime and size match"""
+        key = str(path)
+        known = self.index.get(key)
+        if known and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size:
+            return known['hash']
+
+        digest = file_hash(path)
+        self.index[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest}
+        self.dirty = True
+        return digest
+
+    def store(self, path):
+        """Add one file's content to the object store, once per distinct content"""
+        stat = os.stat(path)
+        digest = self.get_file_hash(path, stat)
+        target = self.object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=".", suffix=".tmp")
+            os.close(fd)
+            try:
+                clone_file(path, tmp_path)
+                # Read-only, so a hard-linked export cannot be edited back into the store
+                os.chmod(tmp_path, 0o444)
+                os.replace(tmp_path, target)
+            finally:
+                Path(tmp_path).unlink(missing_ok=True)
+        return {'hash': digest, 'mode': stat.st_mode & 0o777}
+
+    def collect(self, paths):
+        """Expand directories into their files, skipping EXCLUDED_NAMES and symlinks"""
+        files = []
+        for path in map(Path, paths):
+            if path.is_dir():
+                for parent, dirnames, filenames in os.walk(path):
+                    dirnames[:] = sorted(name for name in dirnames if name not in EXCLUDED_NAMES)
+                    for name in sorted(filenames):
+                        file_path = Path(parent) / name
+                        if not file_path.is_symlink():
+                            files.append(file_path)
+            else:
+                # Missing files are recorded too, so a restore removes files an apply created
+                files.append(path)
+        return files
+
+    def get_snapshot_id(self, label):
+        snapshot_id = f"{label}_snapshot_{datetime.now():%Y%m%d_%H%M%S}"
+        candidate, count = snapshot_id, 1
+        while (self.snapshots_dir / f"{candidate}.json").exists():
+            count += 1
+            candidate = f"{snapshot_id}_{count}"
+        return candidate
+
+    def capture(self, paths):
+        """Store the current content of paths and return their {path: entry} state
+
+        Only content not already in the store is copied. Nothing refers to the
+        captured state until commit() writes it as a snapshot.
+        """
+        files = self.collect(paths)
+
+        def record(path):
+            try:
+                return str(path), self.store(path)
+            except FileNotFoundError:
+                return str(path), None
+
+        with self.lock():
+            if len(files) < PARALLEL_THRESHOLD:
+                entries = dict(map(record, files))
+            else:
+                # hashlib and file copies release the GIL, so large trees hash in parallel
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                    entries = dict(pool.map(record, files))
+            self.save()
+        return entries
+
+    def snapshot(self, paths, label):
+        """Record the current state of paths and return the new snapshot id
+
+        A snapshot costs a manifest plus whatever changed since the previous one.
+        """
+        return self.commit(self.capture(paths), label, paths)
+
+    def commit(self, entries, label, roots):
+        """Write captured state as a snapshot manifest and return its id"""
+        with self.lock():
+            snapshot_id = self.get_snapshot_id(label)
+            manifest = {
+                'version': SNAPSHOT_VERSION,
+                'id': snapshot_id,
+                'label': label,
+                'created': time.time(),
+                'roots': [str(path) for path in roots],
+                'files': entries,
+            }
+            self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+            manifest_path = self.snapshots_dir / f"{snapshot_id}.json"
+            tmp_path = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(tmp_path, manifest_path)
+            self.save()
+        return snapshot_id
+
+    def get(self, snapshot_id):
+        try:
+            with open(self.snapshots_dir / f"{snapshot_id}.json") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise SnapshotError(f"Unknown snapshot: {snapshot_id}")
+        if manifest.get('version') != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Snapshot {snapshot_id} has an unsupported format")
+        return manifest
+
+    def list_snapshots(self, label=None):
+        """Manifests of all snapshots, newest first"""
+        manifests = []
+        for manifest_path in self.snapshots_dir.glob("*.json"):
+            try:
+                manifest = self.get(manifest_path.stem)
+            except SnapshotError:
+                continue
+            if label is None or manifest['label'] == label:
+                manifests.append(manifest)
+        return sorted(manifests, key=lambda m: m['created'], reverse=True)
+
+    def get_changes(self, entries):
+        """Paths whose current content or mode differs from captured {path: entry} state"""
+        changed = []
+        for path, entry in entries.items():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                if entry is not None:
+                    changed.append(path)
+                continue
+            if entry is None or entry['mode'] != stat.st_mode & 0o777 \
+                    or entry['hash'] != self.get_file_hash(path, stat):
+                changed.append(path)
+        return changed
+
+    def restore(self, snapshot_id):
+        """Put every file of a snapshot back atomically; returns the paths that changed"""
+        with self.lock():
+            manifest = self.get(snapshot_id)
+            changed = self.get_changes(manifest['files'])
+
+            for path in changed:
+                entry = manifest['files'][path]
+                if entry is None:
+                    Path(path).unlink(missing_ok=True)
+                    continue
+
+                source = self.object_path(entry['hash'])
+                if not source.exists():
+                    raise SnapshotError(f"Snapshot {snapshot_id} is missing the content of {path}")
+
+                target = Path(path)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+                os.close(fd)
+                try:
+                    clone_file(source, tmp_path)
+                    os.chmod(tmp_path, entry['mode'])
+                    os.replace(tmp_path, target)
+                finally:
+                    Path(tmp_path).unlink(missing_ok=True)
+
+            self.save()
+        return changed
+
+    def rollback(self, label):
+        """Restore the newest snapshot with label that differs from the current files
+
+        The restored snapshot is consumed, so repeated rollbacks step further back.
+        Returns (snapshot id, restored paths), or None when there is nothing to undo.
+        """
+        for manifest in self.list_snapshots(label):
+            changed = self.restore(manifest['id'])
+            self.delete(manifest['id'])
+            if changed:
+                return manifest['id'], changed
+        return None
+
+    def load_pins(self):
+        try:
+            with open(self.pins_path) as f:
+                data = json.load(f)
+            if data.get('version') == SNAPSHOT_VERSION:
+                return data.get('pins', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return {}
+
+    def get_pin(self, name):
+        """Entry pinned under name, or None"""
+        return self.load_pins().get(name)
+
+    def pin(self, name, path):
+        """Store a file's current content under name, kept by garbage collection until re-pinned"""
+        with self.lock():
+            pins = self.load_pins()
+            try:
+                pins[name] = self.store(path)
+            except FileNotFoundError:
+                pins.pop(name, None)
+            tmp_path = self.pins_path.with_name(f".{self.pins_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': SNAPSHOT_VERSION, 'pins': pins}, f)
+            os.replace(tmp_path, self.pins_path)
+            self.save()
+
+    def delete(self, snapshot_id):
+        """Forget one snapshot; its objects go at the next garbage collection"""
+        (self.snapshots_dir / f"{snapshot_id}.json").unlink(missing_ok=True)
+
+    def prune(self, keep=DEFAULT_KEEP, max_age_days=None, label=None):
+        """Drop snapshots beyond the newest keep and older than max_age_days
+
+        Only snapshots carrying label are considered when one is given, so
+        frequent apply snapshots never push out a manual full backup.
+        Returns the ids that were removed.
+        """
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+        removed = []
+        with self.lock():
+            for position, manifest in enumerate(self.list_snapshots(label)):
+                expired = cutoff is not None and manifest['created'] < cutoff
+                if (keep is not None and position >= keep) or expired:
+                    self.delete(manifest['id'])
+                    removed.append(manifest['id'])
+            if removed:
+                self.collect_garbage()
+        return removed
+
+    def collect_garbage(self):
+        """Delete objects no remaining snapshot references; returns bytes freed"""
+        referenced = set()
+        for manifest in self.list_snapshots():
+            referenced.update(entry['hash'] for entry in manifest['files'].values() if entry)
+        referenced.update(entry['hash'] for entry in self.load_pins().values())
+
+        freed = 0
+        if not self.objects_dir.is_dir():
+            return freed
+        grace_cutoff = time.time() - GC_GRACE_SECONDS
+        for object_path in self.objects_dir.glob("*/*"):
+            if object_path.parent.name + object_path.name in referenced:
+                continue
+            stat = object_path.stat()
+            if stat.st_mtime < grace_cutoff:
+                freed += stat.st_size
+                object_path.unlink(missing_ok=True)
+        return freed
+
+    def export(self, snapshot_id, target_dir):
+        """Materialize a snapshot as a plain directory tree of hard links into the store"""
+        manifest = self.get(snapshot_id)
+        target_dir = Path(target_dir)
+        for path, entry in manifest['files'].items():
+            if entry is None:
+                continue
+            source = self.object_path(entry['hash'])
+            target = target_dir / get_export_path(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(source, target)
+            except OSError:
+                # Different filesystem, or hard links unsupported
+                clone_file(source, target)
+        return target_dir
+
+    def get_size(self):
+        """(object count, total bytes) actually used by the store"""
+        sizes = [path.stat().st_size for path in self.objects_dir.glob("*/*")] if self.objects_dir.is_dir() else []
+        return len(sizes), sum(sizes)
+
+def main():
+    """Command line used by scripts/config-backup.sh"""
+    parser = argparse.ArgumentParser(description='🧊 Snapshot Store')
+    parser.add_argument('--store', type=Path,
+                        default=Path.home() / ".config" / "hypr-system" / "backups" / "snapshots",
+                        help='Store directory (default: hypr-system/backups/snapshots)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    create = commands.add_parser('create', help='Snapshot files and directories')
+    create.add_argument('--label', default='manual')
+    create.add_argument('paths', nargs='+', type=Path)
+
+    listing = commands.add_parser('list', help='List snapshot ids, newest first')
+    listing.add_argument('--label')
+
+    show = commands.add_parser('show', help='Describe one snapshot')
+    show.add_argument('snapshot_id')
+
+    restore = commands.add_parser('restore', help='Restore every file of a snapshot')
+    restore.add_argument('snapshot_id')
+
+    rollback = commands.add_parser('rollback', help='Undo the last snapshot with a label')
+    rollback.add_argument('--label', default='apply')
+
+    delete = commands.add_parser('delete', help='Delete a snapshot and unreferenced objects')
+    delete.add_argument('snapshot_id')
+
+    export = commands.add_parser('export', help='Materialize a snapshot as a directory tree')
+    export.add_argument('snapshot_id')
+    export.add_argument('target_dir', type=Path)
+
+    prune = commands.add_parser('prune', help='Apply a retention policy')
+    prune.add_argument('--keep', type=int)
+    prune.add_argument('--max-age-days', type=float)
+    prune.add_argument('--label')
+
+    commands.add_parser('info', help='Show snapshot count and store size')
+
+    args = parser.parse_args()
+    store = SnapshotStore(args.store)
+
+    try:
+        if args.command == 'create':
+            print(store.snapshot([path.expanduser().absolute() for path in args.paths], args.label))
+        elif args.command == 'list':
+            for manifest in store.list_snapshots(args.label):
+                print(manifest['id'])
+        elif args.command == 'show':
+            manifest = store.get(args.snapshot_id)
+            files = [entry for entry in manifest['files'].values() if entry]
+            print(f"Snapshot: {manifest['id']}")
+            print(f"Date: {datetime.fromtimestamp(manifest['created']):%Y-%m-%d %H:%M:%S}")
+            print(f"Type: {manifest['label']}")
+            print(f"Files: {len(files)}")
+            print(f"Size: {sum(store.object_path(entry['hash']).stat().st_size for entry in files) / 1024:.1f} KiB")
+            print(f"Roots: {', '.join(manifest['roots'])}")
+        elif args.command == 'restore':
+            changed = store.restore(args.snapshot_id)
+            print(f"✅ Restored {len(changed)} file(s) from {args.snapshot_id}")
+        elif args.command == 'rollback':
+            result = store.rollback(args.label)
+            if result is None:
+                print(f"⚠️ No {args.label} snapshot to roll back to")
+                sys.exit(1)
+            print(f"⏪ Rolled back to {result[0]} ({len(result[1])} file(s) restored)")
+        elif args.command == 'delete':
+            store.get(args.snapshot_id)
+            with store.lock():
+                store.delete(args.snapshot_id)
+                freed = store.collect_garbage()
+            print(f"🗑️ Deleted {args.snapshot_id}, freed {freed / 1024:.1f} KiB")
+        elif args.command == 'export':
+            print(store.export(args.snapshot_id, args.target_dir))
+        elif args.command == 'prune':
+            removed = store.prune(args.keep, args.max_age_days, args.label)
+            print(f"🧹 Pruned {len(removed)} snapshot(s)")
+        elif args.command == 'info':
+            count, size = store.get_size()
+            print(f"Snapshots: {len(store.list_snapshots())}")
+            print(f"Objects: {count} ({size / 1048576:.1f} MiB)")
+    except (SnapshotError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+📡 Waybar Status Daemon
+Computes every custom waybar module state in one asyncio loop and streams
+JSON lines to waybar's continuous exec modules, only when a state changes
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import socket
+import sys
+
+from status_modules import STATUS_MODULES, get_status_socket_path
+
+def format_state(state):
+    """One waybar JSON line"""
+    return (json.dumps(state, ensure_ascii=False) + "\n").encode()
+
+class StatusDaemon:
+    """Polls each module in-process and fans its state out to the connected waybar modules"""
+
+    def __init__(self, modules):
+        self.modules = modules
+        self.states = {module.name: None for module in modules}
+        self.subscribers = {module.name: set() for module in modules}
+        self.stopped = None
+
+    def claim_socket(self, path):
+        """Remove a stale socket, refusing to start next to a running daemon"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+            raise RuntimeError(f"Status daemon already running on {path}")
+        except (ConnectionRefusedError, FileNotFoundError):
+            path.unlink(missing_ok=True)
+        finally:
+            probe.close()
+
+    def publish(self, name, state):
+        """Send a changed state to every waybar module following name"""
+        if state == self.states[name]:
+            return
+        self.states[name] = state
+        line = format_state(state)
+        for writer in list(self.subscribers[name]):
+            if writer.is_closing():
+                self.subscribers[name].discard(writer)
+            else:
+                writer.write(line)
+
+    async def poll(self, module):
+        """Re-read one module's state every module.interval seconds"""
+        while True:
+            try:
+                # Reads may block on IPC or a subprocess, so they run off the event loop
+                state = await asyncio.to_thread(module.read)
+            except Exception as e:
+                state = {"text": "", "class": "error", "tooltip": f"{module.name}: {e}"}
+            self.publish(module.name, state)
+            await asyncio.sleep(module.interval)
+
+    async def follow(self, name, reader, writer):
+        """Stream one module to a waybar exec until it disconnects"""
+        self.subscribers[name].add(writer)
+        try:
+            if self.states[name] is not None:
+                writer.write(format_state(self.states[name]))
+                await writer.drain()
+            # waybar never writes; EOF means the module went away
+            await reader.read()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers[name].discard(writer)
+            writer.close()
+
+    async def serve(self):
+        """Main event loop"""
+        self.stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, self.stopped.set)
+        loop.add_signal_handler(signal.SIGINT, self.stopped.set)
+
+        servers = []
+        paths = []
+        for module in self.modules:
+            path = get_status_socket_path(module.name)
+            self.claim_socket(path)
+            servers.append(await asyncio.start_unix_server(
+                lambda reader, writer, name=module.name: self.follow(name, reader, writer), path=str(path)))
+            paths.append(path)
+
+        tasks = [asyncio.create_task(self.poll(module)) for module in self.modules]
+        print(f"📡 Status daemon streaming {', '.join(m.name for m in self.modules)} "
+              f"from {paths[0].parent}")
+        try:
+            await self.stopped.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            for server in servers:
+                server.close()
+            for path in paths:
+                path.unlink(missing_ok=True)
+            print("👋 Status daemon stopped")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='📡 Waybar Status Daemon')
+    parser.add_argument('--once', metavar='MODULE', choices=[m.name for m in STATUS_MODULES],
+                        help='Print one module state and exit (fallback while the daemon is down)')
+    args = parser.parse_args()
+
+    if args.once:
+        module = next(m for m in STATUS_MODULES if m.name == args.once)()
+        sys.stdout.buffer.write(format_state(module.read()))
+        return
+
+    try:
+        asyncio.run(StatusDaemon([module() for module in STATUS_MODULES]).serve())
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
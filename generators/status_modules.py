@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+📡 Waybar Status Modules
+States of the custom waybar modules, computed in-process, and the waybar config that streams them
+"""
+
+import http.client
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+# Nerd Font glyphs shown by the recorder module (same as scripts/screen-recorder.sh)
+RECORDING_ICON = ""
+IDLE_ICON = "󰑋"
+
+# ZeroTier's local service API, used instead of zerotier-cli when an auth token is readable
+ZEROTIER_API = ("127.0.0.1", 9993)
+ZEROTIER_TOKEN_PATHS = (Path.home() / ".zeroTierOneAuthToken",
+                        Path("/var/lib/zerotier-one/authtoken.secret"))
+
+def get_status_socket_path(name):
+    """Socket a module's state is streamed on; must match the shell path in get_waybar_modules()"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or Path.home() / ".cache"
+    return Path(runtime_dir) / "hypr-system" / "status" / f"{name}.sock"
+
+class ScreenRecorderStatus:
+    """Whether scripts/screen-recorder.sh has a wf-recorder running"""
+
+    name = "screenrec"
+    # Seconds between checks; each is a file read and a signal-0 probe, no fork
+    interval = 1
+    # Polling interval of the one-shot fallback while the daemon is down
+    fallback_interval = 2
+    waybar = {
+        "on-click": "~/.config/hypr-system/scripts/screen-recorder.sh toggle",
+        "on-click-right": "~/.config/hypr-system/scripts/screen-recorder.sh open",
+        "tooltip": True,
+    }
+
+    def __init__(self):
+        self.pid_path = Path.home() / ".cache" / "waybar_recorder.pid"
+
+    def is_recording(self):
+        try:
+            pid = int(self.pid_path.read_text().strip())
+            os.kill(pid, 0)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def read(self):
+        if self.is_recording():
+            return {"text": RECORDING_ICON, "tooltip": "Recording... (click to open)", "class": "recording"}
+        return {"text": IDLE_ICON, "tooltip": "Not Recording", "class": "idle"}
+
+class ZeroTierStatus:
+    """Connected ZeroTier networks, from the local service API or zerotier-cli"""
+
+    name = "zerotier"
+    interval = 30
+    fallback_interval = 30
+    waybar = {
+        "format": "🌐 {}",
+        "tooltip": True,
+        "on-click": "~/.config/hypr-system/scripts/zerotier-control.sh",
+    }
+
+    def get_token(self):
+        for path in ZEROTIER_TOKEN_PATHS:
+            try:
+                return path.read_text().strip()
+            except OSError:
+                continue
+        return None
+
+    def query_api(self, token, path):
+        connection = http.client.HTTPConnection(*ZEROTIER_API, timeout=2)
+        try:
+            connection.request("GET", path, headers={"X-ZT1-Auth": token})
+            response = connection.getresponse()
+            if response.status != 200:
+                raise OSError(f"ZeroTier API returned {response.status}")
+            return json.loads(response.read())
+        finally:
+            connection.close()
+
+    def query_cli(self, *args):
+        result = subprocess.run(['sudo', '-n', 'zerotier-cli', '-j', *args],
+                                capture_output=True, text=True, timeout=5)
+        if result.returncode != 0:
+            raise OSError(result.stderr.strip() or "zerotier-cli failed")
+        return json.loads(result.stdout)
+
+    def read(self):
+        token = self.get_token()
+        if token is None and not shutil.which('zerotier-cli'):
+            return {"text": "N/A", "class": "disabled", "tooltip": "ZeroTier not installed"}
+
+        try:
+            if token is not None:
+                info, networks = self.query_api(token, "/status"), self.query_api(token, "/network")
+            else:
+                info, networks = self.query_cli('info'), self.query_cli('listnetworks')
+        except ConnectionRefusedError:
+            return {"text": "Offline", "class": "offline", "tooltip": "ZeroTier service offline"}
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            return {"text": "Error", "class": "error", "tooltip": "ZeroTier service error"}
+
+        lines = [f"ZeroTier Node: {info.get('address', '')[:10]}...",
+                 f"Version: {info.get('version', 'unknown')}",
+                 f"Status: {'ONLINE' if info.get('online') else 'OFFLINE'}",
+                 ""]
+        if networks:
+            lines.append("Networks:")
+            for network in networks:
+                lines.append(f"  {network.get('name') or 'Unknown'} ({network.get('id', network.get('nwid', ''))[:8]}...)")
+                lines.append(f"    Status: {network.get('status', 'UNKNOWN')}")
+                addresses = network.get('assignedAddresses') or []
+                if addresses:
+                    lines.append(f"    IP: {', '.join(addresses)}")
+        else:
+            lines.append("No networks configured")
+
+        connected = sum(1 for network in networks if network.get('status') == 'OK')
+        return {"text": str(connected), "class": "connected" if connected else "disconnected",
+                "tooltip": "\n".join(lines)}
+
+STATUS_MODULES = (ZeroTierStatus, ScreenRecorderStatus)
+
+def get_waybar_modules():
+    """waybar module config streaming each status from the daemon
+
+    The exec keeps one socat connected; without the daemon it falls back to a
+    one-shot read, repeated by waybar after restart-interval like the old polling.
+    """
+    modules = {}
+    for module in STATUS_MODULES:
+        socket_path = f'"${{XDG_RUNTIME_DIR:-$HOME/.cache}}/hypr-system/status/{module.name}.sock"'
+        modules[f"custom/{module.name}"] = {
+            "exec": (f"socat -u UNIX-CONNECT:{socket_path} - 2>/dev/null || "
+                     f"python3 ~/.config/hypr-system/generators/status_daemon.py --once {module.name}"),
+            "return-type": "json",
+            "restart-interval": module.fallback_interval,
+            **module.waybar,
+        }
+    return modules
+
+def format_waybar_modules():
+    """get_waybar_modules() as comma-separated members to splice into waybar's top-level object"""
+    members = []
+    for name, config in get_waybar_modules().items():
+        value = json.dumps(config, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        members.append(f"  {json.dumps(name, ensure_ascii=False)}: {value}")
+    return ",\n".join(members)
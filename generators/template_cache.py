@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+📦 Compiled Template Cache
+Keeps the sanitized, pre-parsed layout of every template so renders are a plain join
+"""
+
+import hashlib
+import json
+import os
+import re
+from string import Template
+
+# Bump when the cached layout changes so stale caches are ignored
+CACHE_VERSION = 1
+
+def content_hash(text):
+    """Return a stable hash for generated or template text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def sanitize_template(text):
+    """Escape every $ that does not open a ${...} placeholder
+
+    This turns:
+      $TIME → $$TIME
+      $DATE$ → $$DATE$
+      ${something} → stays untouched
+    """
+    return re.sub(r'\$(?!\{)', r'$$', text)
+
+class CompiledTemplate:
+    """A template split into literal text and (name, raw) placeholder segments"""
+
+    __slots__ = ('segments', 'names', 'source_hash')
+
+    def __init__(self, segments, source_hash):
+        self.segments = segments
+        self.source_hash = source_hash
+        self.names = tuple(sorted({seg[0] for seg in segments if isinstance(seg, tuple)}))
+
+    @classmethod
+    def compile(cls, text):
+        """Sanitize and parse raw template text once"""
+        sanitized = sanitize_template(text)
+        segments = []
+        literal = []
+        pos = 0
+
+        for match in Template.pattern.finditer(sanitized):
+            literal.append(sanitized[pos:match.start()])
+            pos = match.end()
+
+            name = match.group('named') or match.group('braced')
+            if name is None:
+                # $$ collapses to $, invalid placeholders stay verbatim (as safe_substitute does)
+                literal.append('$' if match.group('escaped') is not None else match.group())
+                continue
+
+            segments.append(''.join(literal))
+            literal = []
+            segments.append((name, match.group()))
+
+        literal.append(sanitized[pos:])
+        segments.append(''.join(literal))
+
+        return cls([seg for seg in segments if seg != ''], content_hash(text))
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Rebuild a compiled template from its cached JSON form"""
+        segments = [seg if isinstance(seg, str) else tuple(seg) for seg in entry['segments']]
+        return cls(segments, entry['hash'])
+
+    def to_entry(self):
+        """Serializable form of the compiled layout"""
+        return {'hash': self.source_hash, 'segments': self.segments}
+
+    def render(self, mapping):
+        """Substitute values, leaving unknown placeholders untouched"""
+        parts = []
+        for seg in self.segments:
+            if isinstance(seg, str):
+                parts.append(seg)
+                continue
+
+            name, raw = seg
+            try:
+                parts.append(str(mapping[name]))
+            except KeyError:
+                parts.append(raw)
+
+        return ''.join(parts)
+
+class TemplateCache:
+    """Compiled templates keyed on path, mtime and size, persisted between runs"""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.compiled = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load cached layouts from the previous run"""
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('templates', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        """Persist the cache, dropping templates that no longer exist"""
+        self.prune()
+        if not self.dirty:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'templates': self.entries}, f)
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save template cache: {e}")
+
+    def get(self, template_path):
+        """Return the compiled template for a path, or None if it does not exist"""
+        key = str(template_path)
+        try:
+            stat = os.stat(template_path)
+        except FileNotFoundError:
+            self.evict(key)
+            return None
+
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            compiled = self.compiled.get(key)
+            if compiled is None:
+                compiled = CompiledTemplate.from_entry(entry)
+                self.compiled[key] = compiled
+            return compiled
+
+        with open(template_path, 'r') as f:
+            compiled = CompiledTemplate.compile(f.read())
+
+        self.entries[key] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            **compiled.to_entry(),
+        }
+        self.compiled[key] = compiled
+        self.dirty = True
+        return compiled
+
+    def evict(self, key):
+        """Forget a template that has disappeared"""
+        self.compiled.pop(key, None)
+        if self.entries.pop(key, None) is not None:
+            self.dirty = True
+
+    def prune(self):
+        """Evict every cached template whose file is gone"""
+        for key in [key for key in self.entries if not os.path.exists(key)]:
+            self.evict(key)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+🔍 Template Linter
+Tokenizes every template once and checks its placeholders against the generator's variables
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from template_cache import content_hash
+
+# Bump when the tokenizer output changes so stale lint caches are ignored
+CACHE_VERSION = 2
+
+# Same identifiers string.Template accepts inside ${...}
+IDENTIFIER = re.compile(r'[_a-zA-Z][_a-zA-Z0-9]*')
+
+# Shell parameter expansions (${VAR:-default}, ${#VAR}, ${VAR%.*}, ...), which rendering leaves verbatim
+SHELL_EXPANSION = re.compile(r'[#!]?(?:[_a-zA-Z][_a-zA-Z0-9]*|[0-9]+|[@*#?$!-])(?:[:#%/^,\[].*|[-=?+].*)?')
+
+# ${NAME} in capitals is taken for a shell variable; template variables are lowercase
+SHELL_VARIABLE = re.compile(r'[A-Z_][A-Z0-9_]*')
+
+class TemplateLintError(ValueError):
+    """Raised with every template problem found by the pre-flight check"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len(errors)} template problem(s), nothing was written:\n  "
+                         + "\n  ".join(format_issue(*error) for error in errors))
+
+def format_issue(path, line, column, message):
+    """path:line[:column]: message, like compiler diagnostics"""
+    location = f"{path}:{line}" + (f":{column}" if column else "")
+    return f"{location}: {message}" if path else message
+
+def tokenize_placeholders(text):
+    """Single pass over a template collecting ${name} uses and malformed placeholders
+
+    Returns ({name: [line, ...]}, [(line, column, message), ...],
+    [(line, column, text), ...] of shell expansions). Every ${ opens a
+    placeholder, since sanitize_template escapes all other $.
+    """
+    placeholders = {}
+    issues = []
+    shell = []
+    line = 1
+    pos = 0
+
+    while True:
+        start = text.find('${', pos)
+        if start < 0:
+            break
+        line += text.count('\n', pos, start)
+        column = start - text.rfind('\n', 0, start)
+
+        close = text.find('}', start + 2)
+        newline = text.find('\n', start + 2)
+        if close < 0 or 0 <= newline < close:
+            issues.append((line, column, "unclosed placeholder '${'"))
+            pos = start + 2
+            continue
+
+        name = text[start + 2:close]
+        if not name:
+            issues.append((line, column, "empty placeholder '${}'"))
+        elif not IDENTIFIER.fullmatch(name):
+            if SHELL_EXPANSION.fullmatch(name):
+                shell.append((line, column, f"${{{name}}}"))
+                pos = close + 1
+                continue
+            issues.append((line, column, f"invalid placeholder name '${{{name}}}'"))
+        else:
+            placeholders.setdefault(name, []).append(line)
+        pos = close + 1
+
+    return placeholders, issues, shell
+
+class TemplateLinter:
+    """Lint results per template, cached on path, mtime and size"""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('templates', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'templates': self.entries}, f)
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save lint cache: {e}")
+
+    def scan(self, template_path):
+        """Tokenize one template, reusing the cached result while the file is unchanged"""
+        key = str(template_path)
+        stat = os.stat(template_path)
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry
+
+        text = Path(template_path).read_text()
+        source_hash = content_hash(text)
+        if not entry or entry['hash'] != source_hash:
+            placeholders, issues, shell = tokenize_placeholders(text)
+            entry = {'hash': source_hash, 'placeholders': placeholders, 'issues': issues, 'shell': shell}
+        entry = {**entry, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+        self.entries[key] = entry
+        self.dirty = True
+        return entry
+
+    def lint(self, template_dir, variables, extra_variables=None, ignore_unused=(), save=True):
+        """Check every template under template_dir
+
+        variables are the shared template variables, extra_variables maps a
+        template name to the per-call variables it is rendered with. Shell
+        expansions and undefined ${CAPITALS} render verbatim, so they are
+        only warnings. save=False keeps the cache in memory (dry runs). Returns (errors, warnings) as lists of (path, line, column, message).
+        """
+        template_dir = Path(template_dir)
+        extra_variables = extra_variables or {}
+        errors = []
+        warnings = []
+        used = set()
+
+        template_paths = sorted(template_dir.rglob("*.template"))
+        live = {str(path) for path in template_paths}
+        for key in [key for key in self.entries if key not in live]:
+            del self.entries[key]
+            self.dirty = True
+
+        for template_path in template_paths:
+            entry = self.scan(template_path)
+            relative = template_path.relative_to(template_dir)
+            name = str(relative.with_suffix(''))
+            available = set(extra_variables.get(name, ()))
+
+            for line, column, message in entry['issues']:
+                errors.append((relative, line, column, message))
+            for line, column, text in entry['shell']:
+                warnings.append((relative, line, column, f"shell expansion '{text}' is left verbatim"))
+            for placeholder, lines in entry['placeholders'].items():
+                used.add(placeholder)
+                if placeholder in variables or placeholder in available:
+                    continue
+                for line in lines:
+                    if SHELL_VARIABLE.fullmatch(placeholder):
+                        warnings.append((relative, line, None,
+                                         f"'${{{placeholder}}}' is not a template variable, left verbatim"))
+                    else:
+                        errors.append((relative, line, None, f"undefined variable '${{{placeholder}}}'"))
+
+        errors.sort(key=lambda error: (str(error[0]), error[1], error[2] or 0))
+        warnings.sort(key=lambda warning: (str(warning[0]), warning[1], warning[2] or 0))
+        for variable in sorted(set(variables) - used - set(ignore_unused)):
+            warnings.append((None, None, None, f"variable '{variable}' is not used by any template"))
+
+        if save:
+            self.save()
+        return errors, warnings
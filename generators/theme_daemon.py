@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+👁️ Theme Generator Daemon
+Keeps configs and compiled templates in memory, watches core/ and templates/
+and serves regenerate requests over a local Unix socket
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import selectors
+import signal
+import socket
+import struct
+import time
+from pathlib import Path
+
+from monitor_topology import HotplugListener, get_event_socket_path
+
+# Pending-change marker for a monitor hotplug
+MONITORS_CHANGED = Path("monitors")
+
+# Wait for this long without new edits before regenerating
+DEBOUNCE_SECONDS = 0.3
+
+# Fallback polling interval when inotify is unavailable
+POLL_SECONDS = 1.0
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+def get_socket_path():
+    """Socket location shared with scripts/apply-theme.sh"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / "hypr-system" / "apply-theme.sock"
+    return Path.home() / ".config" / "hypr-system" / ".cache" / "apply-theme.sock"
+
+def is_relevant(name):
+    """Ignore editor swap files and our own atomic-write temp files"""
+    return bool(name) and not name.startswith('.') and not name.endswith(('.tmp', '~', '.swp'))
+
+class InotifyWatcher:
+    """Minimal inotify binding over libc"""
+
+    method = 'inotify'
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.watches = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+            self.watches[wd] = Path(directory)
+
+    def fileno(self):
+        return self.fd
+
+    def read_changes(self):
+        """Drain pending events, returning the watched directories that changed"""
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, _mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if wd in self.watches and is_relevant(name):
+                changed.add(self.watches[wd])
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """mtime scanner used where inotify is not available"""
+
+    method = 'polling'
+
+    def __init__(self, directories):
+        self.directories = [Path(directory) for directory in directories]
+        self.snapshots = {directory: self.snapshot(directory) for directory in self.directories}
+
+    def snapshot(self, directory):
+        state = {}
+        for entry in os.scandir(directory):
+            if is_relevant(entry.name):
+                stat = entry.stat()
+                state[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def fileno(self):
+        return None
+
+    def read_changes(self):
+        changed = set()
+        for directory in self.directories:
+            current = self.snapshot(directory)
+            if current != self.snapshots[directory]:
+                self.snapshots[directory] = current
+                changed.add(directory)
+        return changed
+
+    def close(self):
+        pass
+
+class ThemeDaemon:
+    """Resident generator serving regenerate, switch-workspace-mode and status"""
+
+    def __init__(self, generator, socket_path=None):
+        self.generator = generator
+        self.socket_path = Path(socket_path or get_socket_path())
+        self.core_dir = generator.config_dir / "core"
+        self.config_files = [self.core_dir / "theme-config.json",
+                             self.core_dir / "keybind-config.json"]
+        self.config_stamps = self.get_config_stamps()
+
+        self.pending = set()
+        self.pending_deadline = None
+        self.running = False
+        self.started_at = time.time()
+        self.last_run = None
+        self.selector = None
+        self.hotplug = None
+        self.topology_stale = False
+
+        try:
+            self.watcher = InotifyWatcher([self.core_dir, generator.template_dir])
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify unavailable ({e}), falling back to polling")
+            self.watcher = PollingWatcher([self.core_dir, generator.template_dir])
+
+    def get_config_stamps(self):
+        stamps = []
+        for path in self.config_files:
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamps.append(None)
+        return stamps
+
+    def refresh_configs(self):
+        """Re-parse the central JSON configs only if they changed on disk"""
+        stamps = self.get_config_stamps()
+        if stamps != self.config_stamps:
+            self.generator.reload_configs()
+            self.config_stamps = stamps
+
+    def bind(self):
+        """Create the control socket, refusing to start twice"""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.socket_path))
+                raise RuntimeError(f"Daemon already running on {self.socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                self.socket_path.unlink(missing_ok=True)
+            finally:
+                probe.close()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        server.listen(8)
+        server.setblocking(False)
+        return server
+
+    def regenerate(self, force=False):
+        """Run the full (incremental) generation with in-memory state"""
+        self.pending.clear()
+        self.pending_deadline = None
+        self.refresh_configs()
+        if self.topology_stale:
+            self.topology_stale = False
+            self.refresh_monitors()
+
+        previous_force = self.generator.force_rebuild
+        self.generator.force_rebuild = force
+        started = time.monotonic()
+        try:
+            self.generator.generate_all()
+        finally:
+            self.generator.force_rebuild = previous_force
+
+        self.last_run = {
+            'time': time.time(),
+            'seconds': round(time.monotonic() - started, 4),
+            'rebuilt': [str(path) for path in self.generator.rebuilt_targets],
+            'skipped': len(self.generator.skipped_targets),
+        }
+        return dict(self.last_run)
+
+    def refresh_monitors(self):
+        """Re-read the monitor layout from Hyprland"""
+        monitors = self.generator.monitor_topology.refresh()
+        print(f"🖥️ Monitors: {', '.join(m['name'] for m in monitors) or 'none'}")
+        return monitors
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'watcher': self.watcher.method,
+            'pending': sorted(str(path) for path in self.pending),
+            'workspace_mode': self.generator.theme_config.get('workspaces', {}).get('mode', 'virtual_desktops'),
+            'monitors': [m['name'] for m in self.generator.monitor_topology.get_monitors()],
+            'hotplug': self.hotplug is not None,
+            'last_run': self.last_run,
+        }
+
+    def handle_command(self, line):
+        """Dispatch one text command and return a JSON-serializable reply"""
+        words = line.split()
+        if not words:
+            return {'ok': False, 'error': 'empty command'}
+
+        command, args = words[0], words[1:]
+        try:
+            if command == 'regenerate':
+                return {'ok': True, **self.regenerate(force='--force' in args)}
+            if command == 'switch-workspace-mode':
+                self.refresh_configs()
+                mode = self.generator.switch_workspace_mode()
+                self.generator.save_manifest()
+                self.config_stamps = self.get_config_stamps()
+                return {'ok': True, 'mode': mode}
+            if command == 'rollback':
+                snapshot_id = self.generator.rollback()
+                self.config_stamps = self.get_config_stamps()
+                if snapshot_id is None:
+                    return {'ok': False, 'error': 'no applied changes to roll back'}
+                return {'ok': True, 'snapshot': snapshot_id}
+            if command == 'refresh-monitors':
+                self.topology_stale = True
+                return {'ok': True, **self.regenerate(force='--force' in args)}
+            if command == 'status':
+                return {'ok': True, **self.status()}
+            if command == 'shutdown':
+                self.running = False
+                return {'ok': True}
+        except (Exception, SystemExit) as e:
+            return {'ok': False, 'error': str(e) or e.__class__.__name__}
+
+        return {'ok': False, 'error': f"unknown command: {command}"}
+
+    def on_client(self, server):
+        try:
+            conn, _ = server.accept()
+        except BlockingIOError:
+            return
+
+        with conn:
+            conn.settimeout(2.0)
+            try:
+                data = b''
+                while b'\n' not in data and len(data) < 4096:
+                    chunk = conn.recv(1024)
+                    if not chunk:
+                        break
+                    data += chunk
+                reply = self.handle_command(data.decode(errors='replace').strip())
+                conn.sendall((json.dumps(reply) + '\n').encode())
+            except OSError as e:
+                print(f"⚠️ Client error: {e}")
+
+    def on_fs_events(self, _watcher=None):
+        changed = self.watcher.read_changes()
+        if changed:
+            self.pending.update(changed)
+            self.pending_deadline = time.monotonic() + DEBOUNCE_SECONDS
+
+    def on_hotplug(self, listener):
+        try:
+            changed = listener.read_hotplug()
+        except (ConnectionError, OSError) as e:
+            print(f"⚠️ Lost Hyprland event socket ({e}), monitor hotplug disabled")
+            self.selector.unregister(listener)
+            listener.close()
+            self.hotplug = None
+            return
+
+        if changed:
+            self.topology_stale = True
+            self.pending.add(MONITORS_CHANGED)
+            self.pending_deadline = time.monotonic() + DEBOUNCE_SECONDS
+
+    def connect_hotplug(self):
+        """Subscribe to Hyprland monitor add/remove events if running under Hyprland"""
+        path = get_event_socket_path()
+        if path is None:
+            return
+        try:
+            self.hotplug = HotplugListener(path)
+        except OSError as e:
+            print(f"⚠️ Could not connect to {path} ({e}), monitor hotplug disabled")
+            return
+        self.selector.register(self.hotplug, selectors.EVENT_READ, self.on_hotplug)
+
+    def get_timeout(self):
+        timeout = None if self.watcher.fileno() is not None else POLL_SECONDS
+        if self.pending_deadline is not None:
+            remaining = max(0.0, self.pending_deadline - time.monotonic())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def stop(self, *_args):
+        self.running = False
+
+    def serve_forever(self):
+        """Main event loop"""
+        server = self.bind()
+        selector = self.selector = selectors.DefaultSelector()
+        selector.register(server, selectors.EVENT_READ, self.on_client)
+        if self.watcher.fileno() is not None:
+            selector.register(self.watcher, selectors.EVENT_READ, self.on_fs_events)
+
+        # The cached topology may predate monitors plugged in while the daemon was down
+        self.refresh_monitors()
+        self.connect_hotplug()
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        print(f"👁️ Theme daemon listening on {self.socket_path} ({self.watcher.method})")
+        self.running = True
+        try:
+            while self.running:
+                for key, _ in selector.select(self.get_timeout()):
+                    key.data(key.fileobj)
+
+                if self.watcher.fileno() is None:
+                    self.on_fs_events()
+
+                if self.pending_deadline is not None and time.monotonic() >= self.pending_deadline:
+                    print(f"📝 Change detected in {', '.join(sorted(p.name for p in self.pending))}")
+                    try:
+                        self.regenerate()
+                    except (Exception, SystemExit) as e:
+                        print(f"❌ Regeneration failed: {e}")
+        finally:
+            selector.close()
+            server.close()
+            self.watcher.close()
+            if self.hotplug:
+                self.hotplug.close()
+            self.socket_path.unlink(missing_ok=True)
+            print("👋 Theme daemon stopped")
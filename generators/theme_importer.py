@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+📥 Theme Importer
+Validates theme JSON files in-process and registers them into themes/ in one pass
+"""
+
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from color_engine import ColorEngine, ColorResolutionError, is_literal, parse_color, to_hex
+from config_model import SECTION_TYPES, parse_section, type_name
+
+# Sections an importable theme must have (same as the old jq checks in scripts/theme-import.sh)
+REQUIRED_SECTIONS = ('colors', 'typography', 'spacing')
+
+# Below this many files, forking a pool costs more than validating serially
+PARALLEL_THRESHOLD = 8
+
+class ThemeImportError(ValueError):
+    """Raised with every problem of one theme file at once"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("Invalid theme:\n  " + "\n  ".join(errors))
+
+def sanitize_theme_name(name):
+    """Theme id from a display name, as sanitize_theme_name in scripts/theme-import.sh"""
+    theme_id = re.sub(r'[^a-z0-9-]', '-', name.lower())
+    return re.sub(r'-+', '-', theme_id).strip('-')
+
+def normalize_color(value):
+    """Canonical form of a literal color: lowercase #rrggbb[aa], compact rgb()/rgba()"""
+    r, g, b, alpha = parse_color(value)
+    if value.startswith('#'):
+        suffix = value[7:9].lower() if len(value) == 9 else ''
+        return to_hex(r, g, b) + suffix
+    if value.strip().startswith('rgba') or alpha != 1.0:
+        return f"rgba({r},{g},{b},{alpha:g})"
+    return f"rgb({r},{g},{b})"
+
+def normalize_colors(colors, errors):
+    """Copy of theme['colors'] with literals normalized; references are kept as written"""
+    if not isinstance(colors, dict):
+        errors.append(f"colors: expected an object, got {type_name(colors)}")
+        return None
+
+    normalized = {}
+    for category, group in colors.items():
+        if not isinstance(group, dict):
+            errors.append(f"colors.{category}: expected an object, got {type_name(group)}")
+            continue
+        entries = normalized[category] = {}
+        for name, value in group.items():
+            if not isinstance(value, str):
+                errors.append(f"colors.{category}.{name}: expected str, got {type_name(value)}")
+                continue
+            if is_literal(value):
+                try:
+                    value = normalize_color(value)
+                except ValueError as e:
+                    errors.append(f"colors.{category}.{name}: {e}")
+                    continue
+            entries[name] = value
+    return normalized
+
+def validate_theme(theme):
+    """Check a parsed theme and return it with normalized colors
+
+    Colors go through the same ColorEngine resolution as theme generation, so
+    a theme that validates here resolves when applied. Raises ThemeImportError.
+    """
+    if not isinstance(theme, dict):
+        raise ThemeImportError([f"expected a JSON object, got {type_name(theme)}"])
+
+    errors = []
+    meta = theme.get('meta')
+    if not isinstance(meta, dict) or not isinstance(meta.get('name'), str) or not meta['name'].strip():
+        errors.append("meta.name: missing")
+    elif not sanitize_theme_name(meta['name']):
+        errors.append(f"meta.name: {meta['name']!r} gives an empty theme id")
+
+    for name in REQUIRED_SECTIONS:
+        if name not in theme:
+            errors.append(f"{name}: missing")
+
+    # Every config section the theme carries must parse like it will when applied
+    for name, section_type in SECTION_TYPES.items():
+        if name in theme:
+            parse_section(section_type, theme[name], name, errors)
+
+    colors = normalize_colors(theme['colors'], errors) if 'colors' in theme else None
+
+    # Resolution runs even after other errors, so one pass reports everything;
+    # ColorEngine paths are relative to colors except its own color_shades ones
+    try:
+        ColorEngine(colors or {}, theme.get('color_shades')).get_resolved_colors()
+    except ColorResolutionError as e:
+        errors.extend(error if error.startswith('color_shades') else f"colors.{error}"
+                      for error in e.errors)
+
+    if errors:
+        raise ThemeImportError(errors)
+    return {**theme, 'colors': colors}
+
+def check_theme_file(path):
+    """Validate one theme file into a picklable result (runs in a worker)"""
+    result = {'path': str(path), 'ok': False}
+    try:
+        with open(path) as f:
+            theme = validate_theme(json.load(f))
+    except OSError as e:
+        result['errors'] = [e.strerror or str(e)]
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        result['errors'] = [f"invalid JSON: {e}"]
+    except ThemeImportError as e:
+        result['errors'] = e.errors
+    else:
+        result.update(ok=True, theme=theme, name=theme['meta']['name'],
+                      theme_id=sanitize_theme_name(theme['meta']['name']))
+    return result
+
+def collect_theme_files(paths):
+    """Theme JSON files named directly or found anywhere below the given directories"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*.json")))
+        else:
+            files.append(path)
+    return files
+
+class ThemeImporter:
+    """Validates theme files and writes the valid ones to themes/<theme_id>.json"""
+
+    def __init__(self, themes_dir, workers=1):
+        self.themes_dir = Path(themes_dir)
+        self.workers = max(1, workers or 1)
+
+    def validate(self, files):
+        """Results for every file, in order; validated in a process pool when asked to and worth it"""
+        if self.workers == 1 or len(files) < PARALLEL_THRESHOLD:
+            return [check_theme_file(path) for path in files]
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=multiprocessing.get_context('fork')) as pool:
+            return list(pool.map(check_theme_file, files, chunksize=max(1, len(files) // (self.workers * 4))))
+
+    def register(self, result, imported_date):
+        """Write a valid theme with its import metadata"""
+        theme = result['theme']
+        theme['meta'] = {**theme['meta'], 'theme_id': result['theme_id'], 'imported_date': imported_date}
+
+        target = self.themes_dir / f"{result['theme_id']}.json"
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(theme, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+            os.replace(tmp_path, target)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        result['target'] = str(target)
+
+    def import_files(self, paths, validate_only=False):
+        """Validate every theme file under paths, register the valid ones and report per file
+
+        Returns the per-file results; a later file claiming an id already taken
+        in the same run is reported instead of silently overwriting the first.
+        """
+        results = self.validate(collect_theme_files(paths))
+        imported_date = datetime.now().isoformat(timespec='seconds')
+        claimed = {}
+
+        if not validate_only:
+            self.themes_dir.mkdir(parents=True, exist_ok=True)
+
+        for result in results:
+            if result['ok'] and result['theme_id'] in claimed:
+                result.update(ok=False, errors=[f"theme id {result['theme_id']!r} already "
+                                                f"imported from {claimed[result['theme_id']]}"])
+            elif result['ok'] and not validate_only:
+                try:
+                    self.register(result, imported_date)
+                except OSError as e:
+                    result.update(ok=False, errors=[f"could not write theme: {e}"])
+
+            if result['ok']:
+                claimed[result['theme_id']] = result['path']
+                target = result.get('target', result['theme_id'])
+                print(f"✅ {result['path']} → {target} ({result['name']})")
+            else:
+                print(f"❌ {result['path']}:")
+                for error in result['errors']:
+                    print(f"   {error}")
+
+        valid = sum(1 for result in results if result['ok'])
+        verb = "Validated" if validate_only else "Imported"
+        print(f"📥 {verb} {valid}/{len(results)} theme(s)")
+        return results
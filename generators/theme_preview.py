@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+👁️ Theme Preview Renderer
+Draws a small PNG swatch of a theme JSON without applying it, cached by theme content hash
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+from color_engine import ColorEngine, parse_color
+
+# Bump when the layout changes so stale previews are redrawn
+PREVIEW_VERSION = 1
+
+DEFAULT_SIZE = (320, 180)
+
+# Oldest previews are dropped once the cache holds more than this many
+MAX_PREVIEWS = 500
+
+# Used for colors a theme leaves out or gets wrong; previews never fail on a partial theme
+FALLBACK_BACKGROUND = (16, 16, 16)
+FALLBACK_BORDER = (128, 128, 128)
+
+def blend(color, background):
+    """Composite an (r, g, b, alpha) color over an opaque background"""
+    r, g, b, alpha = color
+    if alpha >= 1.0:
+        return r, g, b
+    return tuple(round(c * alpha + bg * (1 - alpha)) for c, bg in zip((r, g, b), background))
+
+def encode_png(width, height, pixels):
+    """8-bit RGB PNG from packed rows, every row with filter type 0"""
+    stride = width * 3
+    raw = b''.join(b'\x00' + pixels[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 6))
+            + chunk(b'IEND', b''))
+
+class Canvas:
+    """Packed RGB raster drawn in whole row spans, each a single slice assignment"""
+
+    def __init__(self, width, height, color):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(color) * (width * height))
+
+    def fill_span(self, y, x0, x1, color):
+        x0, x1 = max(0, x0), min(self.width, x1)
+        if x1 <= x0 or not 0 <= y < self.height:
+            return
+        start = (y * self.width + x0) * 3
+        self.pixels[start:start + (x1 - x0) * 3] = bytes(color) * (x1 - x0)
+
+    def fill_rect(self, x0, y0, x1, y1, color):
+        for y in range(max(0, y0), min(self.height, y1)):
+            self.fill_span(y, x0, x1, color)
+
+    def fill_rounded_rect(self, x0, y0, x1, y1, radius, color):
+        """Rectangle with circular corners; only the corner rows are inset"""
+        radius = max(0, min(radius, (x1 - x0) // 2, (y1 - y0) // 2))
+        self.fill_rect(x0, y0 + radius, x1, y1 - radius, color)
+        for i in range(radius):
+            dy = radius - i - 0.5
+            inset = radius - round(math.sqrt(radius * radius - dy * dy))
+            self.fill_span(y0 + i, x0 + inset, x1 - inset, color)
+            self.fill_span(y1 - 1 - i, x0 + inset, x1 - inset, color)
+
+    def to_png(self):
+        return encode_png(self.width, self.height, self.pixels)
+
+class ThemePalette:
+    """A theme's colors resolved to opaque RGB for drawing"""
+
+    def __init__(self, theme):
+        colors = theme.get('colors') if isinstance(theme.get('colors'), dict) else {}
+        self.colors = {category: group for category, group in colors.items() if isinstance(group, dict)}
+        try:
+            self.engine = ColorEngine(self.colors, theme.get('color_shades'))
+        except (TypeError, AttributeError):
+            self.engine = None
+        # get() blends translucent colors over the background, so resolve it against the fallback
+        self.background = FALLBACK_BACKGROUND
+        self.background = self.get('primary.bg_primary') or FALLBACK_BACKGROUND
+
+    def get(self, ref):
+        """RGB of a literal or category.name reference, or None when it does not resolve"""
+        if not isinstance(ref, str) or self.engine is None:
+            return None
+        try:
+            color = parse_color(self.engine.resolve(ref))
+        except ValueError:
+            return None
+        return blend(color, self.background)
+
+    def get_category(self, category):
+        return [rgb for rgb in (self.get(f"{category}.{name}") for name in self.colors[category]) if rgb]
+
+def render_preview(theme, width, height):
+    """PNG bytes of one theme: palette strips, a bordered window sample and the semantic colors"""
+    palette = ThemePalette(theme)
+    spacing = theme.get('spacing') if isinstance(theme.get('spacing'), dict) else {}
+    scale = height / DEFAULT_SIZE[1]
+    pad = max(2, round(8 * scale))
+    gap = max(1, round(3 * scale))
+
+    canvas = Canvas(width, height, palette.background)
+
+    # Left: one strip per palette category, its colors side by side
+    split = round(width * 0.6)
+    strips = [colors for colors in (palette.get_category(category) for category in palette.colors
+                                    if category != 'semantic') if colors]
+    if strips:
+        strip_height = (height - 2 * pad - gap * (len(strips) - 1)) / len(strips)
+        for row, colors in enumerate(strips):
+            y0 = round(pad + row * (strip_height + gap))
+            y1 = round(pad + row * (strip_height + gap) + strip_height)
+            cell = (split - pad) / len(colors)
+            for column, rgb in enumerate(colors):
+                canvas.fill_rect(round(pad + column * cell), y0, round(pad + (column + 1) * cell), y1, rgb)
+
+    # Right top: a window drawn with the theme's border width, rounding and border colors
+    semantic = palette.colors.get('semantic', {})
+    x0, x1 = split + pad, width - pad
+    window_bottom = pad + round((height - 2 * pad) * 0.55)
+    border_width, rounding = spacing.get('border_width', 2), spacing.get('rounding', 0)
+    border = max(1, round((border_width if isinstance(border_width, int) else 2) * scale))
+    radius = round((rounding if isinstance(rounding, int) else 0) * scale)
+    border_color = palette.get(semantic.get('border_active')) or FALLBACK_BORDER
+    surface = palette.get('primary.bg_secondary') or palette.background
+
+    canvas.fill_rounded_rect(x0, pad, x1, window_bottom, radius, border_color)
+    canvas.fill_rounded_rect(x0 + border, pad + border, x1 - border, window_bottom - border,
+                             max(0, radius - border), surface)
+
+    # Text lines inside the window in the text colors
+    line_height = max(1, round(3 * scale))
+    line_y = pad + border + 2 * gap
+    for ref, fraction in (('text.primary', 0.7), ('text.secondary', 0.5), ('text.accent', 0.35)):
+        rgb = palette.get(ref)
+        if rgb and line_y + line_height < window_bottom - border - gap:
+            line_x = x0 + border + 2 * gap
+            canvas.fill_rect(line_x, line_y, line_x + round((x1 - line_x - border - gap) * fraction),
+                             line_y + line_height, rgb)
+            line_y += line_height + 2 * gap
+
+    # Right bottom: semantic colors as a grid of squares
+    semantic_colors = [rgb for rgb in (palette.get(ref) for ref in semantic.values()) if rgb]
+    if semantic_colors:
+        top = window_bottom + pad
+        columns = max(1, min(len(semantic_colors), 4))
+        rows = math.ceil(len(semantic_colors) / columns)
+        cell = min((x1 - x0 - gap * (columns - 1)) / columns, (height - pad - top - gap * (rows - 1)) / rows,
+                   28 * scale)
+        for index, rgb in enumerate(semantic_colors):
+            cx = round(x0 + (index % columns) * (cell + gap))
+            cy = round(top + (index // columns) * (cell + gap))
+            canvas.fill_rect(cx, cy, cx + max(1, round(cell)), cy + max(1, round(cell)), rgb)
+
+    return canvas.to_png()
+
+def get_font_names(theme):
+    typography = theme.get('typography') if isinstance(theme.get('typography'), dict) else {}
+    return [typography[key] for key in ('font_primary', 'font_secondary')
+            if isinstance(typography.get(key), str)]
+
+class PreviewCache:
+    """Rendered previews under cache_dir, named by a hash of the theme file bytes and the size"""
+
+    def __init__(self, cache_dir, size=DEFAULT_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.size = size
+
+    def get_preview_path(self, content):
+        digest = hashlib.sha256(f"{PREVIEW_VERSION}:{self.size[0]}x{self.size[1]}:".encode())
+        digest.update(content)
+        return self.cache_dir / f"{digest.hexdigest()[:32]}.png"
+
+    def get(self, theme_path):
+        """Path of theme_path's preview and its parsed theme, rendering it only on a cache miss"""
+        content = Path(theme_path).read_bytes()
+        theme = json.loads(content)
+        if not isinstance(theme, dict):
+            raise ValueError("theme is not a JSON object")
+
+        preview_path = self.get_preview_path(content)
+        if preview_path.exists():
+            return preview_path, theme
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = preview_path.with_name(f".{preview_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(render_preview(theme, *self.size))
+            os.replace(tmp_path, preview_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self.prune()
+        return preview_path, theme
+
+    def prune(self):
+        """Drop the oldest previews beyond MAX_PREVIEWS"""
+        previews = list(self.cache_dir.glob("*.png"))
+        if len(previews) <= MAX_PREVIEWS:
+            return
+        previews.sort(key=lambda path: path.stat().st_mtime)
+        for path in previews[:len(previews) - MAX_PREVIEWS]:
+            path.unlink(missing_ok=True)
+
+def parse_size(value):
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}")
+    if width < 16 or height < 16:
+        raise argparse.ArgumentTypeError("previews must be at least 16x16")
+    return width, height
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='👁️ Theme Preview Renderer')
+    parser.add_argument('themes', nargs='+', type=Path, metavar='THEME',
+                        help='Theme JSON files to preview')
+    parser.add_argument('--size', type=parse_size, default=DEFAULT_SIZE, metavar='WxH',
+                        help=f'Preview size (default: {DEFAULT_SIZE[0]}x{DEFAULT_SIZE[1]})')
+    parser.add_argument('--cache-dir', type=Path,
+                        default=Path.home() / ".config" / "hypr-system" / ".cache" / "previews",
+                        help='Where rendered previews are kept')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--rofi', action='store_true',
+                        help='Print rofi -dmenu rows (theme id · fonts) with the previews as icons')
+    output.add_argument('--paths', action='store_true',
+                        help='Print only the preview path of each theme')
+    args = parser.parse_args()
+
+    cache = PreviewCache(args.cache_dir, args.size)
+    failures = 0
+    for theme_path in args.themes:
+        try:
+            preview_path, theme = cache.get(theme_path)
+        except (OSError, ValueError) as e:
+            failures += 1
+            print(f"❌ {theme_path}: {e}", file=sys.stderr)
+            continue
+
+        if args.rofi:
+            label = " · ".join([theme_path.stem, *get_font_names(theme)])
+            sys.stdout.write(f"{label}\0icon\x1f{preview_path}\n")
+        elif args.paths:
+            print(preview_path)
+        else:
+            print(f"✅ {theme_path} → {preview_path}")
+
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+⏱️ Generator Stage Timings
+Records wall and CPU time per generator stage, prints a summary and writes Chrome/Perfetto traces
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Shared no-op context so disabled timing allocates nothing per stage
+NO_STAGE = nullcontext()
+
+class NullTimings:
+    """Timing hooks that do nothing, used unless --timings or --trace is given"""
+
+    enabled = False
+
+    def stage(self, name, category="generator", detail=None):
+        return NO_STAGE
+
+    def print_summary(self):
+        pass
+
+    def write_trace(self, path):
+        pass
+
+class Stage:
+    """Context manager measuring one stage on the current thread"""
+
+    __slots__ = ('timings', 'name', 'category', 'wall_start', 'cpu_start')
+
+    def __init__(self, timings, name, category):
+        self.timings = timings
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.cpu_start = time.thread_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall_end = time.perf_counter()
+        cpu = time.thread_time() - self.cpu_start
+        self.timings.record(self.name, self.category, self.wall_start, wall_end - self.wall_start, cpu)
+        return False
+
+class StageTimings:
+    """Collects stage events from every thread of a generator run"""
+
+    enabled = True
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+        self.lock = threading.Lock()
+
+    def stage(self, name, category="generator", detail=None):
+        """Time one stage, labelled "name detail" when a detail is given
+
+        Callers pass the detail (e.g. a template name) instead of a formatted
+        label, so NullTimings never builds one.
+        """
+        if detail is not None:
+            name = f"{name} {detail}"
+        return Stage(self, name, category)
+
+    def record(self, name, category, start, wall, cpu):
+        event = (name, category, start - self.origin, wall, cpu, threading.get_ident())
+        with self.lock:
+            self.events.append(event)
+
+    def get_summary(self):
+        """Aggregate events per stage name: calls, wall and CPU totals"""
+        summary = {}
+        for name, _category, _start, wall, cpu, _tid in self.events:
+            calls, wall_total, cpu_total = summary.get(name, (0, 0.0, 0.0))
+            summary[name] = (calls + 1, wall_total + wall, cpu_total + cpu)
+        return summary
+
+    def print_summary(self):
+        summary = self.get_summary()
+        if not summary:
+            return
+
+        print(f"\n⏱️ {'stage':<40} {'calls':>5} {'wall ms':>10} {'cpu ms':>10}")
+        for name, (calls, wall, cpu) in sorted(summary.items(), key=lambda item: -item[1][1]):
+            print(f"   {name:<40} {calls:>5} {wall * 1000:10.2f} {cpu * 1000:10.2f}")
+
+    def write_trace(self, path):
+        """Write the events in Chrome trace format (chrome://tracing, ui.perfetto.dev)"""
+        pid = os.getpid()
+        thread_ids = {}
+        trace_events = []
+
+        for name, category, start, wall, cpu, tid in self.events:
+            trace_events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round(start * 1e6, 3),
+                'dur': round(wall * 1e6, 3),
+                'pid': pid,
+                'tid': thread_ids.setdefault(tid, len(thread_ids) + 1),
+                'args': {'cpu_ms': round(cpu * 1000, 3)},
+            })
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        print(f"📈 Trace written to {path}")
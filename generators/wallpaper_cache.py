@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+🖼️ Pre-scaled Wallpaper Cache
+Keeps every wallpaper scaled to each monitor's exact resolution so swww only has to copy pixels
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+# Bump when the cached layout or scaling changes so stale entries are rebuilt
+CACHE_VERSION = 1
+
+# Binary PPM decodes as a straight memory copy, unlike PNG's inflate + unfilter
+CACHE_FORMAT = "ppm"
+
+WALLPAPER_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+# Per-resolution cache directories ("2560x1440")
+RESOLUTION_DIR = re.compile(r'\d+x\d+')
+
+def file_hash(path):
+    """sha256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def get_monitor_resolution(monitor):
+    """Physical (width, height) of a hyprctl monitor, accounting for rotation"""
+    width, height = monitor['width'], monitor['height']
+    if monitor.get('transform', 0) % 2:
+        width, height = height, width
+    return width, height
+
+def scale_image(source, target, width, height):
+    """Scale and center-crop source to exactly width x height (swww's default crop fill)"""
+    if Image is not None:
+        with Image.open(source) as img:
+            fitted = ImageOps.fit(img.convert('RGB'), (width, height), Image.Resampling.LANCZOS)
+            fitted.save(target, format='PPM')
+        return
+
+    magick = shutil.which('magick') or shutil.which('convert')
+    if not magick:
+        raise RuntimeError("Wallpaper scaling needs Pillow or ImageMagick")
+    subprocess.run([magick, str(source), '-resize', f'{width}x{height}^', '-gravity', 'center',
+                    '-extent', f'{width}x{height}', f'ppm:{target}'], check=True, capture_output=True)
+
+class WallpaperCache:
+    """Wallpapers pre-scaled per resolution, keyed by source content hash"""
+
+    def __init__(self, source_dir, cache_dir):
+        self.source_dir = Path(source_dir)
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / "index.json"
+        self.sources = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load source hashes from the previous run"""
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.sources = data.get('sources', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.sources = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_name(f".{self.index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'sources': self.sources}, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save wallpaper cache index: {e}")
+
+    def get_source_hash(self, source):
+        """Content hash of a wallpaper, skipping the rehash while mtime and size match"""
+        stat = os.stat(source)
+        key = source.name
+        known = self.sources.get(key)
+        if known and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size:
+            return known['hash']
+
+        digest = file_hash(source)
+        self.sources[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest}
+        self.dirty = True
+        return digest
+
+    def get_wallpapers(self):
+        return sorted(path for path in self.source_dir.iterdir()
+                      if path.is_file() and path.suffix.lower() in WALLPAPER_EXTENSIONS)
+
+    def get_cached_path(self, source, resolution):
+        """Cache location for one source at one resolution; changes with the source hash"""
+        width, height = resolution
+        digest = self.get_source_hash(source)
+        return self.cache_dir / f"{width}x{height}" / f"{source.stem}-{digest[:16]}.{CACHE_FORMAT}"
+
+    def ensure(self, source, resolution):
+        """Return the pre-scaled file for source at resolution, building it if missing"""
+        target = self.get_cached_path(source, resolution)
+        if target.exists():
+            return target
+
+        # Scaled next to the resolution directories, which only appear once a file succeeded
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / f".{target.parent.name}-{target.name}.{os.getpid()}.tmp"
+        try:
+            scale_image(source, tmp_path, *resolution)
+            target.parent.mkdir(exist_ok=True)
+            os.replace(tmp_path, target)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return target
+
+    def prune(self, resolutions):
+        """Drop resolutions no current monitor uses, and files no current source produces"""
+        live = {source.name for source in self.get_wallpapers()}
+        for name in [name for name in self.sources if name not in live]:
+            del self.sources[name]
+            self.dirty = True
+
+        # Whole directories of disconnected monitors' resolutions, including empty leftovers
+        wanted_dirs = {f"{width}x{height}" for width, height in resolutions}
+        if self.cache_dir.is_dir():
+            for res_dir in self.cache_dir.iterdir():
+                if res_dir.is_dir() and RESOLUTION_DIR.fullmatch(res_dir.name) and res_dir.name not in wanted_dirs:
+                    shutil.rmtree(res_dir, ignore_errors=True)
+
+        for resolution in resolutions:
+            wanted = {self.get_cached_path(source, resolution).name for source in self.get_wallpapers()}
+            res_dir = self.cache_dir / f"{resolution[0]}x{resolution[1]}"
+            if res_dir.is_dir():
+                for cached in res_dir.iterdir():
+                    if cached.name not in wanted:
+                        cached.unlink(missing_ok=True)
+
+    def build(self, monitors, write=True):
+        """Pre-scale every wallpaper for every monitor resolution
+
+        Returns {wallpaper name: [(output names, cached path), ...]}, grouping
+        monitors that share a resolution so they share one file. With
+        write=False only the paths are worked out; nothing is scaled, pruned
+        or saved.
+        """
+        by_resolution = {}
+        for monitor in monitors:
+            by_resolution.setdefault(get_monitor_resolution(monitor), []).append(monitor['name'])
+
+        sources = self.get_wallpapers()
+        for source in sources:
+            self.get_source_hash(source)
+
+        # Pillow and ImageMagick both scale outside the GIL, so misses build in parallel
+        jobs = [(source, resolution) for source in sources for resolution in by_resolution]
+        if not write:
+            paths = [self.get_cached_path(*job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                paths = list(pool.map(lambda job: self.ensure(*job), jobs))
+
+        scaled = {}
+        for (source, resolution), path in zip(jobs, paths):
+            scaled.setdefault(source.name, []).append((by_resolution[resolution], path))
+
+        if write:
+            self.prune(by_resolution)
+            self.save()
+        return scaled
@@ -88,7 +88,7 @@ PACKAGES[core]="hyprland waybar rofi dunst kitty thunar"
 PACKAGES[media]="mpv grim slurp wl-clipboard brightnessctl playerctl swww"
 
 # Development tools
-PACKAGES[dev]="jq python3 python-pip git"
+PACKAGES[dev]="jq python3 python-pip git socat"
 
 # Audio
 PACKAGES[audio]="pipewire wireplumber pavucontrol"
@@ -205,6 +205,8 @@ install_python_deps() {
         "jinja2"
         "pyyaml"
         "requests"
+        "numpy"
+        "pillow"
     )
 
     if command -v pip3 >/dev/null 2>&1; then
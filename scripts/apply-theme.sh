@@ -0,0 +1,86 @@
+#!/bin/bash
+# 🎨 Theme Generator Client
+# Sends requests to the resident generator daemon, falling back to a one-shot run
+#
+# Usage:
+#   apply-theme.sh                         Regenerate all configurations
+#   apply-theme.sh --force                 Regenerate everything, ignoring the manifest
+#   apply-theme.sh --switch-workspace-mode Switch workspace mode
+#   apply-theme.sh --refresh-monitors      Re-read the monitor layout, then regenerate
+#   apply-theme.sh --rollback              Undo the last apply from its snapshot
+#   apply-theme.sh --dry-run [--diff]      Show what would change, writing and reloading nothing
+#   apply-theme.sh --stage DIR             Write the changed outputs under DIR instead of in place
+#   apply-theme.sh --status                Show daemon status
+#   apply-theme.sh OTHER-OPTIONS...        Run apply-theme.py one-shot with those options
+
+SCRIPT_DIR="$HOME/.config/hypr-system"
+
+# Must match get_socket_path() in generators/theme_daemon.py
+if [[ -n "$XDG_RUNTIME_DIR" ]]; then
+    SOCKET="$XDG_RUNTIME_DIR/hypr-system/apply-theme.sock"
+else
+    SOCKET="$SCRIPT_DIR/.cache/apply-theme.sock"
+fi
+
+# Function to send one command to the daemon
+# Returns 0 on success, 1 when the daemon reported an error, 2 when it cannot be reached
+send_command() {
+    [[ -S "$SOCKET" ]] || return 2
+    command -v socat >/dev/null 2>&1 || return 2
+
+    local reply
+    reply=$(echo "$1" | socat -t 60 - "UNIX-CONNECT:$SOCKET" 2>/dev/null) || return 2
+    [[ -n "$reply" ]] || return 2
+
+    if [[ "$reply" == *'"ok": true'* ]]; then
+        echo "$reply"
+        return 0
+    fi
+
+    # The daemon already ran the request, so its error is the answer
+    echo "❌ $(jq -r '.error // "unknown error"' <<< "$reply" 2>/dev/null || echo "$reply")" >&2
+    return 1
+}
+
+case "$1" in
+    --switch-workspace-mode)
+        command="switch-workspace-mode"
+        ;;
+    --force)
+        command="regenerate --force"
+        ;;
+    --refresh-monitors)
+        command="refresh-monitors"
+        ;;
+    --rollback)
+        command="rollback"
+        ;;
+    --dry-run|--diff|--stage)
+        # The daemon always writes in place, so previews run one-shot
+        cd "$SCRIPT_DIR" && exec python3 generators/apply-theme.py "$@"
+        ;;
+    --status)
+        send_command "status"
+        case $? in
+            0) exit 0 ;;
+            2) echo "Daemon not running" ;;
+        esac
+        exit 1
+        ;;
+    "")
+        command="regenerate"
+        ;;
+    *)
+        # Anything else (--check, --timings, --palette-from, ...) is not a daemon command
+        cd "$SCRIPT_DIR" && exec python3 generators/apply-theme.py "$@"
+        ;;
+esac
+
+send_command "$command"
+case $? in
+    0) exit 0 ;;
+    1) exit 1 ;;
+esac
+
+# Only an unreachable daemon falls back to a one-shot run
+cd "$SCRIPT_DIR" && python3 generators/apply-theme.py "$@"
@@ -503,7 +503,7 @@ apply_component_changes() {
 
     # Regenerate from theme
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
     fi
 
     # Restart component
@@ -595,7 +595,7 @@ apply_all_component_changes() {
 
     # Regenerate all configs
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
     fi
 
     # Restart components
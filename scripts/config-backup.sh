@@ -4,6 +4,7 @@
 
 SCRIPT_DIR="$HOME/.config/hypr-system"
 BACKUP_DIR="$SCRIPT_DIR/backups"
+SNAPSHOT_TOOL="$SCRIPT_DIR/generators/snapshot_store.py"
 ROFI_THEME="$HOME/.config/rofi/themes/cyberpunk-medieval.rasi"
 
 # Colors for notifications
@@ -35,8 +36,24 @@ get_human_date() {
     fi
 }
 
+# Function to run the deduplicating snapshot store
+snapshot_store() {
+    python3 "$SNAPSHOT_TOOL" "$@"
+}
+
+# Function to check whether a backup name is a snapshot
+is_snapshot() {
+    [[ "$1" =~ _snapshot_[0-9]{8}_[0-9]{6} ]]
+}
+
 # Function to create full system backup
 create_full_backup() {
+    # Snapshots store each file once by content, so unchanged wallpapers cost nothing
+    if command -v python3 >/dev/null 2>&1 && [[ -f "$SNAPSHOT_TOOL" ]]; then
+        create_snapshot_backup
+        return
+    fi
+
     local backup_name="full_backup_$(get_timestamp)"
     local backup_path="$BACKUP_DIR/$backup_name"
 
@@ -132,6 +149,26 @@ EOF
     echo "$backup_path"
 }
 
+# Function to create full system backup as a deduplicated snapshot
+create_snapshot_backup() {
+    notify-send "💾 Creating Backup" "Snapshotting configuration..." -t 2000
+
+    local paths=("$SCRIPT_DIR")
+    local component
+    for component in hypr waybar rofi dunst kitty eww; do
+        [[ -d "$HOME/.config/$component" ]] && paths+=("$HOME/.config/$component")
+    done
+
+    local snapshot_id
+    if ! snapshot_id=$(snapshot_store create --label full "${paths[@]}"); then
+        notify-send "❌ Backup Failed" "$snapshot_id" -t 5000
+        return 1
+    fi
+
+    notify-send "✅ Backup Complete" "Snapshot created: $snapshot_id" -t 5000
+    echo "$snapshot_id"
+}
+
 # Function to create theme-only backup
 create_theme_backup() {
     local backup_name="theme_backup_$(get_timestamp)"
@@ -224,6 +261,7 @@ list_backups() {
 
     # Find backup directories and archives
     for backup in "$BACKUP_DIR"/*; do
+        [[ "$(basename "$backup")" == "snapshots" ]] && continue
         if [[ -d "$backup" ]] || [[ -f "$backup" && "$backup" =~ \.tar\.gz$ ]]; then
             local backup_name=$(basename "$backup" .tar.gz)
 
@@ -245,6 +283,17 @@ list_backups() {
         fi
     done
 
+    # Snapshots live in the store, not as directories of their own
+    if [[ -f "$SNAPSHOT_TOOL" ]]; then
+        local snapshot
+        while read -r snapshot; do
+            case "$backup_type" in
+                "full") [[ "$snapshot" =~ ^full_snapshot_ ]] && backups+=("$snapshot") ;;
+                "snapshot"|"all") backups+=("$snapshot") ;;
+            esac
+        done < <(snapshot_store list 2>/dev/null)
+    fi
+
     if [[ ${#backups[@]} -eq 0 ]]; then
         notify-send "📋 No Backups" "No backups found for type: $backup_type" -t 3000
         return 1
@@ -263,6 +312,12 @@ show_backup_details() {
     local backup_path="$BACKUP_DIR/$backup_name"
     local info_file=""
 
+    if is_snapshot "$backup_name"; then
+        snapshot_store show "$backup_name" | rofi -dmenu -p "📋 Backup Details" \
+            -theme "$ROFI_THEME" -no-custom -width 60
+        return
+    fi
+
     # Check if it's a compressed backup
     if [[ -f "$backup_path.tar.gz" ]]; then
         # Extract backup info from compressed file
@@ -305,7 +360,12 @@ restore_backup() {
     local backup_path="$BACKUP_DIR/$backup_name"
 
     # Check if backup exists
-    if [[ ! -d "$backup_path" && ! -f "$backup_path.tar.gz" ]]; then
+    if is_snapshot "$backup_name"; then
+        if ! snapshot_store show "$backup_name" >/dev/null; then
+            notify-send "❌ Backup Not Found" "Backup $backup_name does not exist" -t 3000
+            return 1
+        fi
+    elif [[ ! -d "$backup_path" && ! -f "$backup_path.tar.gz" ]]; then
         notify-send "❌ Backup Not Found" "Backup $backup_name does not exist" -t 3000
         return 1
     fi
@@ -321,6 +381,23 @@ restore_backup() {
     local current_backup=$(create_full_backup)
     notify-send "💾 Current State Backed Up" "Created backup before restore" -t 2000
 
+    # Snapshots restore file by file, atomically, and only what differs
+    if is_snapshot "$backup_name"; then
+        local result
+        if ! result=$(snapshot_store restore "$backup_name"); then
+            notify-send "❌ Restore Failed" "$result" -t 5000
+            return 1
+        fi
+
+        notify-send "🔄 Restarting Services" "Reloading configuration..." -t 2000
+        hyprctl reload 2>/dev/null
+        pkill waybar && waybar &
+        pkill dunst && dunst &
+
+        notify-send "✅ Restore Complete" "$result" -t 5000
+        return 0
+    fi
+
     # Extract compressed backup if needed
     local source_path="$backup_path"
     if [[ -f "$backup_path.tar.gz" ]]; then
@@ -410,7 +487,12 @@ delete_backup() {
     fi
 
     # Remove backup directory or archive
-    if [[ -d "$backup_path" ]]; then
+    if is_snapshot "$backup_name"; then
+        snapshot_store delete "$backup_name" >/dev/null || {
+            notify-send "❌ Backup Not Found" "Backup $backup_name does not exist" -t 3000
+            return 1
+        }
+    elif [[ -d "$backup_path" ]]; then
         rm -rf "$backup_path"
     elif [[ -f "$backup_path.tar.gz" ]]; then
         rm -f "$backup_path.tar.gz"
@@ -429,7 +511,17 @@ export_backup() {
     local export_path="$HOME/Desktop/${backup_name}.tar.gz"
 
     # Check if backup exists
-    if [[ -f "$backup_path.tar.gz" ]]; then
+    if is_snapshot "$backup_name"; then
+        # Hard links into the store, so materializing the tree copies nothing
+        local temp_dir=$(mktemp -d -p "$BACKUP_DIR")
+        if ! snapshot_store export "$backup_name" "$temp_dir/$backup_name" >/dev/null; then
+            rm -rf "$temp_dir"
+            notify-send "❌ Backup Not Found" "Backup $backup_name does not exist" -t 3000
+            return 1
+        fi
+        tar -czf "$export_path" -C "$temp_dir" "$backup_name"
+        rm -rf "$temp_dir"
+    elif [[ -f "$backup_path.tar.gz" ]]; then
         cp "$backup_path.tar.gz" "$export_path"
     elif [[ -d "$backup_path" ]]; then
         cd "$BACKUP_DIR"
@@ -520,7 +612,10 @@ Location: $BACKUP_DIR
 Backup Types:
 Full Backups: $(ls "$BACKUP_DIR"/full_backup_* 2>/dev/null | wc -l)
 Theme Backups: $(ls "$BACKUP_DIR"/theme_backup_* 2>/dev/null | wc -l)
-Component Backups: $(ls "$BACKUP_DIR"/*_backup_* 2>/dev/null | grep -v "full_backup\|theme_backup" | wc -l)"
+Component Backups: $(ls "$BACKUP_DIR"/*_backup_* 2>/dev/null | grep -v "full_backup\|theme_backup" | wc -l)
+
+Snapshot Store:
+$(snapshot_store info 2>/dev/null || echo "unavailable")"
 
     echo "$storage_info" | rofi -dmenu -p "📊 Storage Info" \
         -theme "$ROFI_THEME" -no-custom -width 60
@@ -542,22 +637,32 @@ clean_old_backups() {
 
     case "$selected" in
         *"30 days")
-            find "$BACKUP_DIR" -type f -name "*.tar.gz" -mtime +30 -delete
-            find "$BACKUP_DIR" -type d -mtime +30 -exec rm -rf {} + 2>/dev/null
+            find "$BACKUP_DIR" -maxdepth 1 -type f -name "*.tar.gz" -mtime +30 -delete
+            find "$BACKUP_DIR" -mindepth 1 -maxdepth 1 -type d ! -name snapshots -mtime +30 -exec rm -rf {} + 2>/dev/null
+            snapshot_store prune --max-age-days 30 >/dev/null 2>&1
             notify-send "🧹 Cleanup Complete" "Removed backups older than 30 days" -t 3000
             ;;
         *"7 days")
-            find "$BACKUP_DIR" -type f -name "*.tar.gz" -mtime +7 -delete
-            find "$BACKUP_DIR" -type d -mtime +7 -exec rm -rf {} + 2>/dev/null
+            find "$BACKUP_DIR" -maxdepth 1 -type f -name "*.tar.gz" -mtime +7 -delete
+            find "$BACKUP_DIR" -mindepth 1 -maxdepth 1 -type d ! -name snapshots -mtime +7 -exec rm -rf {} + 2>/dev/null
+            snapshot_store prune --max-age-days 7 >/dev/null 2>&1
             notify-send "🧹 Cleanup Complete" "Removed backups older than 7 days" -t 3000
             ;;
         *"last 10")
             # Keep only the 10 most recent backups
-            ls -t "$BACKUP_DIR"/ | tail -n +11 | while read -r backup; do
+            ls -t "$BACKUP_DIR"/ | grep -v "^snapshots$" | tail -n +11 | while read -r backup; do
                 rm -rf "$BACKUP_DIR/$backup"
             done
+            snapshot_store prune --keep 10 --label full >/dev/null 2>&1
             notify-send "🧹 Cleanup Complete" "Kept only the 10 most recent backups" -t 3000
             ;;
+        *"last 5")
+            ls -t "$BACKUP_DIR"/ | grep -v "^snapshots$" | tail -n +6 | while read -r backup; do
+                rm -rf "$BACKUP_DIR/$backup"
+            done
+            snapshot_store prune --keep 5 --label full >/dev/null 2>&1
+            notify-send "🧹 Cleanup Complete" "Kept only the 5 most recent backups" -t 3000
+            ;;
     esac
 }
 
@@ -571,6 +676,7 @@ show_backup_manager() {
         "📱 Create Component Backup"
         "📋 List All Backups"
         "🔄 Restore Backup"
+        "⏪ Undo Last Theme Apply"
         "📤 Export Backup"
         "📥 Import Backup"
         "🗑️ Delete Backup"
@@ -599,6 +705,9 @@ show_backup_manager() {
         "🔄 Restore Backup")
             restore_backup_dialog
             ;;
+        "⏪ Undo Last Theme Apply")
+            rollback_last_apply
+            ;;
         "📤 Export Backup")
             export_backup_dialog
             ;;
@@ -623,6 +732,16 @@ show_backup_manager() {
     show_backup_manager
 }
 
+# Function to undo the last apply-theme.py run from its pre-apply snapshot
+rollback_last_apply() {
+    local result
+    if result=$(cd "$SCRIPT_DIR" && python3 generators/apply-theme.py --rollback); then
+        notify-send "⏪ Rollback Complete" "$(echo "$result" | head -1)" -t 5000
+    else
+        notify-send "⚠️ Nothing to Roll Back" "$(echo "$result" | head -1)" -t 3000
+    fi
+}
+
 # Dialog functions
 create_component_backup_dialog() {
     local components=("waybar" "rofi" "dunst" "kitty" "eww" "hyprland")
@@ -636,7 +755,7 @@ create_component_backup_dialog() {
 }
 
 list_backups_dialog() {
-    local backup_types=("all" "full" "theme" "component")
+    local backup_types=("all" "full" "theme" "component" "snapshot")
     local selected_type=$(printf '%s\n' "${backup_types[@]}" | \
         rofi -dmenu -p "📋 Select Backup Type:" \
         -theme "$ROFI_THEME")
@@ -731,10 +850,16 @@ main() {
         "import")
             import_backup
             ;;
+        "rollback")
+            rollback_last_apply
+            ;;
+        "prune")
+            snapshot_store prune "${@:2}"
+            ;;
         *)
             echo "💾 Configuration Backup Manager"
             echo ""
-            echo "Usage: $0 {menu|create|list|restore|delete|export|import}"
+            echo "Usage: $0 {menu|create|list|restore|delete|export|import|rollback|prune}"
             echo ""
             echo "Commands:"
             echo "  menu                    - Show backup manager interface"
@@ -744,6 +869,8 @@ main() {
             echo "  delete <backup_name>   - Delete specific backup"
             echo "  export <backup_name>   - Export backup to desktop"
             echo "  import                 - Import backup from file"
+            echo "  rollback               - Undo the last theme apply"
+            echo "  prune [--keep N] [--max-age-days D] [--label L] - Apply snapshot retention"
             ;;
     esac
 }
@@ -362,7 +362,7 @@ apply_all_changes() {
 
     # Run theme generator
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
 
         # Reload Hyprland
         hyprctl reload
@@ -20,7 +20,7 @@ declare -A menu_options=(
     ["🔧 System Settings"]="$CONFIG_DIR/scripts/system-editor.sh|Adjust system-wide preferences"
     ["📱 Component Config"]="$CONFIG_DIR/scripts/component-editor.sh|Configure individual components"
     ["🗡️ Show Hotkeys"]="$CONFIG_DIR/scripts/hotkey-display.sh|Display all keyboard shortcuts"
-    ["🔄 Apply Changes"]="$CONFIG_DIR/generators/apply-theme.py|Regenerate all configurations"
+    ["🔄 Apply Changes"]="$CONFIG_DIR/scripts/apply-theme.sh|Regenerate all configurations"
     ["📄 Edit Theme JSON"]="code '$CONFIG_DIR/core/theme-config.json'|Direct edit theme configuration"
     ["⌨️ Edit Keybind JSON"]="code '$CONFIG_DIR/core/keybind-config.json'|Direct edit keybinding configuration"
     ["📁 Open Config Folder"]="thunar '$CONFIG_DIR'|Browse configuration directory"
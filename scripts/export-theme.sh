@@ -283,6 +283,30 @@ export_to_gist() {
     rm -f "$temp_file" "$share_file"
 }
 
+# Function to render every saved theme's configs in one batch (no live changes)
+export_theme_bundles() {
+    local export_name="$1"
+    local bundle_dir="$EXPORT_DIR/$export_name"
+
+    shopt -s nullglob
+    local theme_files=("$THEMES_DIR"/*.json)
+    shopt -u nullglob
+
+    if [[ ${#theme_files[@]} -eq 0 ]]; then
+        notify-send "❌ No Themes" "No saved themes found in $THEMES_DIR" -t 3000
+        return 1
+    fi
+
+    python3 "$SCRIPT_DIR/generators/apply-theme.py" \
+        --batch "${theme_files[@]}" --batch-output "$bundle_dir" >&2 || \
+        notify-send "⚠️ Bundle Export" "Some themes failed to render" -t 5000
+
+    tar -czf "$bundle_dir.tar.gz" --exclude=.manifest.json -C "$EXPORT_DIR" "$export_name"
+    rm -rf "$bundle_dir"
+
+    echo "$bundle_dir.tar.gz"
+}
+
 # Function to export wallpapers only
 export_wallpapers() {
     local export_name="$1"
@@ -327,6 +351,7 @@ show_export_options() {
         "📦 Export Complete Package|Export theme with wallpapers and assets|package"
         "🌐 Export for Sharing|Export minimal theme for easy sharing|share"
         "🖼️ Export Wallpapers Only|Export just the wallpapers|wallpapers"
+        "🗂️ Export All Theme Bundles|Render configs for every saved theme|bundles"
         "📤 Upload to GitHub Gist|Share theme via GitHub Gist|gist"
         "📋 Copy to Clipboard|Copy theme JSON to clipboard|clipboard"
         "👁️ Preview Export|Show what will be exported|preview"
@@ -388,6 +413,10 @@ execute_export_action() {
             local exported_file=$(export_wallpapers "$export_name")
             show_export_result "$exported_file"
             ;;
+        "bundles")
+            local exported_file=$(export_theme_bundles "theme-bundles-${timestamp}")
+            show_export_result "$exported_file"
+            ;;
         "gist")
             export_to_gist "$export_name"
             ;;
@@ -553,6 +582,9 @@ main() {
         "clipboard")
             copy_to_clipboard
             ;;
+        "bundles")
+            export_theme_bundles "theme-bundles-$(date +%Y%m%d_%H%M%S)"
+            ;;
         "gist")
             local theme_info=$(get_current_theme_info)
             IFS='|' read -r theme_name _ _ <<< "$theme_info"
@@ -562,7 +594,7 @@ main() {
         *)
             echo "📤 Theme Export Manager"
             echo ""
-            echo "Usage: $0 {menu|json|package|share|clipboard|gist}"
+            echo "Usage: $0 {menu|json|package|share|clipboard|gist|bundles}"
             echo ""
             echo "Commands:"
             echo "  menu       - Show export options menu"
@@ -571,6 +603,7 @@ main() {
             echo "  share      - Export for sharing"
             echo "  clipboard  - Copy to clipboard"
             echo "  gist       - Upload to GitHub Gist"
+            echo "  bundles    - Render configs for every saved theme"
             ;;
     esac
 }
@@ -49,7 +49,7 @@ elif command -v rofi >/dev/null 2>&1; then
     echo "" >> "$temp_file"
 
     # Get hotkeys in rofi format
-    "$SCRIPT_DIR/scripts/hotkey-parser.py" --rofi >> "$temp_file"
+    "$SCRIPT_DIR/scripts/hotkey-parser.py" --emit rofi >> "$temp_file"
 
     # Show in rofi with custom theme
     rofi -dmenu \
@@ -4,91 +4,279 @@
 Parses keybind-config.json and generates dynamic hotkey displays
 """
 
+import bisect
 import json
+import os
+import re
+import selectors
+import signal
+import stat
 import sys
+import time
 import argparse
+from collections import defaultdict
 from pathlib import Path
 
+# How often --listen checks keybind-config.json for changes
+LISTEN_INTERVAL = 0.5
+
+# Bump when the cached index layout changes
+INDEX_VERSION = 1
+
+# Display symbols for whole key tokens
+KEY_SYMBOLS = {
+    'SUPER': '⊞',
+    'SHIFT': '⇧',
+    'CTRL': '⌃',
+    'ALT': '⌥',
+    'RETURN': '↵',
+    'SPACE': '␣',
+    'left': '←',
+    'right': '→',
+    'up': '↑',
+    'down': '↓',
+    'XF86AudioRaiseVolume': '🔊+',
+    'XF86AudioLowerVolume': '🔉-',
+    'XF86AudioMute': '🔇',
+    'XF86AudioPlay': '⏯️',
+    'XF86AudioNext': '⏭️',
+    'XF86AudioPrev': '⏮️',
+    'XF86MonBrightnessUp': '☀️+',
+    'XF86MonBrightnessDown': '☀️-',
+    'Print': '📷'
+}
+
+# Modifiers and keys are separated by spaces and commas ("SUPER SHIFT, left")
+KEY_SEPARATOR = re.compile(r'([\s,]+)')
+
+# Words inside descriptions, commands and raw keys ("XF86AudioRaiseVolume" → xf, 86, audio, raise, volume)
+WORD_PATTERN = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+
+# Relative weight of a match in each searchable field
+SEARCH_FIELDS = {
+    'description': 3.0,
+    'key': 2.5,
+    'category': 1.5,
+    'command': 1.0,
+}
+
+# Alternative words tried for common query terms
+SEARCH_SYNONYMS = {
+    'up': ['raise', 'increase'],
+    'down': ['lower', 'decrease'],
+    'close': ['kill'],
+    'quit': ['exit', 'kill'],
+    'term': ['terminal', 'kitty'],
+    'screenshot': ['print', 'grim'],
+    'launcher': ['rofi', 'drun'],
+    'files': ['thunar'],
+}
+
+# Minimum trigram similarity for a fuzzy token match
+FUZZY_THRESHOLD = 0.4
+
+# Scored query terms kept between searches; type-ahead repeats all but the last term
+TERM_CACHE_SIZE = 256
+
+def get_trigrams(token):
+    """Character trigrams of a token, padded so short tokens still match"""
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class HotkeySearchIndex:
+    """Inverted token and trigram index over a formatted hotkey index"""
+
+    def __init__(self, index):
+        self.bindings = []
+        self.postings = defaultdict(dict)
+        self.trigrams = defaultdict(set)
+        self.term_scores = {}
+
+        for category in index['categories']:
+            for binding in category['bindings']:
+                binding_id = len(self.bindings)
+                self.bindings.append({
+                    "key": binding['key'],
+                    "description": binding['description'],
+                    "command": binding['command'],
+                    "category": category['name']
+                })
+
+                fields = {
+                    'description': binding['description'],
+                    'key': f"{binding['key_raw']} {binding['key']}",
+                    'category': category['name'],
+                    'command': binding['command'],
+                }
+                for field, text in fields.items():
+                    for token in self.tokenize(text):
+                        weights = self.postings[token]
+                        weights[binding_id] = max(weights.get(binding_id, 0.0), SEARCH_FIELDS[field])
+
+        self.vocabulary = sorted(self.postings)
+        for token in self.vocabulary:
+            for gram in get_trigrams(token):
+                self.trigrams[gram].add(token)
+
+    def tokenize(self, text):
+        return [word.lower() for word in WORD_PATTERN.findall(text)]
+
+    def match_term(self, term):
+        """Score every binding for one query term: exact > prefix > fuzzy"""
+        scores = {}
+
+        def add(token, factor):
+            for binding_id, weight in self.postings[token].items():
+                score = weight * factor
+                if score > scores.get(binding_id, 0.0):
+                    scores[binding_id] = score
+
+        # Exact and prefix matches from the sorted vocabulary
+        start = bisect.bisect_left(self.vocabulary, term)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            add(token, 1.0 if token == term else 0.5 + 0.3 * len(term) / len(token))
+
+        # Fuzzy matches by shared trigrams
+        if len(term) >= 3:
+            term_grams = get_trigrams(term)
+            shared = defaultdict(int)
+            for gram in term_grams:
+                for token in self.trigrams.get(gram, ()):
+                    shared[token] += 1
+            for token, count in shared.items():
+                similarity = count / (len(term_grams) + len(get_trigrams(token)) - count)
+                if similarity >= FUZZY_THRESHOLD and not token.startswith(term):
+                    add(token, 0.5 * similarity)
+
+        for synonym in SEARCH_SYNONYMS.get(term, ()):
+            if synonym in self.postings:
+                add(synonym, 0.6)
+
+        return scores
+
+    def get_term_scores(self, term):
+        """match_term, memoized
+
+        Earlier results are never used to narrow later ones: a longer term can
+        gain synonym and fuzzy matches its prefix did not have.
+        """
+        scores = self.term_scores.get(term)
+        if scores is None:
+            if len(self.term_scores) >= TERM_CACHE_SIZE:
+                self.term_scores.clear()
+            scores = self.term_scores[term] = self.match_term(term)
+        return scores
+
+    def search(self, query):
+        """Rank bindings matching every query term"""
+        query = query.strip().lower()
+        terms = [word.lower() for word in WORD_PATTERN.findall(query)] or query.split()
+        if not terms:
+            return []
+
+        totals = None
+        for term in terms:
+            scores = self.get_term_scores(term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {binding_id: totals[binding_id] + score
+                          for binding_id, score in scores.items() if binding_id in totals}
+            if not totals:
+                break
+
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        return [dict(self.bindings[binding_id], score=round(score, 3)) for binding_id, score in ranked]
+
 class HotkeyParser:
     def __init__(self):
         self.config_dir = Path.home() / ".config" / "hypr-system"
-        self.keybind_config = self.load_keybind_config()
+        self.config_path = self.config_dir / "core" / "keybind-config.json"
+        self.cache_path = self.config_dir / ".cache" / "hotkey-index.json"
+        self.index = self.load_index()
+        self.search_index = None
 
     def load_keybind_config(self):
         """Load keybinding configuration"""
         try:
-            with open(self.config_dir / "core" / "keybind-config.json") as f:
+            with open(self.config_path) as f:
                 return json.load(f)
         except FileNotFoundError:
             print("❌ Keybind config not found. Please ensure keybind-config.json exists.")
             return {"categories": {}}
 
     def format_key_combo(self, key_combo):
-        """Format key combination for display"""
-        # Replace common key names with symbols
-        replacements = {
-            'SUPER': '⊞',
-            'SHIFT': '⇧',
-            'CTRL': '⌃',
-            'ALT': '⌥',
-            'RETURN': '↵',
-            'SPACE': '␣',
-            'left': '←',
-            'right': '→',
-            'up': '↑',
-            'down': '↓',
-            'XF86AudioRaiseVolume': '🔊+',
-            'XF86AudioLowerVolume': '🔉-',
-            'XF86AudioMute': '🔇',
-            'XF86AudioPlay': '⏯️',
-            'XF86AudioNext': '⏭️',
-            'XF86AudioPrev': '⏮️',
-            'XF86MonBrightnessUp': '☀️+',
-            'XF86MonBrightnessDown': '☀️-',
-            'Print': '📷'
-        }
-
-        formatted = key_combo
-        for old, new in replacements.items():
-            formatted = formatted.replace(old, new)
+        """Format key combination for display
 
-        return formatted
+        Only whole tokens are replaced, so names like "bracketleft" stay intact.
+        """
+        return ''.join(KEY_SYMBOLS.get(token, token) for token in KEY_SEPARATOR.split(key_combo))
 
-    def parse_for_json(self):
-        """Parse hotkeys for JSON output (EWW consumption)"""
+    def build_index(self, keybind_config):
+        """Format every binding once into the structure all outputs share"""
         categories = []
 
-        for cat_id, category in self.keybind_config['categories'].items():
-            cat_data = {
+        for cat_id, category in keybind_config['categories'].items():
+            categories.append({
                 "id": cat_id,
                 "name": category['name'],
                 "icon": category['icon'],
-                "bindings": []
-            }
-
-            for key_combo, binding in category['bindings'].items():
-                cat_data['bindings'].append({
+                "bindings": [{
                     "key": self.format_key_combo(key_combo),
                     "key_raw": key_combo,
                     "description": binding['description'],
                     "command": binding['command']
-                })
-
-            categories.append(cat_data)
+                } for key_combo, binding in category['bindings'].items()]
+            })
 
         return {"categories": categories}
 
+    def load_index(self):
+        """Load the formatted index, rebuilding it when keybind-config.json changed"""
+        stamp = self.get_config_stamp()
+
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+            if (stamp is not None and cached.get('version') == INDEX_VERSION
+                    and cached.get('stamp') == list(stamp)):
+                return cached['index']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        index = self.build_index(self.load_keybind_config())
+        if stamp is not None:
+            self.save_index(stamp, index)
+        return index
+
+    def save_index(self, stamp, index):
+        """Cache the formatted index next to the generator caches"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": INDEX_VERSION, "stamp": list(stamp), "index": index},
+                          f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def parse_for_json(self):
+        """Parse hotkeys for JSON output (EWW consumption)"""
+        return self.index
+
     def parse_for_text(self):
         """Parse hotkeys for text output (rofi fallback)"""
         lines = []
 
-        for category in self.keybind_config['categories'].values():
+        for category in self.index['categories']:
             lines.append(f"\n{category['name']}")
             lines.append("=" * len(category['name']))
 
-            for key_combo, binding in category['bindings'].items():
-                formatted_key = self.format_key_combo(key_combo)
-                lines.append(f"{formatted_key:<25} {binding['description']}")
+            for binding in category['bindings']:
+                lines.append(f"{binding['key']:<25} {binding['description']}")
 
         return "\n".join(lines)
 
@@ -96,43 +284,151 @@ class HotkeyParser:
         """Parse hotkeys for rofi dmenu format"""
         lines = []
 
-        for category in self.keybind_config['categories'].values():
-            for key_combo, binding in category['bindings'].items():
-                formatted_key = self.format_key_combo(key_combo)
-                lines.append(f"{formatted_key} → {binding['description']}")
+        for category in self.index['categories']:
+            for binding in category['bindings']:
+                lines.append(f"{binding['key']} → {binding['description']}")
 
         return "\n".join(lines)
 
     def search_hotkeys(self, query):
-        """Search hotkeys by description or key combination"""
-        results = []
-        query_lower = query.lower()
-
-        for category in self.keybind_config['categories'].values():
-            for key_combo, binding in category['bindings'].items():
-                if (query_lower in binding['description'].lower() or
-                    query_lower in key_combo.lower()):
-
-                    formatted_key = self.format_key_combo(key_combo)
-                    results.append({
-                        "key": formatted_key,
-                        "description": binding['description'],
-                        "command": binding['command'],
-                        "category": category['name']
-                    })
-
-        return results
+        """Search hotkeys by description, command, category or key, best matches first"""
+        if self.search_index is None:
+            self.search_index = HotkeySearchIndex(self.index)
+        return self.search_index.search(query)
 
     def get_category_count(self):
         """Get count of categories and total bindings"""
         total_bindings = sum(len(cat['bindings'])
-                           for cat in self.keybind_config['categories'].values())
+                           for cat in self.index['categories'])
 
         return {
-            "categories": len(self.keybind_config['categories']),
+            "categories": len(self.index['categories']),
             "total_bindings": total_bindings
         }
 
+    def format_count(self):
+        """Count summary as shown by --count"""
+        count = self.get_category_count()
+        return f"Categories: {count['categories']}, Total bindings: {count['total_bindings']}"
+
+    def emit(self, format_name):
+        """Render one of the named output formats"""
+        formatters = {
+            'json': lambda: json.dumps(self.parse_for_json(), indent=2),
+            'rofi': self.parse_for_rofi,
+            'text': self.parse_for_text,
+            'count': self.format_count,
+        }
+        if format_name not in formatters:
+            raise ValueError(f"Unknown format '{format_name}' (choose from {', '.join(formatters)})")
+        return formatters[format_name]()
+
+    def get_config_stamp(self):
+        """Identify the current version of keybind-config.json on disk"""
+        try:
+            info = os.stat(self.config_path)
+            return (info.st_ino, info.st_mtime_ns, info.st_size)
+        except FileNotFoundError:
+            return None
+
+    def get_search_fifo(self):
+        """FIFO the EWW search bar writes queries to while --listen runs
+
+        scripts/hotkey-search.sh picks the same path.
+        """
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+        if runtime_dir:
+            return Path(runtime_dir) / "hypr-system" / "hotkey-search.fifo"
+        return self.config_dir / ".cache" / "hotkey-search.fifo"
+
+    def open_search_fifo(self):
+        """Create and open the query FIFO, or return None if that is not possible"""
+        fifo_path = self.get_search_fifo()
+        try:
+            fifo_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                is_fifo = stat.S_ISFIFO(os.lstat(fifo_path).st_mode)
+            except FileNotFoundError:
+                is_fifo = None
+            if is_fifo is False:
+                # e.g. a regular file left by a writer while no listener was running
+                fifo_path.unlink()
+            if not is_fifo:
+                os.mkfifo(fifo_path, 0o600)
+            # Opened read-write so the FIFO never reports EOF between writers
+            return os.open(fifo_path, os.O_RDWR | os.O_NONBLOCK)
+        except OSError as e:
+            print(f"Search disabled, cannot open {fifo_path}: {e}", file=sys.stderr)
+            return None
+
+    def parse_for_listen(self, query):
+        """Full index, or a single ranked results category while a query is active"""
+        if not query:
+            return self.parse_for_json()
+
+        results = self.search_hotkeys(query)
+        return {
+            "query": query,
+            "categories": [{
+                "id": "search",
+                "name": f"🔍 {len(results)} results",
+                "icon": "🔍",
+                "bindings": results
+            }]
+        }
+
+    def listen(self):
+        """Stay resident and print one compact JSON line whenever the visible state changes
+
+        Queries written to the search FIFO (one per line) filter the output,
+        so type-ahead needs no process per keystroke.
+        """
+        last_stamp = self.get_config_stamp()
+        last_output = None
+        query = ""
+        pending = b""
+
+        selector = selectors.DefaultSelector()
+        fifo_fd = self.open_search_fifo()
+        if fifo_fd is not None:
+            selector.register(fifo_fd, selectors.EVENT_READ)
+
+        try:
+            while True:
+                stamp = self.get_config_stamp()
+                if stamp != last_stamp:
+                    last_stamp = stamp
+                    try:
+                        self.index = self.load_index()
+                        self.search_index = None
+                    except (json.JSONDecodeError, KeyError) as e:
+                        # Config caught mid-edit, keep showing the last good state
+                        print(f"Error parsing hotkeys: {e}", file=sys.stderr)
+
+                output = json.dumps(self.parse_for_listen(query), separators=(',', ':'), ensure_ascii=False)
+                if output != last_output:
+                    print(output, flush=True)
+                    last_output = output
+
+                if fifo_fd is None:
+                    time.sleep(LISTEN_INTERVAL)
+                    continue
+
+                if selector.select(LISTEN_INTERVAL):
+                    try:
+                        pending += os.read(fifo_fd, 4096)
+                    except BlockingIOError:
+                        pass
+                    *lines, pending = pending.split(b"\n")
+                    if lines:
+                        query = lines[-1].decode(errors='replace').strip()
+        finally:
+            selector.close()
+            if fifo_fd is not None:
+                os.close(fifo_fd)
+                # No reader is left, so stop writers from blocking on it
+                self.get_search_fifo().unlink(missing_ok=True)
+
 def main():
     parser = argparse.ArgumentParser(description='Dynamic Hotkey Parser')
     parser.add_argument('--json', action='store_true',
@@ -143,13 +439,31 @@ def main():
                        help='Search hotkeys by description or key')
     parser.add_argument('--count', action='store_true',
                        help='Show count of categories and bindings')
+    parser.add_argument('--emit', action='append', metavar='FORMAT[:PATH]',
+                       help='Emit json, rofi, text or count in one run; repeatable, writes to PATH if given')
+    parser.add_argument('--listen', action='store_true',
+                       help='Stay resident and print compact JSON on every change (EWW deflisten)')
 
     args = parser.parse_args()
 
     hotkey_parser = HotkeyParser()
 
+    # Turn SIGTERM into a normal exit so resident modes clean up
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
     try:
-        if args.json:
+        if args.listen:
+            hotkey_parser.listen()
+        elif args.emit:
+            for spec in args.emit:
+                format_name, _, path = spec.partition(':')
+                output = hotkey_parser.emit(format_name)
+                if path:
+                    with open(path, 'w') as f:
+                        f.write(output + "\n")
+                else:
+                    print(output)
+        elif args.json:
             result = hotkey_parser.parse_for_json()
             print(json.dumps(result, indent=2))
         elif args.rofi:
@@ -163,13 +477,14 @@ def main():
             else:
                 print("No matching hotkeys found.")
         elif args.count:
-            count = hotkey_parser.get_category_count()
-            print(f"Categories: {count['categories']}, Total bindings: {count['total_bindings']}")
+            print(hotkey_parser.format_count())
         else:
             # Default text output
             result = hotkey_parser.parse_for_text()
             print(result)
 
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
     except Exception as e:
         print(f"Error parsing hotkeys: {e}", file=sys.stderr)
         sys.exit(1)
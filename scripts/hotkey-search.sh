@@ -0,0 +1,19 @@
+#!/bin/bash
+# 🔍 Hotkey Search Query
+# Passes the EWW search bar text (one line on stdin) to a running hotkey-parser.py --listen
+
+# Same directory logic as HotkeyParser.get_search_fifo()
+if [[ -n "$XDG_RUNTIME_DIR" ]]; then
+    SEARCH_FIFO="$XDG_RUNTIME_DIR/hypr-system/hotkey-search.fifo"
+else
+    SEARCH_FIFO="$HOME/.config/hypr-system/.cache/hotkey-search.fifo"
+fi
+
+IFS= read -r query
+
+# Without a listener there is nothing to filter, and writing would create a regular file
+[[ -p "$SEARCH_FIFO" ]] || exit 0
+
+# A FIFO left behind by a killed listener has no reader, so don't wait on it forever
+printf '%s\n' "$query" | timeout 1 tee "$SEARCH_FIFO" >/dev/null 2>&1
+exit 0
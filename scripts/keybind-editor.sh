@@ -462,7 +462,7 @@ apply_keybind_changes() {
     notify-send "🔄 Applying Changes" "Regenerating keybinding configuration..." -t 3000
 
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
 
         # Reload Hyprland to apply new bindings
         hyprctl reload
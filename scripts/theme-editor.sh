@@ -420,7 +420,7 @@ apply_theme_changes() {
     notify-send "🔄 Applying Changes" "Regenerating configuration..." -t 3000
 
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
         notify-send "✅ Changes Applied" "Theme updated successfully" -t 3000
     else
         notify-send "❌ Error" "Theme generator not found" -t 5000 -u critical
@@ -5,6 +5,7 @@
 SCRIPT_DIR="$HOME/.config/hypr-system"
 THEMES_DIR="$SCRIPT_DIR/themes"
 THEME_CONFIG="$SCRIPT_DIR/core/theme-config.json"
+GENERATOR="$SCRIPT_DIR/generators/apply-theme.py"
 ROFI_THEME="$HOME/.config/rofi/themes/cyberpunk-medieval.rasi"
 
 # Colors for notifications
@@ -34,27 +35,6 @@ check_dependencies() {
     return 0
 }
 
-# Function to validate theme JSON
-validate_theme_json() {
-    local theme_file="$1"
-
-    if ! jq empty "$theme_file" 2>/dev/null; then
-        return 1
-    fi
-
-    # Check for required fields
-    local required_fields=(".meta.name" ".colors" ".typography" ".spacing")
-
-    for field in "${required_fields[@]}"; do
-        if ! jq -e "$field" "$theme_file" >/dev/null 2>&1; then
-            echo "Missing required field: $field"
-            return 1
-        fi
-    done
-
-    return 0
-}
-
 # Function to sanitize theme name
 sanitize_theme_name() {
     local name="$1"
@@ -93,39 +73,31 @@ import_from_file() {
 import_json_theme() {
     local theme_file="$1"
 
-    # Validate JSON
-    local validation_result=$(validate_theme_json "$theme_file")
-    if [[ $? -ne 0 ]]; then
-        notify-send "❌ Invalid Theme" "Theme validation failed: $validation_result" -t 5000
-        return 1
-    fi
-
-    # Get theme name
-    local theme_name=$(jq -r '.meta.name // "Unknown Theme"' "$theme_file")
-    local theme_id=$(sanitize_theme_name "$theme_name")
+    # Unparsable files skip the prompts; the generator reports why
+    local theme_name theme_id
+    if theme_name=$(jq -r '.meta.name // "Unknown Theme"' "$theme_file" 2>/dev/null); then
+        theme_id=$(sanitize_theme_name "$theme_name")
 
-    # Ask user for confirmation
-    if ! rofi -dmenu -p "📥 Import theme '$theme_name'?" <<< $'Yes\nNo' | grep -q "Yes"; then
-        return 0
-    fi
-
-    # Check if theme already exists
-    local target_file="$THEMES_DIR/$theme_id.json"
-    if [[ -f "$target_file" ]]; then
-        if ! rofi -dmenu -p "⚠️ Theme '$theme_id' exists. Overwrite?" <<< $'Yes\nNo' | grep -q "Yes"; then
+        # Ask user for confirmation
+        if ! rofi -dmenu -p "📥 Import theme '$theme_name'?" <<< $'Yes\nNo' | grep -q "Yes"; then
             return 0
         fi
-    fi
 
-    # Copy theme file
-    mkdir -p "$THEMES_DIR"
-    cp "$theme_file" "$target_file"
+        # Check if theme already exists
+        local target_file="$THEMES_DIR/$theme_id.json"
+        if [[ -f "$target_file" ]]; then
+            if ! rofi -dmenu -p "⚠️ Theme '$theme_id' exists. Overwrite?" <<< $'Yes\nNo' | grep -q "Yes"; then
+                return 0
+            fi
+        fi
+    fi
 
-    # Update theme metadata
-    local temp_file=$(mktemp)
-    jq --arg id "$theme_id" --arg imported "$(date)" \
-       '.meta.theme_id = $id | .meta.imported_date = $imported' \
-       "$target_file" > "$temp_file" && mv "$temp_file" "$target_file"
+    # One generator run validates (parsed, schema-checked, color-resolved) and registers the theme
+    local import_report
+    if ! import_report=$(python3 "$GENERATOR" --import-themes "$theme_file" | grep -v '^📥'; exit "${PIPESTATUS[0]}"); then
+        notify-send "❌ Import Failed" "$import_report" -t 5000
+        return 1
+    fi
 
     notify-send "✅ Theme Imported" "Theme '$theme_name' imported as '$theme_id'" -t 3000
 
@@ -474,7 +446,7 @@ apply_imported_theme() {
 
     # Regenerate configuration
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
         notify-send "✅ Theme Applied" "Imported theme '$theme_id' is now active" -t 3000
     else
         notify-send "⚠️ Manual Restart Required" "Please restart Hyprland to see changes" -t 5000
@@ -584,6 +556,22 @@ preview_theme_file() {
     fi
 }
 
+# Function to import every theme file below the given paths in one pass
+import_themes_bulk() {
+    if [[ $# -eq 0 ]]; then
+        echo "❌ Usage: $0 bulk <file|directory>..."
+        return 1
+    fi
+
+    local report
+    report=$(python3 "$GENERATOR" --import-themes "$@" --workers "$(nproc)")
+    local status=$?
+    echo "$report"
+
+    notify-send "📥 Bulk Import" "$(tail -1 <<< "$report")" -t 5000
+    return $status
+}
+
 # Function to list imported themes
 list_imported_themes() {
     if [[ ! -d "$THEMES_DIR" ]]; then
@@ -682,10 +670,14 @@ main() {
         "gallery")
             import_from_gallery
             ;;
+        "bulk")
+            shift
+            import_themes_bulk "$@"
+            ;;
         *)
             echo "📥 Theme Import Manager"
             echo ""
-            echo "Usage: $0 {menu|file|url|clipboard|git|gallery}"
+            echo "Usage: $0 {menu|file|url|clipboard|git|gallery|bulk}"
             echo ""
             echo "Commands:"
             echo "  menu       - Show import manager interface"
@@ -694,6 +686,7 @@ main() {
             echo "  clipboard  - Import from clipboard content"
             echo "  git        - Import from Git repository"
             echo "  gallery    - Browse theme gallery"
+            echo "  bulk <path>... - Validate and import every theme JSON under the paths"
             ;;
     esac
 }
@@ -6,7 +6,10 @@ SCRIPT_DIR="$HOME/.config/hypr-system"
 THEME_CONFIG="$SCRIPT_DIR/core/theme-config.json"
 THEMES_DIR="$SCRIPT_DIR/themes"
 BACKUP_DIR="$SCRIPT_DIR/backups"
+WALLPAPER_DIR="$SCRIPT_DIR/wallpapers"
 ROFI_THEME="$HOME/.config/rofi/themes/cyberpunk-medieval.rasi"
+THEME_PREVIEW="$SCRIPT_DIR/generators/theme_preview.py"
+BUILTIN_THEMES_DIR="$SCRIPT_DIR/.cache/builtin-themes"
 
 # Create required directories
 mkdir -p "$THEMES_DIR" "$BACKUP_DIR"
@@ -97,7 +100,7 @@ apply_theme() {
     # Regenerate configurations
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
         echo "🔄 Regenerating configurations..."
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
 
         # Update wallpaper to match theme
         if [[ -f "$SCRIPT_DIR/scripts/wallpaper-cycle.sh" ]]; then
@@ -122,10 +125,11 @@ apply_theme() {
 # Function to generate built-in themes
 generate_builtin_theme() {
     local theme_name="$1"
+    local target="${2:-$THEME_CONFIG}"
 
     case "$theme_name" in
         "neo-tokyo")
-            cat > "$THEME_CONFIG" << 'EOF'
+            cat > "$target" << 'EOF'
 {
   "meta": {
     "name": "Neo Tokyo",
@@ -177,7 +181,7 @@ generate_builtin_theme() {
 EOF
             ;;
         "dark-ages")
-            cat > "$THEME_CONFIG" << 'EOF'
+            cat > "$target" << 'EOF'
 {
   "meta": {
     "name": "Dark Ages",
@@ -229,7 +233,7 @@ EOF
 EOF
             ;;
         "matrix-green")
-            cat > "$THEME_CONFIG" << 'EOF'
+            cat > "$target" << 'EOF'
 {
   "meta": {
     "name": "Matrix Green",
@@ -293,34 +297,67 @@ EOF
     fi
 }
 
-# Function to show theme preview
+# Function to get a theme's JSON file without applying it
+get_theme_file() {
+    local theme_name="$1"
+
+    if [[ -f "$THEMES_DIR/$theme_name.json" ]]; then
+        echo "$THEMES_DIR/$theme_name.json"
+        return 0
+    fi
+
+    # Built-in themes are written out once so they can be previewed like files
+    local builtin_file="$BUILTIN_THEMES_DIR/$theme_name.json"
+    mkdir -p "$BUILTIN_THEMES_DIR"
+    if generate_builtin_theme "$theme_name" "$builtin_file" >/dev/null; then
+        echo "$builtin_file"
+    else
+        rm -f "$builtin_file"
+        return 1
+    fi
+}
+
+# Function to show theme preview (rendered swatch, the live config is untouched)
 show_theme_preview() {
     local theme_name="$1"
 
-    # Create a temporary backup
-    local temp_backup=$(mktemp)
-    cp "$THEME_CONFIG" "$temp_backup"
+    local theme_file
+    if ! theme_file=$(get_theme_file "$theme_name"); then
+        notify-send "❌ No Preview" "Unknown theme '$theme_name'" -t 3000
+        return 1
+    fi
 
-    # Apply theme in preview mode
-    apply_theme "$theme_name" true
+    local preview
+    if ! preview=$(python3 "$THEME_PREVIEW" --paths "$theme_file"); then
+        notify-send "❌ No Preview" "Could not render '$theme_name'" -t 3000
+        return 1
+    fi
 
-    # Show preview notification
-    notify-send "👁️ Theme Preview" \
-        "Previewing '$theme_name' theme\nPress Enter to apply or Escape to cancel" \
-        -t 10000 -u normal
+    notify-send -i "$preview" "👁️ Theme Preview" "$theme_name" -t 10000 -u normal
 
-    # Wait for user input
-    read -p "Apply this theme? (y/N): " -n 1 -r
-    echo
+    if rofi -dmenu -p "🎨 Apply '$theme_name'?" -theme "$ROFI_THEME" <<< $'Yes\nNo' | grep -q "Yes"; then
+        apply_theme "$theme_name"
+    fi
+}
 
-    if [[ $REPLY =~ ^[Yy]$ ]]; then
-        echo "✅ Theme applied permanently"
-        rm -f "$temp_backup"
+# Function to derive theme colors from a wallpaper
+theme_from_wallpaper() {
+    local wallpaper="$1"
+
+    if [[ -z "$wallpaper" ]]; then
+        local selected=$(find "$WALLPAPER_DIR" -maxdepth 1 -type f \( -name "*.png" -o -name "*.jpg" \) -printf '%f\n' | sort | \
+            rofi -dmenu -p "🖼️ Wallpaper" -theme "$ROFI_THEME")
+        [[ -n "$selected" ]] || return 1
+        wallpaper="$WALLPAPER_DIR/$selected"
+    fi
+
+    backup_current_theme
+
+    if (cd "$SCRIPT_DIR" && python3 generators/apply-theme.py --palette-from "$wallpaper"); then
+        notify-send "🖼️ Theme From Wallpaper" "Colors derived from $(basename "$wallpaper")" -t 3000
     else
-        echo "🔄 Reverting to previous theme"
-        cp "$temp_backup" "$THEME_CONFIG"
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
-        rm -f "$temp_backup"
+        notify-send "❌ Theme From Wallpaper" "Could not extract a palette from $(basename "$wallpaper")" -t 5000 -u critical
+        return 1
     fi
 }
 
@@ -382,7 +419,7 @@ show_theme_menu() {
     done
 
     # Add special options
-    menu_items+=("👁️ Preview Mode" "🆕 Create Custom Theme" "📁 Open Themes Folder" "💾 Backup Current")
+    menu_items+=("👁️ Preview Mode" "🖼️ Theme From Wallpaper" "🆕 Create Custom Theme" "📁 Open Themes Folder" "💾 Backup Current")
 
     local selected=$(printf '%s\n' "${menu_items[@]}" | \
         rofi -dmenu -p "🎨 Theme Manager" \
@@ -395,6 +432,9 @@ show_theme_menu() {
                 echo "👁️ Entering preview mode..."
                 show_theme_menu_preview
                 ;;
+            *"Theme From Wallpaper")
+                theme_from_wallpaper
+                ;;
             *"Create Custom Theme")
                 create_custom_theme
                 ;;
@@ -416,22 +456,28 @@ show_theme_menu() {
     fi
 }
 
-# Function to show preview menu
+# Function to show preview menu (thumbnails cached by theme content, nothing is applied)
 show_theme_menu_preview() {
     local themes=($(get_available_themes))
 
-    local menu_items=()
+    local theme_files=()
     for theme in "${themes[@]}"; do
-        menu_items+=("👁️ $theme")
+        local theme_file
+        if theme_file=$(get_theme_file "$theme"); then
+            theme_files+=("$theme_file")
+        fi
     done
 
-    local selected=$(printf '%s\n' "${menu_items[@]}" | \
+    local selected=$(python3 "$THEME_PREVIEW" --rofi "${theme_files[@]}" | \
         rofi -dmenu -p "👁️ Preview Theme" \
+        -show-icons -theme-str 'element-icon { size: 6em; }' \
         -theme "$ROFI_THEME")
 
     if [[ -n "$selected" ]]; then
-        local theme_name=$(echo "$selected" | sed 's/^👁️ //')
-        show_theme_preview "$theme_name"
+        local theme_name="${selected%% · *}"
+        if rofi -dmenu -p "🎨 Apply '$theme_name'?" -theme "$ROFI_THEME" <<< $'Yes\nNo' | grep -q "Yes"; then
+            apply_theme "$theme_name"
+        fi
     fi
 }
 
@@ -492,6 +538,9 @@ main() {
         create)
             create_custom_theme
             ;;
+        wallpaper)
+            theme_from_wallpaper "$2"
+            ;;
         export)
             export_theme
             ;;
@@ -505,7 +554,7 @@ main() {
         *)
             echo "🎨 Cyberpunk Theme Manager"
             echo ""
-            echo "Usage: $0 {menu|apply|preview|list|backup|create|export|current}"
+            echo "Usage: $0 {menu|apply|preview|list|backup|create|wallpaper|export|current}"
             echo ""
             echo "Commands:"
             echo "  menu              - Show interactive theme menu"
@@ -514,6 +563,7 @@ main() {
             echo "  list              - List available themes"
             echo "  backup            - Backup current theme"
             echo "  create            - Create custom theme"
+            echo "  wallpaper [image] - Derive theme colors from a wallpaper"
             echo "  export            - Export current theme"
             echo "  current           - Show current theme name"
             echo ""
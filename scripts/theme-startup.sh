@@ -33,7 +33,7 @@ apply_startup_theme() {
 
     # Apply theme using the generator
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
         echo "✅ Theme applied successfully"
     else
         echo "❌ Theme generator not found"
@@ -599,7 +599,7 @@ apply_changes() {
 
     # Regenerate from theme
     if [[ -f "$SCRIPT_DIR/generators/apply-theme.py" ]]; then
-        cd "$SCRIPT_DIR" && python3 generators/apply-theme.py
+        "$SCRIPT_DIR/scripts/apply-theme.sh"
     fi
 
     # Restart Waybar